@@ -18,7 +18,9 @@ if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
-from core.scraper import scrape_file
+from core.scraper import scrape_file, scrape_html
+from core.archive import find, is_archive, iter_records, parse_locator
+from core import result_cache
 
 
 def main():
@@ -33,22 +35,79 @@ def main():
         html_file = sys.argv[1]
     else:
         html_file = r"C:\Users\tomva\PlatformIO\my-node-project\secrets-backup\HTML_Phoenix_EBEV_SERIE.html"
+
+    # PyScraper change manifest: enkel pagina's die echt veranderd (of nieuw) zijn
+    if html_file.endswith(".json"):
+        with open(html_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        files = manifest.get("changed", []) + manifest.get("new", [])
+        unchanged = len(manifest.get("unchanged", [])) + len(manifest.get("skipped", []))
+        print(f"🗂️  Manifest: {len(files)} pages to extract, {unchanged} unchanged skipped")
+        failed = [path for path in files if not process_file(path)]
+        if failed:
+            print(f"\n❌ {len(failed)} files failed")
+            sys.exit(1)
+        return
+
+    # PyScraper archief (segment of map): één URL via de index, of alle pagina's streamen
+    if is_archive(html_file):
+        if "--url" in sys.argv:
+            url = sys.argv[sys.argv.index("--url") + 1]
+            record = find(html_file, url)
+            if record is None:
+                print(f"❌ URL niet in archief: {url}")
+                sys.exit(1)
+            if not process_file(record.locator, record.text):
+                sys.exit(1)
+            return
+        total = 0
+        failed = []
+        for record in iter_records(html_file):
+            total += 1
+            if not process_file(record.locator, record.text):
+                failed.append(record.url)
+        print(f"\n🗄️  Archive: {total - len(failed)}/{total} pages extracted")
+        if failed:
+            print(f"❌ {len(failed)} pages failed")
+            sys.exit(1)
+        return
+
+    if not process_file(html_file):
+        sys.exit(1)
+
+
+def process_file(html_file, html=None):
+    """
+    Scrape één HTML bestand (of archief locator '<segment>#<offset>') en bewaar de JSON
+    output. Met html wordt die inhoud gebruikt (bv. al gestreamd uit een archief).
+    Geeft False bij een fout.
+    """
     print(f"📄 Input: {html_file}")
     
-    if not os.path.exists(html_file):
+    located = parse_locator(html_file)
+    if html is None and not os.path.exists(located[0] if located else html_file):
         print(f"❌ Bestand niet gevonden: {html_file}")
-        sys.exit(1)
+        return False
     
     print("🔄 Loading HTML...")
     
+    # Blob uit PyScraper's blob store: zelfde content hash = zelfde resultaat
+    key = result_cache.content_key(html_file)
+    result = result_cache.load(key) if key else None
+
     # Scrape
     try:
-        result = scrape_file(html_file)
+        if result is not None:
+            print("♻️  Cached result (same content hash)")
+        else:
+            result = scrape_html(html) if html is not None else scrape_file(html_file)
+            if key:
+                result_cache.save(key, result)
     except Exception as e:
         print(f"❌ ERROR during scraping: {e}")
         import traceback
         traceback.print_exc()
-        sys.exit(1)
+        return False
     
     # Output
     print(f"\n✅ Scraping voltooid!")
@@ -106,6 +165,7 @@ def main():
                 break
             val_preview = str(value)[:50] + "..." if len(str(value)) > 50 else value
             print(f"      • {key}: {val_preview}")
+    return True
 
 
 if __name__ == "__main__":
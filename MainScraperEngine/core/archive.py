@@ -0,0 +1,169 @@
+"""
+╔════════════════════════════════════════════════════════════════╗
+║  Archive - Lezen van PyScraper WARC-achtige archieven         ║
+╚════════════════════════════════════════════════════════════════╝
+
+PyScraper (Config.ARCHIVE) schrijft pagina's als records in rollende segmenten
+'pages-<run>-<pid>-<n>.warc.gz': elk record is een apart gzip member, met een
+JSONL index '<segment>.idx' (url, offset, length, type, ...) ernaast.
+
+Een record wordt aangeduid met een locator '<segment>.warc.gz#<offset>'.
+"""
+import json
+import os
+import re
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+_LOCATOR = re.compile(r"^(?P<segment>.+\.warc\.gz)#(?P<offset>\d+)$")
+_CHUNK = 1024 * 1024
+
+
+class ArchiveRecord:
+    """Eén record: WARC headers + payload."""
+
+    def __init__(self, headers: Dict[str, str], payload: bytes, locator: str = ""):
+        self.headers = headers
+        self.payload = payload
+        self.locator = locator
+
+    @property
+    def type(self) -> str:
+        return self.headers.get("WARC-Type", "")
+
+    @property
+    def url(self) -> str:
+        return self.headers.get("WARC-Target-URI", "")
+
+    @property
+    def text(self) -> str:
+        return self.payload.decode("utf-8")
+
+
+def parse_locator(path: str) -> Optional[Tuple[str, int]]:
+    """(segment, offset) als path een archief locator is, anders None."""
+    match = _LOCATOR.match(str(path))
+    return (match.group("segment"), int(match.group("offset"))) if match else None
+
+
+def is_archive(path: str) -> bool:
+    """Een segment, of een map met segmenten."""
+    path = str(path)
+    if path.endswith(".warc.gz"):
+        return True
+    return os.path.isdir(path) and any(name.endswith(".warc.gz") for name in os.listdir(path))
+
+
+def read_at(segment: str, offset: int) -> ArchiveRecord:
+    """Random access: enkel het gzip member op offset wordt gelezen en gedecomprimeerd."""
+    with open(segment, "rb") as f:
+        f.seek(offset)
+        raw, _ = _read_member(f)
+    headers, payload = _parse_record(raw)
+    return ArchiveRecord(headers, payload, f"{segment}#{offset}")
+
+
+def read_locator(locator: str) -> ArchiveRecord:
+    segment, offset = parse_locator(locator)
+    return read_at(segment, offset)
+
+
+def segments(path: str) -> list:
+    """Alle segmenten van een archief (één bestand of een map), op naam gesorteerd."""
+    path = str(path)
+    if os.path.isdir(path):
+        return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".warc.gz")]
+    return [path]
+
+
+def iter_records(path: str, types: Tuple[str, ...] = ("resource",)) -> Iterator[ArchiveRecord]:
+    """
+    Stream alle records van een archief, member per member (nooit een heel segment
+    in geheugen). Standaard enkel de pagina's ('resource'). Een kapot of afgebroken
+    member (crash tijdens het schrijven) wordt overgeslagen tot het volgende member.
+    """
+    for segment in segments(path):
+        with open(segment, "rb") as f:
+            while True:
+                offset = f.tell()
+                try:
+                    raw, size = _read_member(f)
+                except (EOFError, zlib.error) as e:
+                    print(f"⚠️  {segment}: skipping damaged record at offset {offset} ({e})")
+                    if not _seek_member(f, offset + 1):
+                        break
+                    continue
+                if not size:
+                    break
+                headers, payload = _parse_record(raw)
+                if not types or headers.get("WARC-Type") in types:
+                    yield ArchiveRecord(headers, payload, f"{segment}#{offset}")
+
+
+def find(path: str, url: str, record_type: str = "resource", name: Optional[str] = None) -> Optional[ArchiveRecord]:
+    """
+    Laatste record voor een URL, via de .idx sidecars (zonder index: sequentieel zoeken).
+    Voor metadata records (bv. Siemens variant JSON) met record_type='metadata' en name.
+    """
+    found = None
+    for segment in segments(path):
+        index = f"{segment}.idx"
+        if not os.path.exists(index):
+            for record in iter_records(segment, (record_type,)):
+                if record.url == url and (name is None or record.headers.get("PyScraper-Name") == name):
+                    found = (segment, int(record.locator.rsplit("#", 1)[1]))
+            continue
+        with open(index, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["url"] == url and entry["type"] == record_type and (name is None or entry.get("name") == name):
+                    found = (segment, entry["offset"])
+    return read_at(*found) if found else None
+
+
+def _read_member(f) -> Tuple[bytes, int]:
+    """Decomprimeer één gzip member vanaf de huidige positie; f staat daarna op het volgende member."""
+    start = f.tell()
+    decompressor = zlib.decompressobj(wbits=31)
+    data = []
+    consumed = 0
+    while not decompressor.eof:
+        chunk = f.read(_CHUNK)
+        if not chunk:
+            if consumed:
+                raise EOFError(f"Truncated archive record at offset {start}")
+            return b"", 0
+        data.append(decompressor.decompress(chunk))
+        consumed += len(chunk)
+    size = consumed - len(decompressor.unused_data)
+    f.seek(start + size)
+    return b"".join(data), size
+
+
+def _seek_member(f, start: int) -> bool:
+    """Zet f op de eerstvolgende gzip header vanaf start; False als er geen meer is."""
+    magic = b"\x1f\x8b\x08"
+    f.seek(start)
+    position = start
+    tail = b""
+    while True:
+        chunk = f.read(_CHUNK)
+        if not chunk:
+            return False
+        found = (tail + chunk).find(magic)
+        if found >= 0:
+            f.seek(position - len(tail) + found)
+            return True
+        tail = chunk[-(len(magic) - 1):]
+        position += len(chunk)
+
+
+def _parse_record(raw: bytes) -> Tuple[Dict[str, str], bytes]:
+    head, _, body = raw.partition(b"\r\n\r\n")
+    headers = {}
+    for line in head.decode("utf-8").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip()] = value.strip()
+    return headers, body[:int(headers.get("Content-Length", len(body)))]
@@ -0,0 +1,50 @@
+"""
+╔════════════════════════════════════════════════════════════════╗
+║  Result Cache - MSE resultaten per content hash               ║
+╚════════════════════════════════════════════════════════════════╝
+
+PyScraper's blob store (Config.BLOB_STORE) bewaart pagina's als
+'<key>.html.gz', met key = sha256 van de genormaliseerde HTML. Dezelfde key
+betekent dezelfde inhoud, dus het MSE resultaat kan hergebruikt worden.
+
+De cache is per versie van Vendor_YML.yaml: gewijzigde specs = nieuwe extractie.
+"""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_BLOB_NAME = re.compile(r"^(?P<key>[0-9a-f]{64})\.html(\.gz)?$")
+CACHE_DIR = Path(__file__).parent.parent / "data" / "cache"
+VENDOR_YML = Path(__file__).parent.parent / "Vendor_YML.yaml"
+
+
+def content_key(path: str) -> Optional[str]:
+    """Content key uit een blob pad, of None voor gewone bestanden."""
+    match = _BLOB_NAME.match(os.path.basename(str(path)))
+    return match.group("key") if match else None
+
+
+def _cache_path(key: str) -> Path:
+    with open(VENDOR_YML, "rb") as f:
+        specs_version = hashlib.sha256(f.read()).hexdigest()[:12]
+    return CACHE_DIR / specs_version / key[:2] / f"{key}.json"
+
+
+def load(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_cache_path(key), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save(key: str, result: Dict[str, Any]) -> None:
+    path = _cache_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+    os.replace(tmp, path)
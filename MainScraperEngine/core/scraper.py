@@ -7,8 +7,10 @@ from bs4 import BeautifulSoup
 from collections import defaultdict
 from typing import Dict, Any, Optional
 from datetime import datetime
+import gzip
 import html
 
+from core.archive import parse_locator, read_locator
 from core.config import load_configs
 from core.detector import detect_vendor
 from extractors import EXTRACTOR_REGISTRY
@@ -171,9 +173,13 @@ def scrape_html(html: str) -> Dict[str, Any]:
 
 
 def scrape_file(filepath: str) -> Dict[str, Any]:
-    """Convenience function om een HTML bestand te scrapen."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        html = f.read()
+    """Convenience function om een HTML bestand te scrapen (ook .html.gz of een archief locator)."""
+    if parse_locator(filepath):
+        html = read_locator(filepath).text
+    else:
+        opener = gzip.open if str(filepath).endswith(".gz") else open
+        with opener(filepath, "rt", encoding="utf-8") as f:
+            html = f.read()
     
     scraper = ConfigDrivenScraper(html)
     return scraper.scrape()
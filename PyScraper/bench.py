@@ -0,0 +1,53 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Basis directory bepalen (waar bench.py staat)
+BASE_DIR = Path(__file__).parent
+
+# Voeg src toe aan python path
+sys.path.append(str(BASE_DIR / "src"))
+
+from benchmark import SCENARIOS, run_benchmark
+
+def main():
+    parser = argparse.ArgumentParser(description="WebHTMLextractor - Strategy benchmark against local mock vendor sites")
+
+    parser.add_argument('--headless', action='store_true', help='Run without visible browser')
+    parser.add_argument('--rounds', type=int, default=3, help='Runs per scenario (round 1 = cold profile)')
+    parser.add_argument('--only', nargs='*', default=None, help='Scenario names to run (default: all)')
+    parser.add_argument('--products', type=int, default=120, help='Products per list/variant page')
+    parser.add_argument('--latency', type=int, default=80, help='Mock server latency per document/API request (ms)')
+    parser.add_argument('--price-delay', type=int, default=300, help='Latency of the lazy price calls (ms)')
+    parser.add_argument('--recordings', default=None, help='Directory with saved pages (PyScraper output) to serve instead of the synthetic ones')
+    parser.add_argument('--no-tracing', action='store_true', help='Turn per-page tracing off (compare with --baseline to measure its overhead)')
+    parser.add_argument('--trace-snapshots', action='store_true', help='Also record DOM snapshots per action in the traces')
+    parser.add_argument('--verify-snapshots', action='store_true', help='Compare MSE output of every Schneider snapshot against the legacy serializer')
+    parser.add_argument('--baseline', default=None, help='Earlier bench_*.json report to compare against')
+    parser.add_argument('--list', action='store_true', help='List the scenarios and exit')
+
+    args = parser.parse_args()
+
+    if args.list:
+        for scenario in SCENARIOS:
+            print(f"{scenario.name:<17} {scenario.url}")
+        return
+
+    scenarios = [s for s in SCENARIOS if not args.only or s.name in args.only]
+    report = run_benchmark(
+        scenarios=scenarios,
+        rounds=args.rounds,
+        headless=args.headless,
+        products=args.products,
+        latency_ms=args.latency,
+        price_delay_ms=args.price_delay,
+        recordings_dir=args.recordings,
+        tracing=not args.no_tracing,
+        trace_snapshots=args.trace_snapshots,
+        verify_snapshots=args.verify_snapshots,
+    )
+    report.print_summary(baseline=args.baseline)
+    print(f"\n💾 Report: {report.save()}")
+
+if __name__ == "__main__":
+    main()
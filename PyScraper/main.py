@@ -22,9 +22,26 @@ def main():
     parser.add_argument('--fresh', action='store_true', help='Delete browser profile before starting')
     parser.add_argument('--input', default=str(default_input), help='Path to URL list')
     parser.add_argument('--output', default=str(default_output), help='Output directory')
+    parser.add_argument('--capture', choices=['full', 'fragments'], default=None, help="Save the full page or only the fragments MSE specs read (default: Config.CAPTURE_MODE)")
+    parser.add_argument('--workers', type=int, default=None, help='Number of parallel browser workers (default: Config.CONCURRENCY)')
+    parser.add_argument('--shards', type=int, default=None, help='Number of worker processes, URLs partitioned by domain (default: Config.SHARDS)')
+    parser.add_argument('--resume', action='store_true', help='Continue the previous crawl from the frontier instead of starting over')
+    parser.add_argument('--priority', type=int, default=0, help='Priority for URLs imported from --input (higher runs first)')
+    parser.add_argument('--fanout', action='store_true', help='Queue the variant URLs MSE finds on list pages (default: Config.FANOUT)')
+    parser.add_argument('--max-depth', type=int, default=None, help='Fan-out depth limit (default: Config.FANOUT_MAX_DEPTH)')
+    parser.add_argument('--budget', type=int, default=None, help='Max. URLs discovered by fan-out (default: Config.FANOUT_BUDGET)')
+    parser.add_argument('--only-changed', action='store_true', default=None, help='Only fetch variants whose list price/availability changed')
+    parser.add_argument('--stats', action='store_true', help='Print frontier throughput and failure breakdown, then exit')
     
     args = parser.parse_args()
 
+    if args.stats:
+        from core.frontier import Frontier
+        frontier = Frontier()
+        frontier.print_stats()
+        frontier.close()
+        return
+
     if args.fresh:
         profile_path = BASE_DIR / "browser_profile"
         if profile_path.exists():
@@ -35,11 +52,21 @@ def main():
             except Exception as e:
                 print(f"⚠️ Could not delete profile: {e}")
 
+    fanout = None
+    if args.fanout:
+        fanout = {'max_depth': args.max_depth, 'budget': args.budget, 'only_changed': args.only_changed}
+
     # Initialiseer en start de engine
     engine = ScrapeEngine(
         input_file=args.input,
         output_dir=args.output,
-        headless=args.headless
+        headless=args.headless,
+        workers=args.workers,
+        capture_mode=args.capture,
+        resume=args.resume,
+        priority=args.priority,
+        fanout=fanout,
+        shards=args.shards
     )
     
     engine.run()
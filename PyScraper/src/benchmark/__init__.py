@@ -0,0 +1,2 @@
+from .mock_sites import MockServer, MOCK_HOSTS
+from .harness import Scenario, SCENARIOS, BenchReport, run_benchmark
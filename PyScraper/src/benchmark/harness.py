@@ -0,0 +1,246 @@
+import json
+import os
+import re
+import shutil
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from core.browser import BrowserManager
+from core.config import Config
+from core.metrics import UrlMetrics, quantile
+from core.session import SESSIONS, load_credentials
+from core.tracing import TRACES
+from strategies import get_strategy_for_url
+from strategies.consent import CONSENT
+from strategies.routing import apply_routing
+from .mock_sites import MockServer, SKU_PATTERN
+
+# Prijzen zoals de mock ze rendert ("€ 123,45"), ook als ze uit een shadow root gekopieerd zijn
+PRICE_PATTERN = re.compile(r"€ \d+,\d{2}")
+
+
+class Scenario:
+    """
+    Eén benchmark pagina met wat er in de capture moet zitten.
+
+    Args:
+        items/prices: verwacht aantal SKUs/prijzen; None = alle producten van de catalogus
+    """
+
+    def __init__(self, name, url, items=None, prices=None):
+        self.name = name
+        self.url = url
+        self.items = items
+        self.prices = prices
+
+
+SCENARIOS = [
+    Scenario("phoenix_list", "https://www.phoenixcontact.com/nl-nl/producten/serie-1"),
+    Scenario("phoenix_detail", "https://www.phoenixcontact.com/nl-nl/producten/MOCK-P-001005", items=1, prices=1),
+    Scenario("schneider_range", "https://www.se.com/nl/nl/product-range/2-mock/"),
+    Scenario("schneider_detail", "https://www.se.com/nl/nl/product/MOCK-S-002007/", items=1, prices=1),
+    Scenario("siemens_variants", "https://mall.industry.siemens.com/mall/nl/nl/Catalog/Products/3", prices=0),
+    Scenario("siemens_product", "https://mall.industry.siemens.com/mall/nl/nl/Catalog/Product/MOCK-X-003001", items=1, prices=0),
+]
+
+
+def run_benchmark(scenarios=None, rounds=3, headless=True, products=120, latency_ms=80,
+                  price_delay_ms=300, recordings_dir=None, tracing=True, trace_snapshots=False,
+                  verify_snapshots=False):
+    """
+    Draai de strategies tegen de mock sites: elke scenario pagina 'rounds' keer.
+    Ronde 1 is koud (nieuw profiel, cookie banner), de volgende rondes zijn warm.
+
+    Geen HTTP cache: de mock route (en routing/ASSET_CACHE) zijn routes, dus Chromium
+    cachet niets. De mock route beantwoordt elke request zelf, ook die de asset cache
+    anders zou bedienen; warme rondes meten dus profiel, consent en sessie, geen cache.
+
+    Tracing staat aan zoals in een crawl (chunk per pagina); een run met tracing=False
+    tegen een baseline met tracing geeft de volledige kost, het rapport toont daarnaast
+    de synchrone kost van start/stop_chunk per pagina.
+
+    Met verify_snapshots wordt elke Schneider snapshot via MSE tegen de oude serializer
+    vergeleken (kost tijd, dus niet samen met timings lezen); beide outputs en hun diff
+    komen in <BENCH_DIR>/snapshot_verify. Met recordings_dir zijn dat echte pagina's.
+
+    Alles draait in een tijdelijk profiel met eigen consent/sessie state, zodat de
+    benchmark het echte profiel niet raakt en elke run hetzelfde vertrekpunt heeft.
+
+    Returns:
+        BenchReport
+    """
+    scenarios = scenarios or SCENARIOS
+    workdir = Path(tempfile.mkdtemp(prefix="pyscraper_bench_"))
+    Config.TRACING = tracing
+    Config.TRACE_SNAPSHOTS = trace_snapshots
+    TRACES.trace_dir = str(workdir / "traces")
+    # Pacing is beleefdheid tegenover echte sites; tegen de mock meet het enkel wachttijd
+    Config.PACING = False
+    Config.SNAPSHOT_VERIFY_RATE = 1.0 if verify_snapshots else 0.0
+    Config.SNAPSHOT_VERIFY_DIR = str(Config.BENCH_DIR / "snapshot_verify") if verify_snapshots else None
+    CONSENT.state_path, CONSENT.state = str(workdir / "consent_state.json"), None
+    SESSIONS.state_dir, SESSIONS.states = workdir / "sessions", {}
+    # Geen credentials: de mock pagina's tonen zich al ingelogd
+    Config.SECRETS_PATH = str(workdir / "no_credentials.ini")
+    load_credentials.cache_clear()
+
+    server = MockServer(products, latency_ms, price_delay_ms, recordings_dir=recordings_dir).start()
+    browser = BrowserManager(headless, profile_dir=workdir / "browser_profile")
+    browser.on_context.append(server.route)
+    settings = {
+        "rounds": rounds, "products": products, "latency_ms": latency_ms,
+        "price_delay_ms": price_delay_ms, "recordings": str(recordings_dir) if recordings_dir else None,
+        "tracing": tracing, "trace_snapshots": trace_snapshots, "verify_snapshots": verify_snapshots,
+        "http_cache": False, "asset_cache": Config.ASSET_CACHE,
+    }
+    results = []
+    try:
+        browser.start()
+        for round_index in range(rounds):
+            for scenario in scenarios:
+                print(f"\n[bench r{round_index + 1}] {scenario.name}: {scenario.url}")
+                results.append(_run_once(browser, scenario, round_index, products))
+    finally:
+        browser.stop()
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+    settings["trace_overhead_ms"] = round(TRACES.overhead_ms(), 1) if tracing else None
+    return BenchReport(results, settings, server.requests)
+
+
+def _run_once(browser, scenario, round_index, products):
+    """Zelfde stappen als ScrapeEngine._capture_url, zonder frontier/HTTP tier/opslag."""
+    strategy = get_strategy_for_url(scenario.url)
+    metrics = UrlMetrics(scenario.url)
+    strategy.metrics = metrics
+
+    context = browser.create_context()
+    existing = set(context.pages)
+    page = context.new_page()
+    routing = apply_routing(page, strategy.ROUTING if Config.BLOCK_RESOURCES else None)
+    CONSENT.preseed(context, scenario.url)
+    trace = TRACES.begin(context, page, scenario.url)
+
+    started = time.monotonic()
+    html, error = "", None
+    try:
+        html = strategy.execute(page, scenario.url) or ""
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        print(f"  ⚠️  Error: {error}")
+    finally:
+        seconds = time.monotonic() - started
+        TRACES.end(trace, bool(html) and error is None)
+        routing.print_summary()
+        for leftover in [p for p in context.pages if p not in existing]:
+            try:
+                leftover.close()
+            except Exception:
+                pass
+        browser.page_done()
+
+    captured = html + json.dumps(strategy.artifacts)
+    record = metrics.finish(bool(html), error)
+    return {
+        "scenario": scenario.name,
+        "round": round_index + 1,
+        "ok": bool(html) and error is None,
+        "seconds": round(seconds, 3),
+        "bytes": len(html.encode("utf-8")),
+        "items": len(set(SKU_PATTERN.findall(captured))),
+        "expected_items": products if scenario.items is None else scenario.items,
+        "prices": len(PRICE_PATTERN.findall(html)),
+        "expected_prices": products if scenario.prices is None else scenario.prices,
+        "phases": record["phases"],
+        "error": error,
+    }
+
+
+class BenchReport:
+    """Resultaten per scenario (koud/warm, pages/min, capture grootte, volledigheid)."""
+
+    def __init__(self, results, settings, requests=0):
+        self.results = results
+        self.settings = settings
+        self.requests = requests
+        self.created = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def scenarios(self):
+        grouped = defaultdict(list)
+        for result in self.results:
+            grouped[result["scenario"]].append(result)
+
+        summary = {}
+        for name, runs in grouped.items():
+            warm = [r["seconds"] for r in runs if r["round"] > 1] or [r["seconds"] for r in runs]
+            phases = defaultdict(list)
+            for run in runs:
+                for phase, seconds in run["phases"].items():
+                    phases[phase].append(seconds)
+            summary[name] = {
+                "runs": len(runs),
+                "ok": sum(r["ok"] for r in runs),
+                "cold_seconds": runs[0]["seconds"],
+                "warm_seconds": round(statistics.mean(warm), 3),
+                "warm_p95": round(quantile(warm, 0.95), 3),
+                "pages_per_min": round(60 / statistics.mean(warm), 2) if statistics.mean(warm) else 0.0,
+                "kb": round(statistics.mean(r["bytes"] for r in runs) / 1024, 1),
+                "items": min(r["items"] for r in runs),
+                "expected_items": runs[0]["expected_items"],
+                "prices": min(r["prices"] for r in runs),
+                "expected_prices": runs[0]["expected_prices"],
+                "phases": {phase: round(statistics.mean(values), 3) for phase, values in phases.items()},
+            }
+        return summary
+
+    def to_dict(self):
+        return {"created": self.created, "settings": self.settings, "mock_requests": self.requests,
+                "scenarios": self.scenarios(), "results": self.results}
+
+    def save(self, output_dir=None):
+        output_dir = str(output_dir or Config.BENCH_DIR)
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def print_summary(self, baseline=None):
+        """
+        Args:
+            baseline: pad naar een eerder bewaard rapport; toont het verschil per scenario
+        """
+        previous = {}
+        if baseline:
+            with open(baseline, "r", encoding="utf-8") as f:
+                previous = json.load(f).get("scenarios", {})
+
+        summary = self.scenarios()
+        s = self.settings
+        print(f"\n📊 Benchmark ({s['rounds']} rounds, {s['products']} products, latency {s['latency_ms']} ms, "
+              f"price calls {s['price_delay_ms']} ms, {self.requests} mock requests):")
+        for name, stats in summary.items():
+            complete = "✅" if stats["items"] >= stats["expected_items"] and stats["prices"] >= stats["expected_prices"] else "⚠️ "
+            line = (f"   {complete} {name:<17} {stats['ok']}/{stats['runs']} ok, cold {stats['cold_seconds']:.1f}s, "
+                    f"warm {stats['warm_seconds']:.1f}s (p95 {stats['warm_p95']:.1f}s), "
+                    f"{stats['pages_per_min']:.1f} pages/min, {stats['kb']:.0f} KB, "
+                    f"items {stats['items']}/{stats['expected_items']}, prices {stats['prices']}/{stats['expected_prices']}")
+            if name in previous and previous[name].get("warm_seconds"):
+                before = previous[name]["warm_seconds"]
+                line += f" [{(stats['warm_seconds'] - before) / before * 100:+.0f}% vs baseline]"
+            print(line)
+            slowest = sorted(stats["phases"].items(), key=lambda item: -item[1])[:3]
+            print(f"      ⏲️  {', '.join(f'{phase} {seconds:.1f}s' for phase, seconds in slowest)}")
+
+        # Chromium's HTTP cache staat uit zodra er een route is; in een crawl is ASSET_CACHE de enige cache
+        print(f"   📦 Cache: Chromium HTTP cache off (routes); asset cache "
+              f"{'on, the only cache in a crawl' if s.get('asset_cache') else 'off'}, bypassed by the mock route")
+        if s.get("trace_overhead_ms") is not None:
+            print(f"   🎞️  Tracing: ~{s['trace_overhead_ms']:.0f} ms/page in start/stop_chunk "
+                  f"(full cost: compare with a --no-tracing run via --baseline)")
+
+        warm_total = sum(stats["warm_seconds"] for stats in summary.values())
+        if warm_total:
+            print(f"   🏁 Overall: {len(summary) / warm_total * 60:.1f} pages/min (warm)")
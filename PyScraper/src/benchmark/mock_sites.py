@@ -0,0 +1,435 @@
+import html
+import json
+import math
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode
+from utils.file_ops import safe_filename_from_url
+
+# Hosts die de mock server overneemt (de URLs blijven de echte, zodat strategie en
+# vendor detectie ongewijzigd werken; context.route stuurt ze naar de server)
+MOCK_HOSTS = {
+    "www.phoenixcontact.com": "phoenix",
+    "www.se.com": "schneider",
+    "mall.industry.siemens.com": "siemens",
+}
+
+# Herkenbare SKUs in de output: zo telt de benchmark hoeveel producten er echt in de capture zitten
+SKU_PATTERN = re.compile(r"MOCK-[PSX]-\d{6}")
+
+# Usercentrics (open shadow root) of OneTrust banner, verschijnt na consentDelay ms
+# tenzij het consent cookie er al is.
+_CONSENT_JS = """(() => {
+    const cfg = window.MOCK || {};
+    const onetrust = cfg.consent === 'onetrust';
+    const cookie = onetrust ? 'OptanonAlertBoxClosed' : 'uc_user_interaction';
+    if (document.cookie.split('; ').some(c => c.startsWith(cookie + '='))) return;
+    setTimeout(() => {
+        const host = document.createElement('div');
+        const accept = () => {
+            document.cookie = cookie + '=' + Date.now() + '; path=/; max-age=31536000';
+            host.remove();
+        };
+        if (onetrust) {
+            host.id = 'onetrust-banner-sdk';
+            host.innerHTML = '<p>Wij gebruiken cookies.</p><button id="onetrust-accept-btn-handler">Alles accepteren</button>';
+            host.querySelector('button').addEventListener('click', accept);
+        } else {
+            host.id = 'usercentrics-root';
+            const root = host.attachShadow({mode: 'open'});
+            root.innerHTML = '<div role="dialog"><p>Cookies</p><button data-testid="uc-accept-all-button">Accept All</button></div>';
+            root.querySelector('button').addEventListener('click', accept);
+        }
+        host.style.cssText = 'position:fixed;bottom:0;left:0;right:0;z-index:9999;background:#fff;padding:24px';
+        document.body.appendChild(host);
+    }, cfg.consentDelay || 0);
+})();"""
+
+# Prijs/beschikbaarheid web components (Phoenix sh-product-*, Schneider pes-product-price):
+# lazy (IntersectionObserver), prijs via een fetch, gerenderd in een open shadow root.
+_COMPONENTS_JS = """(() => {
+    const io = new IntersectionObserver(entries => entries.forEach(e => {
+        if (!e.isIntersecting) return;
+        io.unobserve(e.target);
+        e.target.load();
+    }), {rootMargin: '100px'});
+
+    class MockPrice extends HTMLElement {
+        connectedCallback() {
+            if (this.shadowRoot) return;
+            this.attachShadow({mode: 'open'});
+            io.observe(this);
+        }
+        async load() {
+            const sku = this.getAttribute('data-sku');
+            const res = await fetch('/_mock/price?sku=' + encodeURIComponent(sku));
+            const data = await res.json();
+            this.shadowRoot.innerHTML = this.render(data);
+        }
+        render(data) {
+            return `<span class="mock-price" data-price-sku="${data.sku}">€ ${data.price}</span>`;
+        }
+    }
+    class MockAvailability extends MockPrice {
+        render(data) {
+            return `<span class="mock-availability">${data.stock} op voorraad</span>`;
+        }
+    }
+    customElements.define('sh-product-price', class extends MockPrice {});
+    customElements.define('sh-product-availability', MockAvailability);
+    customElements.define('pes-product-price', class extends MockPrice {});
+})();"""
+
+# Phoenix: paginagrootte dropdown (HTMX-achtige swap van #se-result)
+_PHOENIX_JS = """(() => {
+    const body = document.querySelector('.edd-body');
+    if (!body) return;
+    document.querySelector('.edd-head').addEventListener('click', () => { body.hidden = false; });
+    document.querySelectorAll('.edd-option').forEach(option => option.addEventListener('click', async () => {
+        body.hidden = true;
+        const size = option.getAttribute('title');
+        const res = await fetch(location.pathname + '?fragment=1&page=1&size=' + size);
+        document.querySelector('#se-result').innerHTML = await res.text();
+        history.replaceState(null, '', location.pathname + '?page=1&size=' + size);
+    }));
+})();"""
+
+# Schneider: lijst/raster switch en 'Volgende' die de product-cards-wrapper vervangt
+_SCHNEIDER_JS = """(() => {
+    const wrapper = document.querySelector('product-cards-wrapper');
+    const next = document.querySelector("se-icon[title='Volgende']");
+    let page = 1;
+    if (!wrapper) return;
+    document.querySelector('.button-list').addEventListener('click', (e) => {
+        e.currentTarget.classList.add('active');
+        wrapper.setAttribute('view', 'list');
+    });
+    next.addEventListener('click', async () => {
+        if (next.hasAttribute('disabled')) return;
+        const res = await fetch(location.pathname + '?fragment=1&page=' + (page + 1));
+        const data = await res.json();
+        page += 1;
+        wrapper.innerHTML = data.html;
+        wrapper.setAttribute('product-ids', data.ids);
+        if (data.last) next.setAttribute('disabled', '');
+    });
+})();"""
+
+# Siemens: lijstweergave, 'Meer laden' via een JSON paginatie API, technische gegevens tab
+_SIEMENS_JS = """(() => {
+    const cfg = window.MOCK;
+    const list = document.querySelector('#productVariants');
+    const more = document.querySelector('.infinite-pagination__load-more-btn');
+    let page = 1;
+    if (more) more.addEventListener('click', async () => {
+        const res = await fetch(`/_mock/siemens/variants?family=${cfg.family}&page=${page + 1}&pageSize=${cfg.pageSize}`);
+        const data = await res.json();
+        page += 1;
+        list.insertAdjacentHTML('beforeend', data.items.map(i =>
+            `<div class="catalog-list-item" data-mock-sku="${i.mlfb}"><span class="mlfb">${i.mlfb}</span> <span>${i.name}</span></div>`).join(''));
+        if (list.children.length >= data.totalCount) more.style.display = 'none';
+    });
+    const tech = document.querySelector('#tech-tab');
+    if (tech) tech.addEventListener('click', () => setTimeout(() => {
+        document.querySelector('#tab-content').innerHTML = cfg.techHtml;
+    }, cfg.techDelay));
+})();"""
+
+_ASSETS = {
+    "/mock/consent.js": _CONSENT_JS,
+    "/mock/shop-components.js": _COMPONENTS_JS,
+    "/mock/phoenix.js": _PHOENIX_JS,
+    "/mock/schneider.js": _SCHNEIDER_JS,
+    "/mock/siemens.js": _SIEMENS_JS,
+}
+
+_STYLE = """<style>
+    body { font-family: sans-serif; margin: 0; }
+    header, footer { background: #eee; padding: 16px; }
+    article, .product-card { min-height: 160px; border-bottom: 1px solid #ddd; padding: 8px; }
+    .catalog-list-item { padding: 12px; border-bottom: 1px solid #ddd; }
+    .spacer { height: 1200px; }
+</style>"""
+
+
+class MockCatalog:
+    """Deterministische synthetische producten per vendor (zelfde data bij elke run)."""
+
+    def __init__(self, products=120):
+        self.products = products
+
+    def items(self, prefix, family, count=None):
+        return [
+            {**self.price(f"MOCK-{prefix}-{family * 1000 + i:06d}"), "name": f"Mock product {family}.{i}"}
+            for i in range(count or self.products)
+        ]
+
+    def price(self, sku):
+        n = int(sku.rsplit("-", 1)[-1]) if sku and sku[-1].isdigit() else 0
+        return {"sku": sku, "price": f"{n % 900 + 10},{n % 100:02d}", "stock": (n * 37) % 500}
+
+
+class MockServer:
+    """
+    Lokale HTTP server met nagebootste vendor sites voor benchmarks en regressietests.
+
+    Reproduceert waar de strategies op steunen:
+    - Usercentrics (shadow root) / OneTrust cookie banners met consent cookie
+    - Phoenix: #se-result lijst, paginagrootte dropdown (swap), a[data-se-page-number] paginatie,
+      sh-product-price/availability in shadow DOM
+    - Schneider: product-cards-wrapper[product-ids], lijst switch, se-icon 'Volgende',
+      pes-product-price in shadow DOM, [plain-all-data] detailpagina's
+    - Siemens: lijstweergave, 'Meer laden' via JSON API (page/pageSize/totalCount), tech tab
+
+    Latency is instelbaar (documenten/API's en de prijs calls apart). Met recordings_dir
+    worden eerder opgeslagen pagina's (PyScraper output, zelfde bestandsnaam) geserveerd
+    in plaats van de synthetische.
+    """
+
+    def __init__(self, products=120, latency_ms=80, price_delay_ms=300, consent_delay_ms=300,
+                 recordings_dir=None, port=0):
+        self.catalog = MockCatalog(products)
+        self.latency = latency_ms / 1000
+        self.price_delay = price_delay_ms / 1000
+        self.consent_delay_ms = consent_delay_ms
+        self.recordings_dir = recordings_dir
+        self.requests = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(_MockHandler):
+            mock = server
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-sites", daemon=True)
+        self.thread.start()
+        print(f"🧪 Mock vendor sites on {self.base_url} ({', '.join(MOCK_HOSTS)})")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def route(self, context):
+        """
+        Stuur alle requests van de context naar de mock server (context.route).
+        Page routes (routing profielen) komen eerst en gaan via route.fallback() hierheen.
+        Andere hosts worden afgebroken: de benchmark blijft volledig offline.
+        """
+        def handler(route):
+            request = route.request
+            parsed = urlparse(request.url)
+            if parsed.netloc not in MOCK_HOSTS:
+                route.abort("blockedbyclient")
+                return
+            target = f"{self.base_url}{parsed.path or '/'}" + (f"?{parsed.query}" if parsed.query else "")
+            try:
+                response = route.fetch(url=target, headers={**request.headers, "x-mock-host": parsed.netloc})
+                route.fulfill(response=response)
+            except Exception:
+                route.abort("failed")
+
+        context.route("**/*", handler)
+
+    # ── Pagina's ──────────────────────────────────────────────
+
+    def document(self, host, path, query):
+        """Geeft (status, content type, body) voor een request op een mock host."""
+        vendor = MOCK_HOSTS.get(host)
+        url = f"https://{host}{path}"
+
+        if path in _ASSETS:
+            return 200, "application/javascript", _ASSETS[path]
+        if path == "/_mock/price":
+            time.sleep(self.price_delay)
+            return 200, "application/json", json.dumps(self.catalog.price(query.get("sku", "")))
+        if path.startswith("/mock/img/"):
+            return 200, "image/svg+xml", '<svg xmlns="http://www.w3.org/2000/svg" width="120" height="80"/>'
+
+        time.sleep(self.latency)
+        if self.recordings_dir:
+            recorded = os.path.join(self.recordings_dir, safe_filename_from_url(url))
+            if os.path.exists(recorded):
+                with open(recorded, "r", encoding="utf-8") as f:
+                    return 200, "text/html; charset=utf-8", f.read()
+
+        handler = {"phoenix": self._phoenix, "schneider": self._schneider, "siemens": self._siemens}.get(vendor)
+        result = handler(url, path, query) if handler else None
+        if result is None:
+            return 404, "text/html; charset=utf-8", "<html><body><h1>Not found</h1></body></html>"
+        return result
+
+    def _page(self, url, title, body, consent, script, extra=None):
+        config = {"consent": consent, "consentDelay": self.consent_delay_ms, **(extra or {})}
+        return 200, "text/html; charset=utf-8", f"""<!DOCTYPE html>
+<html lang="nl"><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<link rel="canonical" href="{html.escape(url)}">{_STYLE}
+<script>window.MOCK = {json.dumps(config)};</script>
+<script src="/mock/shop-components.js"></script>
+<script src="/mock/consent.js" defer></script>
+</head><body>
+<header><nav>{html.escape(title)}</nav></header>
+<main>{body}</main>
+<footer><div class="spacer"></div>Mock footer</footer>
+<script src="/mock/{script}.js"></script>
+</body></html>"""
+
+    # Phoenix Contact: /nl-nl/producten/serie-<n>?page=&size= en /nl-nl/producten/<sku>
+    def _phoenix(self, url, path, query):
+        match = re.search(r"/producten/serie-(\d+)$", path)
+        if match:
+            items = self.catalog.items("P", int(match.group(1)))
+            size = int(query.get("size", 10))
+            page = int(query.get("page", 1))
+            results = self._phoenix_results(path, items, page, size)
+            if query.get("fragment"):
+                return 200, "text/html; charset=utf-8", results
+            options = "".join(f'<div class="edd-option" title="{n}">{n}</div>' for n in (10, 20, 50))
+            body = (f'<span id="cu-logout"><a href="#">Afmelden</a></span>'
+                    f'<div class="edd"><div class="edd-head">Resultaten per pagina: {size}</div>'
+                    f'<div class="edd-body" hidden>{options}</div></div>'
+                    f'<div id="se-result">{results}</div>')
+            return self._page(url, f"Mock Phoenix serie {match.group(1)}", body, "usercentrics", "phoenix")
+
+        match = re.search(r"/producten/(MOCK-P-\d{6})$", path)
+        if match:
+            item = self.catalog.price(match.group(1))
+            rows = "".join(f"<tr><th>Eigenschap {i}</th><td>Waarde {i}</td></tr>" for i in range(40))
+            body = (f'<span id="cu-logout"><a href="#">Afmelden</a></span>'
+                    f'<div class="productdetails" data-mock-sku="{item["sku"]}"><h1>{item["sku"]}</h1>'
+                    f'<sh-product-price data-sku="{item["sku"]}"></sh-product-price>'
+                    f'<sh-product-availability data-sku="{item["sku"]}"></sh-product-availability>'
+                    f'<div class="spacer"></div><table class="specifications">{rows}</table></div>')
+            return self._page(url, f"Mock Phoenix {item['sku']}", body, "usercentrics", "phoenix")
+        return None
+
+    def _phoenix_results(self, path, items, page, size):
+        pages = max(1, math.ceil(len(items) / size))
+        articles = "".join(
+            f'<article class="se-result-pos" data-mock-sku="{item["sku"]}"><h3>{item["name"]}</h3>'
+            f'<img loading="lazy" src="/mock/img/{item["sku"]}.svg">'
+            f'<sh-product-price data-sku="{item["sku"]}"></sh-product-price>'
+            f'<sh-product-availability data-sku="{item["sku"]}"></sh-product-availability></article>'
+            for item in items[(page - 1) * size:page * size]
+        )
+        links = []
+        for n in range(1, pages + 1):
+            active = ' class="se-active"' if n == page else ""
+            links.append(f'<a data-se-page-number="{n}" href="{path}?{urlencode({"page": n, "size": size})}"{active}>{n}</a>')
+        links = "".join(links)
+        return f'{articles}<nav class="se-pagination">{links}</nav>'
+
+    # Schneider Electric: /nl/nl/product-range/<n>-mock/ en /nl/nl/product/<sku>/
+    def _schneider(self, url, path, query):
+        per_page = 12
+        match = re.search(r"/product-range/(\d+)-mock/?$", path)
+        if match:
+            items = self.catalog.items("S", int(match.group(1)))
+            pages = max(1, math.ceil(len(items) / per_page))
+            page = int(query.get("page", 1))
+            chunk = items[(page - 1) * per_page:page * per_page]
+            ids = ",".join(item["sku"] for item in chunk)
+            cards = "".join(
+                f'<div class="product-card" data-mock-sku="{item["sku"]}"><h3>{item["name"]}</h3>'
+                f'<pes-product-price data-sku="{item["sku"]}"></pes-product-price></div>'
+                for item in chunk
+            )
+            if query.get("fragment"):
+                return 200, "application/json", json.dumps({"html": cards, "ids": ids, "last": page >= pages})
+            disabled = " disabled" if pages == 1 else ""
+            body = (f'<div class="range-toolbar"><button class="button-grid active" title="Raster">Raster</button>'
+                    f'<button class="button-list" title="Lijst">Lijst</button></div>'
+                    f'<product-cards-wrapper product-ids="{ids}" view="grid">{cards}</product-cards-wrapper>'
+                    f'<div class="pagination"><se-icon title="Volgende" aria-label="Volgende"{disabled}>&rsaquo;</se-icon></div>')
+            return self._page(url, f"Mock Schneider range {match.group(1)}", body, "onetrust", "schneider")
+
+        match = re.search(r"/product/(MOCK-S-\d{6})/?$", path)
+        if match:
+            item = self.catalog.price(match.group(1))
+            data = html.escape(json.dumps({"sku": item["sku"], "characteristics": {f"c{i}": f"v{i}" for i in range(40)}}))
+            body = (f'<h1>{item["sku"]}</h1><pes-product-price data-sku="{item["sku"]}"></pes-product-price>'
+                    f'<div class="spacer"></div><div plain-all-data="{data}" data-mock-sku="{item["sku"]}"></div>')
+            return self._page(url, f"Mock Schneider {item['sku']}", body, "onetrust", "schneider")
+        return None
+
+    # Siemens: /mall/nl/nl/Catalog/Products/<n> (varianten) en /mall/nl/nl/Catalog/Product/<mlfb>
+    def _siemens(self, url, path, query):
+        page_size = 20
+        if path == "/_mock/siemens/variants":
+            items = self.catalog.items("X", int(query.get("family", 1)))
+            page, size = int(query.get("page", 1)), int(query.get("pageSize", page_size))
+            chunk = items[(page - 1) * size:page * size]
+            return 200, "application/json", json.dumps({
+                "totalCount": len(items), "page": page, "pageSize": size,
+                "items": [{"mlfb": i["sku"], "name": i["name"], "price": i["price"]} for i in chunk],
+            })
+
+        match = re.search(r"/Catalog/Products/(\d+)$", path)
+        if match:
+            family = int(match.group(1))
+            items = self.catalog.items("X", family)
+            rows = "".join(
+                f'<div class="catalog-list-item" data-mock-sku="{item["sku"]}"><span class="mlfb">{item["sku"]}</span> '
+                f'<span>{item["name"]}</span></div>'
+                for item in items[:page_size]
+            )
+            more = '<button class="infinite-pagination__load-more-btn">Meer laden</button>' if len(items) > page_size else ""
+            body = ('<div class="view-switch"><input type="radio" id="gridView" name="view" checked>'
+                    '<label for="gridView">Tegels</label><input type="radio" id="listView" name="view">'
+                    '<label for="listView">Lijst weergave</label></div>'
+                    f'<div id="productVariants">{rows}</div>{more}')
+            return self._page(url, f"Mock Siemens family {family}", body, "usercentrics", "siemens",
+                              {"family": family, "pageSize": page_size})
+
+        match = re.search(r"/Catalog/Product/(MOCK-X-\d{6})$", path)
+        if match:
+            sku = match.group(1)
+            commercial = "".join(f"<tr><th>Commercieel {i}</th><td>{i}</td></tr>" for i in range(20))
+            tech = "".join(f"<tr><th>Technisch {i}</th><td>{i}</td></tr>" for i in range(60))
+            body = (f'<h1 data-mock-sku="{sku}">{sku}</h1><ul class="tabs"><li class="active">Commerciële gegevens</li>'
+                    f'<li id="tech-tab">Technische gegevens</li></ul>'
+                    f'<div id="tab-content"><table class="commercial">{commercial}</table></div>')
+            tech_html = f'<sie-ps-technical-data><table class="TEPreviewTable">{tech}</table></sie-ps-technical-data>'
+            return self._page(url, f"Mock Siemens {sku}", body, "usercentrics", "siemens",
+                              {"techHtml": tech_html, "techDelay": int(self.latency * 1000) * 3})
+        return None
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    mock = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        host = self.headers.get("x-mock-host") or next(iter(MOCK_HOSTS))
+        with self.mock.lock:
+            self.mock.requests += 1
+        try:
+            status, content_type, body = self.mock.document(host, parsed.path, query)
+        except Exception as e:
+            status, content_type, body = 500, "text/plain", f"Mock error: {e}"
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_POST = do_GET
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from .config import Config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    url         TEXT PRIMARY KEY,
+    sha         TEXT NOT NULL,
+    headers     TEXT NOT NULL,
+    expires_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS objects (
+    sha         TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    last_used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assets_sha ON assets (sha);
+CREATE INDEX IF NOT EXISTS idx_objects_lru ON objects (last_used);
+"""
+
+# Versie/hash in de URL (bundle.3f9a1c2e.js, /static/a1b2c3d4e5/, ?v=123): de inhoud wijzigt nooit
+_VERSIONED = re.compile(r"[.\-_/~][0-9a-f]{8,}[.\-_/]|[?&](v|ver|version|hash|rev|build)=[\w.\-]+", re.IGNORECASE)
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+# Headers die mee terug gaan; de body is al gedecodeerd, dus geen content-encoding/length
+_KEEP_HEADERS = ("content-type", "access-control-allow-origin", "timing-allow-origin", "cache-control")
+
+
+def asset_ttl(url, headers):
+    """
+    Hoe lang een response als onveranderlijk bewaard mag worden (seconden), of None.
+    Geversioneerde URLs en 'immutable' krijgen Config.ASSET_CACHE_MAX_TTL; anders telt
+    max-age vanaf Config.ASSET_CACHE_MIN_MAX_AGE.
+    """
+    cache_control = (headers.get("cache-control") or "").lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return None
+    if "immutable" in cache_control or _VERSIONED.search(url):
+        return Config.ASSET_CACHE_MAX_TTL
+    match = _MAX_AGE.search(cache_control)
+    if match and int(match.group(1)) >= Config.ASSET_CACHE_MIN_MAX_AGE:
+        return min(int(match.group(1)), Config.ASSET_CACHE_MAX_TTL)
+    return None
+
+
+class AssetCache:
+    """
+    Lokale cache voor statische assets (JS bundles, CSS, fonts) op route niveau.
+
+    Routing schakelt de HTTP cache van Chromium uit, dus zonder dit haalt elke pagina
+    dezelfde bundles opnieuw op. Assets worden content-addressed bewaard
+    (objects/<sha[:2]>/<sha>, dezelfde inhoud onder een andere URL = één object),
+    met een SQLite index url -> sha. Boven Config.ASSET_CACHE_MAX_MB worden de minst
+    recent gebruikte objecten verwijderd. Documenten en XHR/fetch gaan altijd naar het net.
+
+    Wordt als context route geïnstalleerd; de page routes (routing profielen) komen
+    eerst en geven toegelaten requests via route.fallback() door.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir or Config.ASSET_CACHE_DIR)
+        self.lock = threading.Lock()
+        self.conn = None
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.uncacheable = 0
+        self.bytes_saved = 0
+        self.evicted = 0
+
+    def attach(self, context):
+        """Installeer de cache als route op een (nieuwe) browser context."""
+        context.route("**/*", self._handle)
+
+    def _connect(self):
+        # Lui openen: enkel processen die echt een browser starten hebben een connectie nodig
+        if self.conn is None:
+            (self.cache_dir / "objects").mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.cache_dir / "index.sqlite3"), check_same_thread=False, timeout=30)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(_SCHEMA)
+        return self.conn
+
+    def _handle(self, route):
+        request = route.request
+        if request.method != "GET" or request.resource_type not in Config.ASSET_CACHE_TYPES:
+            route.fallback()
+            return
+
+        cached = self.lookup(request.url)
+        if cached:
+            headers, body = cached
+            route.fulfill(status=200, headers=headers, body=body)
+            self._count(hits=1, bytes_saved=len(body))
+            return
+
+        try:
+            response = route.fetch()
+            body = response.body()
+        except Exception:
+            route.fallback()
+            return
+        route.fulfill(response=response, body=body)
+
+        ttl = asset_ttl(request.url, response.headers) if response.status == 200 else None
+        if ttl and len(body) <= Config.ASSET_CACHE_MAX_OBJECT_MB * 1024 * 1024:
+            self.store(request.url, response.headers, body, ttl)
+            self._count(misses=1, stored=1)
+        else:
+            self._count(misses=1, uncacheable=1)
+
+    def lookup(self, url):
+        """Geeft (headers, body) als de URL vers in de cache zit, anders None."""
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            row = conn.execute("SELECT sha, headers, expires_at FROM assets WHERE url = ?", (url,)).fetchone()
+            if not row or row[2] < now:
+                return None
+            sha, headers = row[0], json.loads(row[1])
+            try:
+                with open(self._object_path(sha), "rb") as f:
+                    body = f.read()
+            except OSError:
+                # Object weg (handmatig opgeruimd / ander proces evicted): opnieuw ophalen
+                conn.execute("DELETE FROM assets WHERE url = ?", (url,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE objects SET last_used = ? WHERE sha = ?", (now, sha))
+            conn.commit()
+        return headers, body
+
+    def store(self, url, headers, body, ttl):
+        sha = hashlib.sha256(body).hexdigest()
+        path = self._object_path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{sha}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+
+        kept = {k: v for k, v in headers.items() if k.lower() in _KEEP_HEADERS}
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO objects (sha, size, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(sha) DO UPDATE SET last_used = excluded.last_used",
+                (sha, len(body), now),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO assets (url, sha, headers, expires_at) VALUES (?, ?, ?, ?)",
+                (url, sha, json.dumps(kept), now + ttl),
+            )
+            conn.commit()
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Minst recent gebruikte objecten weg tot de cache onder ASSET_CACHE_MAX_MB zit (lock vastgehouden)."""
+        limit = Config.ASSET_CACHE_MAX_MB * 1024 * 1024
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        if total <= limit:
+            return
+        for sha, size in conn.execute("SELECT sha, size FROM objects ORDER BY last_used").fetchall():
+            if total <= limit:
+                break
+            conn.execute("DELETE FROM assets WHERE sha = ?", (sha,))
+            conn.execute("DELETE FROM objects WHERE sha = ?", (sha,))
+            try:
+                os.remove(self._object_path(sha))
+            except OSError:
+                pass
+            total -= size
+            self.evicted += 1
+        conn.commit()
+
+    def _object_path(self, sha):
+        return self.cache_dir / "objects" / sha[:2] / sha
+
+    def _count(self, **values):
+        with self.lock:
+            for name, value in values.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def print_summary(self):
+        requests = self.hits + self.misses
+        if not requests:
+            return
+        print(f"📦 Asset cache: {self.hits}/{requests} hits ({self.hits / requests:.0%}), "
+              f"{self.bytes_saved / 1024 / 1024:.1f} MB served locally, {self.stored} stored, "
+              f"{self.uncacheable} not cacheable, {self.evicted} evicted")
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+ASSET_CACHE = AssetCache()
@@ -1,19 +1,69 @@
+import os
+import shutil
+import threading
+from pathlib import Path
 from playwright.sync_api import sync_playwright
 from playwright_stealth import Stealth
 from fake_useragent import UserAgent
 from .config import Config
+from .memory import BROWSER_MEMORY, child_pids, tree_rss
+from .tracing import start_tracing
+from .asset_cache import ASSET_CACHE
+
+_START_LOCK = threading.Lock()
+
+def clone_profile(source, target):
+    """
+    Kopieer een browser profiel naar een nieuwe map (voor extra workers).
+    Chromium lockt een user_data_dir, dus elke instantie heeft een eigen kopie nodig.
+    """
+    source, target = Path(source), Path(target)
+    if target.exists() or not source.exists():
+        return target
+
+    print(f"  🧬 Cloning browser profile to {target}...")
+    shutil.copytree(
+        source, target,
+        ignore=shutil.ignore_patterns("Singleton*", "lockfile", "*.lock", "Crashpad"),
+    )
+    return target
+
 
 class BrowserManager:
-    def __init__(self, headless=True):
+    """
+    Eén browser context die over pagina's heen hergebruikt wordt.
+
+    Na Config.CONTEXT_RECYCLE_PAGES pagina's, of als de browser processen meer dan
+    Config.CONTEXT_RECYCLE_RSS_MB geheugen gebruiken, wordt de context afgesloten en
+    opnieuw gestart. Het profiel op schijf blijft, en de cookies (ook session cookies,
+    die Chromium niet bewaart) worden in de nieuwe context teruggezet.
+    """
+
+    def __init__(self, headless=True, profile_dir=None):
         self.headless = headless
+        self.profile_dir = Path(profile_dir) if profile_dir else Config.BASE_DIR / "browser_profile"
         self.playwright = None
         self.browser = None
+        self.context = None
+        self.closed = False
+        self.persistent = False
+        self.driver_pids = set()
+        self.pages = 0          # pagina's in de huidige context
+        self.total_pages = 0
+        # Callbacks voor elke nieuwe context (ook na recycle), bv. context.route van de benchmark
+        self.on_context = []
         self.ua = UserAgent()
 
     def start(self):
         """Start de browser instantie (één keer)."""
-        self.playwright = sync_playwright().start()
-        
+        # Het nieuwe kindproces is de Playwright driver; de browser draait daaronder (geheugenmeting)
+        with _START_LOCK:
+            before = child_pids(os.getpid())
+            self.playwright = sync_playwright().start()
+            self.driver_pids = child_pids(os.getpid()) - before
+        self._launch()
+
+    def _launch(self, cookies=None):
         # Extra argumenten om detectie te verminderen
         browser_args = [
             '--disable-blink-features=AutomationControlled',
@@ -25,7 +75,7 @@ class BrowserManager:
         ]
 
         # Pad voor persistent profile
-        user_data_path = Config.BASE_DIR / "browser_profile"
+        user_data_path = self.profile_dir
 
         print(f"  📂 Using persistent profile at: {user_data_path}")
 
@@ -44,14 +94,31 @@ class BrowserManager:
                 # GEEN fake user-agent gebruiken bij echte browser!
                 # user_agent=self.ua.random 
             )
+           self.context = self.browser
+           self.persistent = True
            
         except Exception as e:
             print(f"  ⚠️  Failed to launch persistent context: {e}")
             # Fallback (kan nog steeds falen als geblokkeerd)
             self.browser = self.playwright.chromium.launch(args=browser_args, headless=self.headless)
+            self.context = self.browser.new_context()
+            self.persistent = False
+
+        self.closed = False
+        self.context.on("close", self._on_close)
+        start_tracing(self.context)
+        if Config.ASSET_CACHE:
+            ASSET_CACHE.attach(self.context)
+        for hook in self.on_context:
+            hook(self.context)
+        if cookies:
+            self.context.add_cookies(cookies)
+        self.pages = 0
 
     def stop(self):
         """Sluit alles netjes af."""
+        if self.total_pages:
+            BROWSER_MEMORY.sample(self.profile_dir.name, self.total_pages, self._rss())
         if self.browser:
             self.browser.close()
         if self.playwright:
@@ -59,18 +126,63 @@ class BrowserManager:
 
     def create_context(self):
         """
-        Bij persistent context IS de browser al de context.
-        We geven dus gewoon self.browser terug (wat eigenlijk een Context object is).
+        De gedeelde context voor de volgende pagina.
+        Bij persistent context IS de browser al de context. Is die intussen
+        weggevallen (crash), dan wordt er een nieuwe gestart.
+        """
+        if self.context is None or self.closed:
+            print("  ♻️  Browser context lost, relaunching...")
+            self._close_quietly()
+            self._launch()
+        return self.context
+
+    def page_done(self):
         """
-        # Als we persistent runnen, is self.browser eigenlijk de Context
-        # Stealth settings toepassen kan nog steeds
-        
-        context = self.browser
-        
-        # Probeer stealth script toe te voegen als het nog niet bestaat
-        # try:
-        #     context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        # except:
-        #     pass
-            
-        return context
+        Na elke pagina (i.p.v. context.close()): tellen, periodiek geheugen meten
+        en de context recyclen als een drempel bereikt is.
+        """
+        self.pages += 1
+        self.total_pages += 1
+        report = self.total_pages % Config.MEMORY_REPORT_EVERY == 0
+        # Meten kost een procesboom walk: enkel om de CONTEXT_RSS_CHECK_EVERY pagina's
+        check = Config.CONTEXT_RECYCLE_RSS_MB and self.pages % Config.CONTEXT_RSS_CHECK_EVERY == 0
+        rss = self._rss() if (report or check) else None
+        if report:
+            BROWSER_MEMORY.sample(self.profile_dir.name, self.total_pages, rss)
+
+        reason = None
+        if Config.CONTEXT_RECYCLE_PAGES and self.pages >= Config.CONTEXT_RECYCLE_PAGES:
+            reason = f"{self.pages} pages"
+        elif rss and Config.CONTEXT_RECYCLE_RSS_MB and rss > Config.CONTEXT_RECYCLE_RSS_MB * 1024 * 1024:
+            reason = f"{rss / 1024 / 1024:.0f} MB RSS"
+        if reason:
+            if not report:
+                BROWSER_MEMORY.sample(self.profile_dir.name, self.total_pages, rss or self._rss())
+            self.recycle(reason)
+
+    def recycle(self, reason=""):
+        """Context sluiten en opnieuw starten, met behoud van cookies."""
+        print(f"  ♻️  Recycling browser context ({reason})...")
+        cookies = []
+        try:
+            cookies = self.context.cookies()
+        except Exception as e:
+            print(f"  ⚠️  Could not read cookies before recycling: {e}")
+        self._close_quietly()
+        self._launch(cookies=cookies)
+        BROWSER_MEMORY.recycled()
+
+    def _rss(self):
+        return tree_rss(self.driver_pids) if self.driver_pids else None
+
+    def _on_close(self, _context=None):
+        self.closed = True
+
+    def _close_quietly(self):
+        try:
+            if self.browser:
+                self.context.remove_listener("close", self._on_close)
+                self.browser.close()
+        except Exception:
+            pass
+        self.browser = self.context = None
@@ -5,6 +5,9 @@ class Config:
     # Paths
     # PyScraper root (assuming config.py is in src/core/)
     BASE_DIR = Path(__file__).parent.parent.parent
+    # Vendor configuratie van MainScraperEngine (detect/specs/fetch regels)
+    MSE_DIR = BASE_DIR.parent / "MainScraperEngine"
+    VENDOR_YML_PATH = MSE_DIR / "Vendor_YML.yaml"
 
     # Browser settings
     VIEWPORT = {'width': 1920, 'height': 1080}
@@ -12,13 +15,205 @@ class Config:
     TIMEZONE = 'Europe/Brussels'
     
     # Timeouts (in ms)
-    TIMEOUT_PAGE_LOAD = 60000
+    TIMEOUT_PAGE_LOAD = 60000  # Plafond; met PACING een adaptieve timeout per domein/paginatype
     TIMEOUT_SELECTOR = 5000
+    READY_TIMEOUT = 10000  # Plafond voor readiness waits
+    READY_LEGACY_FACTOR = 2  # Plafond voor waits die een vaste sleep vervangen: x die sleep
     
     # Scrape behavior
-    RETRIES = 2
-    SCROLL_DELAY = 100  # ms
+    RETRIES = 2          # extra pogingen per URL na een fout (zie core/frontier.py)
+    RETRY_BACKOFF = 30   # s; verdubbelt per poging
+    SCROLL_DELAY = 100  # ms     (oude vaste scroll; nog gebruikt als referentie in de rapportage)
     SCROLL_STEP = 100   # pixels
+    # Adaptieve scroll (zie strategies/scrolling.py)
+    SCROLL_SETTLE_MS = 150   # pauze na elke viewport sprong
+    SCROLL_QUIET_MS = 500    # zo lang geen nieuwe nodes/requests/images -> klaar
+    SCROLL_MAX_MS = 15000    # plafond per scroll
+
+    # Duurzame crawl frontier (SQLite): status/pogingen/fouten per URL, --resume
+    FRONTIER_PATH = BASE_DIR / "data" / "frontier.sqlite3"
+
+    # Change detection (zie core/fingerprint.py): fingerprints per URL in de frontier
+    CHANGE_DETECTION = True
+    CONDITIONAL_SKIP_RENDERED = False  # Ook browser-vendors overslaan op een 304 (hun data komt via XHR)
+    CHANGE_MANIFEST = 'changed_manifest.json'  # In de output map; MSE.py verwerkt enkel changed + new
+
+    # Variant fan-out (zie core/fanout.py): variant URLs uit MSE output terug in de frontier
+    FANOUT = False
+    FANOUT_MAX_DEPTH = 1          # 1 = lijst -> detailpagina's, niet verder
+    FANOUT_BUDGET = 5000          # Max. ontdekte URLs per crawl
+    FANOUT_ONLY_CHANGED = False   # Enkel varianten met gewijzigde prijs/beschikbaarheid (vereist CHANGE_DETECTION)
+
+    # Concurrency (aantal parallelle browser workers)
+    CONCURRENCY = 1
+    # Multi-process sharding (zie core/shards.py): processen, elk met CONCURRENCY workers
+    SHARDS = 1
+    SHARD_MAX_RESTARTS = 3
+    # Max. gelijktijdige pagina's per domein (suffix match op netloc)
+    DOMAIN_LIMITS = {
+        'phoenixcontact.com': 2,
+        'se.com': 4,
+        'siemens.com': 2,
+    }
+    DEFAULT_DOMAIN_LIMIT = 2
+
+    # Crawl planner (zie core/planner.py): URLs per vendor/paginatype groeperen en domeinen interleaven
+    PLAN_CRAWL = True
+    # Paginatype per vendor: (regex op pad + query, 'list'/'detail'); eerste match wint, anders 'page'
+    PAGE_TYPES = {
+        'schneider': [(r'/product-range/|parent-subcategory-id', 'list'), (r'/product/', 'detail')],
+        'siemens': [(r'/Catalog/Products/', 'list'), (r'/Catalog/Product/', 'detail')],
+        'phoenix': [(r'/producten/\d{7}', 'detail'), (r'/producten/', 'list')],
+    }
+    PLAN_DEFAULT_SECONDS = {'list': 90, 'detail': 25, 'page': 40}  # s per URL zonder historiek
+    PLAN_HISTORY = 5000        # recentste geslaagde pogingen als historiek
+    PLAN_MIN_SAMPLES = 5       # minimum per groep, anders de default
+
+    # Per-domein pacing en adaptieve timeouts (zie core/pacing.py)
+    PACING = True
+    PACING_START_RATE = 0.5     # requests/s per domein bij de start
+    PACING_MIN_RATE = 0.05
+    PACING_MAX_RATE = 5.0
+    PACING_BURST = 2
+    PACING_INCREASE = 0.1       # +req/s na PACING_INCREASE_EVERY vlotte requests
+    PACING_INCREASE_EVERY = 5
+    PACING_BACKOFF = 0.5        # rate x factor bij 429/5xx of een block pagina
+    PACING_COOLDOWN = 30        # s; verdubbelt per opeenvolgende pushback (tenzij Retry-After)
+    PACING_MAX_COOLDOWN = 600
+    PACING_EWMA_ALPHA = 0.2
+    PACING_WINDOW = 100         # laatste N laadtijden voor de p95
+    PACING_MIN_SAMPLES = 5      # daaronder geldt TIMEOUT_PAGE_LOAD
+    TIMEOUT_P95_FACTOR = 3.0
+    TIMEOUT_EWMA_FACTOR = 5.0
+    PACING_MIN_TIMEOUT = 15000  # ms
+    PACING_TIMEOUT_PENALTY = 2.0
+    # Captcha/WAF pagina's i.p.v. content (regex op de eerste BLOCK_PAGE_SCAN tekens)
+    BLOCK_PAGE_PATTERNS = [
+        r'<title>\s*(Access Denied|Attention Required|Just a moment|Pardon Our Interruption)',
+        r'cf-chl-|captcha-delivery\.com|_Incapsula_Resource|px-captcha',
+    ]
+    BLOCK_PAGE_SCAN = 20000
+
+    # HTTP-first fetch tier (zie core/http_fetch.py, 'fetch' blok in Vendor_YML.yaml)
+    HTTP_FIRST = True
+    HTTP_PER_HOST_LIMIT = 4
+    HTTP_TIMEOUT = 20000  # ms
+    HTTP_USER_AGENT = (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0'
+    )
+
+    # Siemens 'Meer laden' varianten
+    SIEMENS_CAPTURE_VARIANT_JSON = True   # XHR JSON bewaren als sidecar naast de HTML
+    SIEMENS_VARIANT_REPLAY = False        # Paginatie API direct afspelen i.p.v. blijven klikken
+    SIEMENS_REPLAY_PAGE_SIZE = 200
+    SIEMENS_REPLAY_CONCURRENCY = 4
+
+    # Phoenix lijstpaginatie: pagina 2..N in parallelle tabs (terugval: doorklikken)
+    PHOENIX_PARALLEL_PAGES = True
+    PHOENIX_PARALLEL_TABS = 4
+
+    # Schneider snapshot serializer
+    SNAPSHOT_DEBUG = False                # data-depth attributen + gemarkeerde shadow roots
+    SNAPSHOT_DECLARATIVE_SHADOW = False   # Native getHTML() met <template shadowrootmode> output
+    SNAPSHOT_VERIFY_RATE = 0.05           # Fractie snapshots waarvan de MSE output tegen de oude serializer vergeleken wordt
+    SNAPSHOT_VERIFY_DIR = None            # Map: legacy/nieuwe snapshot + diff per verificatie bewaren
+
+    # Capture modus: 'full' (hele outerHTML) of 'fragments' (enkel wat MSE specs lezen)
+    CAPTURE_MODE = 'full'
+    FRAGMENT_VERIFY_RATE = 0.05  # Fractie fragment-pagina's die tegen de volledige pagina geverifieerd wordt
+
+    # Multi-page captures direct naar schijf streamen (optioneel gzip -> .html.gz)
+    STREAM_CAPTURES = True
+    STREAM_COMPRESS = False
+
+    # Output als WARC-achtig archief (zie utils/archive.py): gzip segmenten + offset index
+    # i.p.v. één .html bestand per URL. Output paden worden '<segment>.warc.gz#<offset>'.
+    ARCHIVE = False
+    ARCHIVE_SEGMENT_MB = 256    # daarna een nieuw segment
+    ARCHIVE_COMPRESSLEVEL = 6
+
+    # Content-addressed opslag (zie utils/blob_store.py): key = hash van de HTML zonder
+    # tokens/nonces/timestamps, dus identieke pagina's over runs heen maar één keer.
+    # Output paden worden '<output>/blobs/objects/ab/<key>.html.gz'. Gaat voor ARCHIVE.
+    BLOB_STORE = False
+    BLOB_COMPRESSLEVEL = 6
+
+    # Request routing (zie strategies/routing.py). Met een route (dit, of ASSET_CACHE) gebruikt
+    # Chromium zijn HTTP cache niet: toegelaten bundles komen enkel uit ASSET_CACHE, de rest
+    # wordt per pagina opnieuw gedownload. BLOCK_RESOURCES = False alleen zet die cache niet terug.
+    BLOCK_RESOURCES = True
+    # Geschatte bytes per geblokkeerde request (voor de 'saved' rapportage)
+    ROUTING_EST_BYTES = {
+        'image': 40_000,
+        'media': 500_000,
+        'font': 50_000,
+        'script': 60_000,
+        'stylesheet': 30_000,
+        'xhr': 5_000,
+        'fetch': 5_000,
+        'other': 10_000,
+    }
+
+    # Browser context hergebruik (zie core/browser.py): recyclen na N pagina's of boven een geheugengrens
+    CONTEXT_RECYCLE_PAGES = 200   # 0 = nooit op aantal
+    CONTEXT_RECYCLE_RSS_MB = 2500  # MB voor alle browser processen van één worker; 0 = niet meten
+    CONTEXT_RSS_CHECK_EVERY = 10  # RSS voor die grens meten om de N pagina's
+    MEMORY_REPORT_EVERY = 25      # geheugenmeting in de log om de N pagina's
+
+    # Cookie consent (zie strategies/consent.py)
+    CONSENT_STATE_PATH = BASE_DIR / "consent_state.json"  # per domein: werkende knop + consent cookies
+    CONSENT_TIMEOUT = 2000      # ms; één gecombineerde wait op alle bekende banners
+    CONSENT_NO_BANNER_VISITS = 3  # daarna enkel nog een korte wait voor dat domein
+    CONSENT_QUICK_TIMEOUT = 500   # ms; die korte wait (laat ladende banners worden nog gezien)
+    # Enkel cookies met een CMP naam worden als consent onthouden en in andere contexts gezet
+    # (regex, hoofdletterongevoelig); sessie/login/tracking cookies rond de klik niet
+    CONSENT_COOKIE_PATTERNS = [
+        r"consent",                         # OptanonConsent, CookieConsent, euconsent-v2, cookieconsent_status
+        r"^OptanonAlertBoxClosed$",         # OneTrust
+        r"^didomi",                         # Didomi
+        r"^_evidon",                        # Evidon / Crownpeak
+        r"^uc_",                            # Usercentrics
+        r"^cmplz_",                         # Complianz
+        r"^(notice_preferences|notice_gdpr_prefs|cmapi_)",  # TrustArc
+        r"^CookieControl$",                 # Civic
+    ]
+
+    # Login sessies (storage_state per vendor, zie core/session.py)
+    SESSION_DIR = BASE_DIR / "sessions"
+    SESSION_MAX_AGE = 8 * 3600  # s; daarna altijd opnieuw inloggen
+
+    # Metrics per fase (zie core/metrics.py): JSONL per URL + Prometheus aggregaten per run
+    METRICS = True
+    METRICS_DIR = BASE_DIR / "data" / "metrics"
+    METRICS_PROM = METRICS_DIR / "pyscraper.prom"
+
+    # Lokale cache voor statische assets (zie core/asset_cache.py); documenten/XHR nooit.
+    # Dit is de enige cache: de context route ervan zet de HTTP cache van Chromium uit
+    ASSET_CACHE = True
+    ASSET_CACHE_DIR = BASE_DIR / "data" / "asset_cache"
+    ASSET_CACHE_MAX_MB = 1024
+    ASSET_CACHE_MAX_OBJECT_MB = 20
+    ASSET_CACHE_TYPES = {'script', 'stylesheet', 'font', 'image'}
+    ASSET_CACHE_MIN_MAX_AGE = 3600          # s; kortere max-age = niet cachen (tenzij geversioneerd)
+    ASSET_CACHE_MAX_TTL = 30 * 24 * 3600    # s; ook voor geversioneerde/immutable assets
+
+    # Sampled tracing (zie core/tracing.py): trace per pagina, enkel bewaard bij fout of traagheid,
+    # zodat de trage staart achteraf te bekijken is zonder de crawl opnieuw te draaien.
+    # Standaard enkel netwerk + acties (geen snapshots/screenshots); de kost per pagina staat
+    # in de samenvatting na de crawl, en `bench.py --no-tracing --baseline ...` meet het verschil.
+    TRACING = True
+    TRACE_DIR = BASE_DIR / "data" / "traces"
+    TRACE_SLOW_SECONDS = 60     # absolute ondergrens voor 'traag'
+    TRACE_SLOW_FACTOR = 3.0     # of: x mediaan van de vendor (na TRACE_MIN_SAMPLES pagina's)
+    TRACE_MIN_SAMPLES = 5
+    TRACE_MAX_MB = 500          # oudste traces eerst weg boven deze grootte
+    TRACE_SNAPSHOTS = False     # DOM snapshots per actie (trace viewer timeline); duur op grote pagina's
+    TRACE_SCREENSHOTS = False   # screenshots kosten merkbaar meer op lange pagina's
+    TRACE_HAR = False           # extra .har naast de trace (request headers/status/timing)
+
+    # Benchmark tegen de mock vendor sites (zie bench.py, src/benchmark/)
+    BENCH_DIR = BASE_DIR / "data" / "bench"
 
     # Secrets
     SECRETS_PATH = "c:\\Users\\tomva\\PlatformIO\\my-node-project\\secrets\\credentials.ini"
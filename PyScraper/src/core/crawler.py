@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+from .browser import BrowserManager, clone_profile
+from .config import Config
+
+
+def domain_key(url):
+    """
+    Bepaal de 'politeness' sleutel van een URL.
+    Matcht op suffix met Config.DOMAIN_LIMITS (www.se.com -> se.com),
+    anders de netloc zonder 'www.'.
+    """
+    netloc = urlparse(url).netloc.lower().split(':')[0]
+    for domain in Config.DOMAIN_LIMITS:
+        if netloc == domain or netloc.endswith('.' + domain):
+            return domain
+    return netloc.replace('www.', '', 1)
+
+
+class DomainScheduler:
+    """
+    Thread-safe uitdeler bovenop de Frontier die de per-domein limiet respecteert.
+    Een worker krijgt de eerstvolgende URL waarvan het domein nog capaciteit heeft.
+    """
+
+    def __init__(self, frontier, limits=None, default_limit=None):
+        self.frontier = frontier
+        self.limits = limits if limits is not None else Config.DOMAIN_LIMITS
+        self.default_limit = default_limit or Config.DEFAULT_DOMAIN_LIMIT
+        self.active = defaultdict(int)
+        self.cond = threading.Condition()
+
+    def _limit(self, domain):
+        return self.limits.get(domain, self.default_limit)
+
+    def acquire(self):
+        """Blokkeert tot er een URL beschikbaar is. Geeft None als alles verwerkt is."""
+        with self.cond:
+            while True:
+                full = [domain for domain, n in self.active.items() if n >= self._limit(domain)]
+                url, wait = self.frontier.claim(exclude_domains=full)
+                if url is not None:
+                    self.active[domain_key(url)] += 1
+                    return url
+                if wait is None:
+                    return None
+                # Domeinen vol of retries in backoff
+                self.cond.wait(timeout=wait)
+
+    def release(self, url, result=None, seconds=0.0):
+        """Resultaat in de frontier registreren (incl. retry planning) en het domein vrijgeven."""
+        self.frontier.complete(url, result, seconds)
+        with self.cond:
+            self.active[domain_key(url)] -= 1
+            self.cond.notify_all()
+
+
+def failed_result(exc):
+    """UrlResult voor een exception buiten de strategie (frontier.complete bewaart de fout)."""
+    from .frontier import UrlResult  # frontier importeert deze module
+    return UrlResult(False, error=f"{type(exc).__name__}: {exc}")
+
+
+class CrawlReport:
+    """Houdt per domein doorvoer en fouten bij (thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.domains = defaultdict(lambda: {'ok': 0, 'failed': 0, 'seconds': 0.0})
+        self.started = time.monotonic()
+
+    def record(self, url, ok, seconds):
+        with self.lock:
+            stats = self.domains[domain_key(url)]
+            stats['ok' if ok else 'failed'] += 1
+            stats['seconds'] += seconds
+
+    def totals(self):
+        """Opgetelde cijfers over alle domeinen (bv. voor de shard rapportage)."""
+        with self.lock:
+            ok = sum(s['ok'] for s in self.domains.values())
+            failed = sum(s['failed'] for s in self.domains.values())
+        return {'ok': ok, 'failed': failed, 'elapsed': time.monotonic() - self.started}
+
+    def print_summary(self):
+        elapsed = time.monotonic() - self.started
+        print(f"\n📊 Crawl summary ({elapsed:.1f}s wall time):")
+        for domain, stats in sorted(self.domains.items()):
+            total = stats['ok'] + stats['failed']
+            per_min = total / elapsed * 60 if elapsed > 0 else 0.0
+            avg = stats['seconds'] / total if total else 0.0
+            print(f"   🌐 {domain}: {stats['ok']} ok, {stats['failed']} failed, "
+                  f"{per_min:.1f} pages/min, avg {avg:.1f}s/page")
+
+
+class ConcurrentCrawler:
+    """
+    Pool van sync workers. Elke worker draait in een eigen thread met een eigen
+    Playwright instantie en browser profiel, zodat de bestaande (sync) strategies
+    ongewijzigd bruikbaar blijven.
+    """
+
+    def __init__(self, engine, workers=None):
+        self.engine = engine
+        self.workers = workers or Config.CONCURRENCY
+        self.report = CrawlReport()
+
+    def _profile_for(self, worker_id):
+        # Afgeleid van het profiel van de engine (per shard een eigen kopie)
+        base = self.engine.browser_manager.profile_dir
+        if worker_id == 0:
+            return base
+        return clone_profile(base, base.with_name(f"{base.name}_w{worker_id}"))
+
+    def _worker(self, worker_id, scheduler):
+        browser_manager = BrowserManager(self.engine.headless, profile_dir=self._profile_for(worker_id))
+        try:
+            browser_manager.start()
+        except Exception as e:
+            print(f"  ⚠️  Worker {worker_id} could not start browser: {e}")
+            return
+
+        try:
+            while True:
+                url = scheduler.acquire()
+                if url is None:
+                    break
+
+                print(f"\n[w{worker_id}] Processing: {url}")
+                started = time.monotonic()
+                result = None
+                try:
+                    result = self.engine._process_url(url, browser_manager)
+                except Exception as e:
+                    # Fout buiten strategy.execute (browser crash, HTTP tier, consent, change check):
+                    # de worker blijft leven en de URL gaat via de frontier naar retry/backoff
+                    print(f"  ⚠️  [w{worker_id}] Error: {e}")
+                    result = failed_result(e)
+                finally:
+                    seconds = time.monotonic() - started
+                    self.report.record(url, bool(result), seconds)
+                    scheduler.release(url, result, seconds)
+        finally:
+            browser_manager.stop()
+
+    def run(self, frontier):
+        scheduler = DomainScheduler(frontier)
+        print(f"🧵 Starting {self.workers} workers (domain limits: {Config.DOMAIN_LIMITS})")
+
+        threads = [
+            threading.Thread(target=self._worker, args=(i, scheduler), name=f"crawler-w{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.report.print_summary()
+        return self.report
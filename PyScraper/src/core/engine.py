@@ -1,59 +1,352 @@
 import os
 import time
 from .browser import BrowserManager
+from .config import Config
+from .crawler import ConcurrentCrawler, CrawlReport, DomainScheduler, failed_result
+from .frontier import Frontier, UrlResult
+from .fingerprint import ChangeTracker, merge_manifests
+from .fanout import VariantFanout
+from .shards import ShardRunner
+from .planner import CrawlPlanner
+from .readiness import WAIT_STATS
+from .memory import BROWSER_MEMORY
+from .metrics import METRICS, UrlMetrics, phase
+from .tracing import TRACES
+from .asset_cache import ASSET_CACHE
+from .pacing import PACER
+from .session import SESSIONS
+from .http_fetch import HttpFetcher
 from strategies import get_strategy_for_url
-from utils.file_ops import read_urls, ensure_dir, save_html
+from strategies.routing import apply_routing
+from strategies.consent import CONSENT
+from strategies.scrolling import SCROLL_STATS
+from utils.file_ops import iter_urls, ensure_dir, save_html, save_sidecar, SnapshotWriter, StreamedSnapshot
+from utils.archive import ARCHIVE
+from utils.blob_store import BLOBS
 from playwright_stealth import Stealth
 
 class ScrapeEngine:
-    def __init__(self, input_file, output_dir, headless):
+    def __init__(self, input_file, output_dir, headless, workers=None, capture_mode=None, resume=False, priority=0,
+                 fanout=None, shards=None, shard=None, run_id=None, profile_dir=None):
         self.input_file = input_file
         self.output_dir = output_dir
         self.headless = headless
-        self.browser_manager = BrowserManager(headless)
+        self.workers = workers or Config.CONCURRENCY
+        self.capture_mode = capture_mode or Config.CAPTURE_MODE
+        self.resume = resume
+        self.priority = priority
+        # Multi-process: shards > 1 in het hoofdproces, shard=(i, n) in een shard proces
+        self.shards = shards or Config.SHARDS
+        self.shard = shard
+        self.run_id = run_id
+        self.browser_manager = BrowserManager(headless, profile_dir=profile_dir)
+        self.http_fetcher = HttpFetcher() if Config.HTTP_FIRST else None
+        self.frontier = None
+        self.changes = None
+        # Variant fan-out: None = uit, anders dict met VariantFanout opties (max_depth, budget, only_changed)
+        self.fanout_options = fanout if fanout is not None else ({} if Config.FANOUT else None)
+        self.fanout = None
+        self.plan = None
+
+    def _load_frontier(self):
+        """Vul de frontier met de input URLs (streaming). Zonder resume start de crawl opnieuw."""
+        if self.shard:
+            # Shard proces: de frontier is al gevuld; enkel de eigen partitie na een crash herstellen
+            frontier = Frontier(shard=self.shard, run_id=self.run_id)
+            requeued = frontier.requeue_interrupted()
+            if requeued:
+                print(f"♻️  Shard {self.shard[0]}: {requeued} interrupted URLs requeued.")
+            return frontier
+
+        frontier = Frontier()
+        if self.resume:
+            requeued = frontier.requeue_interrupted()
+            if requeued:
+                print(f"♻️  Resuming: {requeued} interrupted URLs requeued.")
+        else:
+            frontier.reset()
+
+        added = frontier.import_urls(iter_urls(self.input_file), priority=self.priority)
+        counts = frontier.status_counts()
+        print(f"🗂️  Frontier: {added} new URLs, {counts.get('pending', 0)} pending, "
+              f"{counts.get('done', 0)} done, {counts.get('failed', 0)} failed")
+        return frontier
 
     def run(self):
-        urls = read_urls(self.input_file)
-        print(f"🚀 Starting scrape for {len(urls)} URLs...")
         ensure_dir(self.output_dir)
+        if self.shard is None and self.shards > 1:
+            frontier = self._load_frontier()
+            run_id = frontier.run_id
+            self._plan(frontier)
+            frontier.close()
+            ShardRunner(self, self.shards, run_id).run()
+            if Config.CHANGE_DETECTION:
+                print(f"📝 Change manifest for MSE: {merge_manifests(self.output_dir)}")
+            self._write_metrics(run_id)
+            if self.plan:
+                frontier = Frontier(run_id=run_id)
+                self.plan.print_report(frontier.run_attempts())
+                frontier.close()
+            return None
 
+        self.frontier = self._load_frontier()
+        if self.shard is None:
+            self._plan(self.frontier)
+        METRICS.start(self.frontier.run_id)
+        if Config.BLOB_STORE:
+            BLOBS.start(self.output_dir, self.frontier.run_id)
+        elif Config.ARCHIVE:
+            ARCHIVE.start(self.output_dir, self.frontier.run_id)
+        if Config.CHANGE_DETECTION:
+            self.changes = ChangeTracker(self.frontier, self.http_fetcher)
+        if self.fanout_options is not None:
+            self.fanout = VariantFanout(self.frontier, **self.fanout_options)
+        print(f"🚀 Starting scrape for {self.frontier.status_counts().get('pending', 0)} URLs...")
+
+        if self.workers > 1:
+            # Parallelle modus: pool van workers met per-domein limieten
+            try:
+                return ConcurrentCrawler(self, self.workers).run(self.frontier)
+            finally:
+                self._print_run_stats()
+                print("\n🏁 All done.")
+
+        report = CrawlReport()
+        scheduler = DomainScheduler(self.frontier)
         self.browser_manager.start()
-        
+
         try:
-            for i, url in enumerate(urls, 1):
-                print(f"\n[{i}/{len(urls)}] Processing: {url}")
-                self._process_url(url)
+            i = 0
+            while True:
+                url = scheduler.acquire()
+                if url is None:
+                    break
+                i += 1
+                print(f"\n[{i}] Processing: {url}")
+                started = time.monotonic()
+                result = None
+                try:
+                    result = self._process_url(url, self.browser_manager)
+                except Exception as e:
+                    # Zoals in de crawler workers: één URL mag de run niet afbreken
+                    print(f"  ⚠️  Error: {e}")
+                    result = failed_result(e)
+                finally:
+                    seconds = time.monotonic() - started
+                    report.record(url, bool(result), seconds)
+                    scheduler.release(url, result, seconds)
         finally:
             self.browser_manager.stop()
+            report.print_summary()
+            self._print_run_stats()
             print("\n🏁 All done.")
+        return report
+
+    def _print_run_stats(self):
+        WAIT_STATS.print_summary()
+        SESSIONS.print_summary()
+        CONSENT.print_summary()
+        SCROLL_STATS.print_summary()
+        BROWSER_MEMORY.print_summary()
+        TRACES.print_summary()
+        ASSET_CACHE.print_summary()
+        PACER.print_summary()
+        ARCHIVE.print_summary()
+        BLOBS.print_summary()
+        ARCHIVE.close()
+        if self.http_fetcher:
+            self.http_fetcher.stats.print_summary()
+            self.http_fetcher.close()
+        if self.fanout:
+            self.fanout.print_summary()
+        if self.changes:
+            self.changes.print_summary()
+            # Shards schrijven een deelmanifest; het hoofdproces voegt ze samen
+            part = f".s{self.shard[0]}" if self.shard else ""
+            print(f"📝 Change manifest for MSE: {self.changes.write_manifest(self.output_dir, part)}")
+        if self.frontier:
+            # Shards schrijven enkel JSONL records; het hoofdproces aggregeert de hele run
+            if not self.shard:
+                self._write_metrics(self.frontier.run_id)
+                if self.plan:
+                    self.plan.print_report(self.frontier.run_attempts())
+            self.frontier.print_stats()
+            self.frontier.close()
+
+    def _plan(self, frontier):
+        """Volgorde van de pending URLs plannen (hoofdproces; shards claimen in die volgorde)."""
+        if not Config.PLAN_CRAWL:
+            return
+        self.plan = CrawlPlanner(frontier, self.workers, self.shards).plan()
+        if self.plan:
+            self.plan.print_summary()
+
+    def _write_metrics(self, run_id):
+        if not Config.METRICS:
+            return
+        METRICS.print_summary(run_id)
+        path = METRICS.write_prometheus(run_id)
+        if path:
+            print(f"📈 Prometheus metrics: {path}")
+
+    def _process_url(self, url, browser_manager):
+        """Verwerk één URL. Geeft een UrlResult (truthy als er HTML is opgeslagen)."""
+        metrics = UrlMetrics(url, attempt=self.frontier.attempts(url) + 1 if self.frontier else 1)
+        result = None
+        try:
+            result = self._capture_url(url, browser_manager, metrics)
+            # Lijstpagina: variant URLs uit de MSE output in de frontier zetten
+            if self.fanout and result and result.output_path:
+                with metrics.phase("fanout"):
+                    self.fanout.expand(url, result.output_path)
+            return result
+        finally:
+            error = result.error if result is not None else "exception"
+            METRICS.record(metrics.finish(bool(result), error))
+
+    def _save(self, url, html, strategy):
+        """Bewaar een pagina als .html bestand, blob (BLOB_STORE) of archief record (ARCHIVE). Geeft het output pad."""
+        if Config.BLOB_STORE:
+            return BLOBS.put_page(url, html)
+        if Config.ARCHIVE:
+            name = strategy if isinstance(strategy, str) else strategy.__class__.__name__
+            return ARCHIVE.write_page(url, html, strategy=name, capture_mode=self.capture_mode)
+        return save_html(self.output_dir, url, html)
+
+    def _save_sidecars(self, url, strategy):
+        for name, data in strategy.artifacts.items():
+            if Config.BLOB_STORE:
+                BLOBS.put_json(url, name, data)
+            elif Config.ARCHIVE:
+                ARCHIVE.write_sidecar(url, name, data)
+            else:
+                save_sidecar(self.output_dir, url, name, data)
+
+    def _capture_url(self, url, browser_manager, metrics=None):
+        """Haal één URL op en bewaar de HTML (HTTP tier of browser strategie)."""
+        # 0. Onveranderd sinds de vorige run (conditionele request)? Dan niets te doen
+        if self.changes:
+            with phase(metrics, "conditional"):
+                previous_output = self.changes.check(url)
+            if previous_output:
+                if metrics:
+                    metrics.tier = "unchanged"
+                return UrlResult(True, previous_output)
+
+        # 0b. HTTP-first: server HTML volstaat voor sommige vendors
+        if self.http_fetcher:
+            with phase(metrics, "http"):
+                html_content, headers = self.http_fetcher.try_fetch(url)
+            if html_content:
+                with phase(metrics, "save"):
+                    path = self._save(url, html_content, "HttpFetcher")
+                    if self.changes:
+                        self.changes.record(url, path, html_content, headers.get("etag"), headers.get("last-modified"))
+                print("  ✅ Saved (HTTP tier, no browser).")
+                if metrics:
+                    metrics.tier = "http"
+                    metrics.bytes = len(html_content.encode("utf-8"))
+                return UrlResult(True, path)
 
-    def _process_url(self, url):
         # 1. Bepaal strategie
         strategy = get_strategy_for_url(url)
+        strategy.capture_mode = self.capture_mode
+        strategy.metrics = metrics
+        if Config.STREAM_CAPTURES:
+            # Met het archief/de blob store wordt daar gecomprimeerd; de gestreamde capture is enkel tijdelijk
+            strategy.writer = SnapshotWriter(self.output_dir, url, compress=Config.STREAM_COMPRESS and not (Config.ARCHIVE or Config.BLOB_STORE))
         print(f"  🧠 Strategy: {strategy.__class__.__name__}")
 
         # 2. Maak sessie
-        context = self.browser_manager.create_context()
-        page = context.new_page()
-        
+        context = browser_manager.create_context()
+        existing = set(context.pages)
+        trace = routing = None
+        # Validators (ETag/Last-Modified) van het hoofddocument, voor change detection
+        validators = {}
+
         # Activeer stealth
         # stealth = Stealth()
         # stealth.use_sync(page)
 
+        error = None
+        saved = False
         try:
+            page = context.new_page()
+            # Trace chunk per pagina; enkel bewaard bij een fout of trage pagina
+            trace = TRACES.begin(context, page, url)
+
+            # Blokkeer onnodige resources (images, fonts, trackers) voor deze vendor
+            routing = apply_routing(page, strategy.ROUTING if Config.BLOCK_RESOURCES else None)
+            # Onthouden consent cookies vooraf zetten: geen banner bij herhaalde bezoeken
+            CONSENT.preseed(context, url)
+
+            def on_document(response):
+                if (not validators and response.status == 200 and response.request.resource_type == "document"
+                        and response.frame == page.main_frame):
+                    validators.update(etag=response.headers.get("etag"),
+                                      last_modified=response.headers.get("last-modified"))
+            page.on("response", on_document)
+
             # 3. Voer strategie uit
             html_content = strategy.execute(page, url)
-            
-            if html_content:
+
+            if isinstance(html_content, StreamedSnapshot):
+                # 4a. Multi-page capture is al gestreamd naar schijf
+                with phase(metrics, "save"):
+                    path = html_content.path
+                    if Config.BLOB_STORE:
+                        path = BLOBS.put_page(url, path=html_content.path)
+                        os.remove(html_content.path)
+                    elif Config.ARCHIVE:
+                        # Gestreamde capture in het archief opnemen; het losse bestand was tijdelijk
+                        path = ARCHIVE.write_page(url, path=html_content.path, strategy=strategy.__class__.__name__,
+                                                  capture_mode=self.capture_mode)
+                        os.remove(html_content.path)
+                    self._save_sidecars(url, strategy)
+                    if self.changes:
+                        self.changes.record(url, path, **validators)
+                print(f"  ✅ Saved (streamed {html_content.parts} parts, {html_content.size / 1024:.0f} KB).")
+                if metrics:
+                    metrics.bytes = html_content.size
+                saved = True
+                return UrlResult(True, path)
+            elif html_content and PACER.is_block_page(html_content):
+                # Captcha/WAF pagina: domein afremmen, de frontier plant een retry
+                PACER.throttle(url, "block page")
+                print("  🧱 Block page instead of content.")
+                error = "Block page"
+            elif html_content:
                 # 4. Opslaan
-                save_html(self.output_dir, url, html_content)
+                with phase(metrics, "save"):
+                    path = self._save(url, html_content, strategy)
+                    self._save_sidecars(url, strategy)
+                    if self.changes:
+                        self.changes.record(url, path, html_content, **validators)
                 print("  ✅ Saved.")
+                if metrics:
+                    metrics.bytes = len(html_content.encode("utf-8"))
+                saved = True
+                return UrlResult(True, path)
             else:
                 print("  ❌ Failed (No HTML returned).")
+                error = "No HTML returned"
 
         except Exception as e:
             print(f"  ⚠️  Error: {e}")
+            error = f"{type(e).__name__}: {e}"
+            if strategy.writer:
+                partial = strategy.writer.abort("</body></html>")
+                if partial:
+                    print(f"  💾 Partial capture kept: {partial}")
         finally:
-            # 5. Opruimen sessie
-            page.close()
-            context.close()
+            # 5. Opruimen: pagina's (ook popups/tabs) sluiten, de context blijft voor de volgende URL
+            if routing is not None:
+                routing.print_summary()
+            TRACES.end(trace, saved)
+            for leftover in [p for p in context.pages if p not in existing]:
+                try:
+                    leftover.close()
+                except Exception:
+                    pass
+            browser_manager.page_done()
+        return UrlResult(False, error=error)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import threading
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode, urljoin
+from .config import Config
+from utils.vendor_specs import vendor_for_url, has_variant_spec
+
+# Query parameters die niets aan de inhoud veranderen
+_TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "mc_", "_ga", "_gl")
+# List-level velden die bepalen of een detailpagina opnieuw opgehaald moet worden
+_LIST_FIELDS = ("list_price", "your_price", "availability")
+
+
+def canonical_url(url):
+    """Canonieke vorm voor deduplicatie: lowercase host, geen fragment/tracking, gesorteerde query."""
+    parsed = urlparse(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, parsed.params, urlencode(query), ""))
+
+
+def list_fields_hash(item):
+    """Hash van prijs/beschikbaarheid zoals op de lijstpagina, None als die velden ontbreken."""
+    fields = {k: item[k] for k in _LIST_FIELDS if item.get(k)}
+    if not fields:
+        return None
+    return hashlib.sha1(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class VariantFanout:
+    """
+    Voed de variant URLs die MSE's product_variants extractor uit een lijstpagina haalt
+    terug in de frontier.
+
+    - Dedup op canonieke URL (INSERT OR IGNORE in de frontier)
+    - Diepte limiet: varianten van een pagina op diepte d krijgen d+1; pagina's op
+      max_depth worden niet meer door MSE gehaald
+    - Budget: max. aantal ontdekte URLs per crawl, over alle shards (geteld in de frontier)
+    - only_changed: enkel varianten waarvan prijs/beschikbaarheid op lijstniveau wijzigde
+      (of die nog geen output hebben)
+    De per-domein concurrency komt van de DomainScheduler die de frontier uitdeelt.
+    """
+
+    def __init__(self, frontier, max_depth=None, budget=None, only_changed=None):
+        self.frontier = frontier
+        self.max_depth = Config.FANOUT_MAX_DEPTH if max_depth is None else max_depth
+        self.budget = Config.FANOUT_BUDGET if budget is None else budget
+        self.only_changed = Config.FANOUT_ONLY_CHANGED if only_changed is None else only_changed
+        self.lock = threading.Lock()
+        self.discovered = 0
+        self.unchanged = 0
+        self.over_budget = 0
+
+    def expand(self, url, output_path):
+        """Haal varianten uit de output van url en plan ze in. Geeft het aantal nieuwe URLs."""
+        from utils.mse_bridge import run_mse
+
+        depth = self.frontier.depth(url)
+        if depth >= self.max_depth or not has_variant_spec(vendor_for_url(url)):
+            return 0
+
+        try:
+            result = run_mse([output_path]).get(str(output_path), {})
+        except Exception as e:
+            print(f"  ⚠️  Variant fan-out skipped (MSE failed): {e}")
+            return 0
+
+        items = ((result.get("kv") or {}).get("Product Variants") or {}).get("Items") or []
+        rows = []
+        unchanged = 0
+        for item in items:
+            if not item.get("url"):
+                continue
+            variant = canonical_url(urljoin(url, item["url"]))
+            if self.only_changed and not self.frontier.variant_changed(variant, list_fields_hash(item), url):
+                unchanged += 1
+                continue
+            rows.append(variant)
+
+        # Het budget geldt voor de hele frontier (alle shards), niet per proces
+        added, over = self.frontier.add_discovered(rows, depth=depth + 1, parent=url, budget=self.budget)
+        with self.lock:
+            self.discovered += added
+            self.over_budget += over
+            self.unchanged += unchanged
+
+        if items:
+            print(f"  🌱 Variants: {len(items)} found, {added} queued (depth {depth + 1})"
+                  + (f", {unchanged} unchanged" if unchanged else ""))
+        return added
+
+    def print_summary(self):
+        if not (self.discovered or self.unchanged or self.over_budget):
+            return
+        print(f"🌱 Variant fan-out: {self.discovered} URLs queued, {self.unchanged} unchanged skipped, "
+              f"{self.over_budget} over budget ({self.budget})")
@@ -0,0 +1,199 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from bs4 import BeautifulSoup
+from .config import Config
+from utils.vendor_specs import vendor_for_url, fragment_selectors, needs_inline_scripts, http_first_enabled
+from utils.archive import is_locator, output_exists, read_record
+
+# Attributen die per request wijzigen zonder dat de productdata verandert
+_VOLATILE_ATTRS = re.compile(r"^(nonce|integrity|data-csrf.*|.*token.*|data-timestamp|data-request-id)$", re.IGNORECASE)
+_SESSION_IDS = re.compile(r";jsessionid=[^?#\"']*|([?&])(sid|sessionid|_ga|_gl)=[^&#\"']*", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_fingerprint(html, vendor):
+    """
+    Genormaliseerde hash van wat MSE voor deze vendor leest.
+
+    Enkel de spec-fragmenten (zie fragment_selectors), met tekst en stabiele attributen
+    (bv. Schneider's plain-all-data), zonder scripts/styles, volatiele attributen en
+    session ids. Vendors die de hele pagina nodig hebben hashen de body.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["style", "noscript"]):
+        tag.decompose()
+
+    selectors = fragment_selectors(vendor)
+    if selectors is None:
+        elements = [soup.body or soup]
+    else:
+        elements = []
+        for selector in selectors + ["h1", "h2", "h3", "h4", "h5", "h6"]:
+            try:
+                elements.extend(soup.select(selector))
+            except Exception:
+                continue
+
+    parts = []
+    for element in elements:
+        for node in [element, *element.find_all(True)]:
+            if node.name == "script":
+                continue
+            attrs = sorted(
+                (k, " ".join(v) if isinstance(v, list) else v)
+                for k, v in node.attrs.items() if not _VOLATILE_ATTRS.match(k)
+            )
+            if attrs:
+                parts.append(f"{node.name}{attrs}")
+        parts.append(element.get_text(" ", strip=True))
+
+    if needs_inline_scripts(vendor):
+        parts.extend(s.string or "" for s in soup.find_all("script") if re.search(r"var\s+model\s*=", s.string or ""))
+
+    text = _SESSION_IDS.sub(r"\1", _WHITESPACE.sub(" ", "\n".join(parts)))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def read_output(path):
+    if is_locator(path):
+        return read_record(path)[1].decode("utf-8")
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+class ChangeTracker:
+    """
+    Per-URL fingerprints (ETag/Last-Modified + genormaliseerde content hash) in de frontier.
+
+    - check(): conditionele GET met de bewaarde validators; een 304 (of dezelfde
+      validators) betekent 'onveranderd'. Voor HTTP-first vendors is de server HTML
+      de content en wordt de URL overgeslagen; voor gerenderde pagina's (data via
+      XHR) enkel als Config.CONDITIONAL_SKIP_RENDERED aan staat.
+    - record(): na het opslaan de content hash vergelijken met de vorige run.
+    - write_manifest(): welke output bestanden MSE opnieuw moet extraheren.
+    """
+
+    def __init__(self, frontier, http_fetcher=None):
+        self.frontier = frontier
+        self.http_fetcher = http_fetcher
+        self.lock = threading.Lock()
+        self.results = {"skipped": [], "unchanged": [], "changed": [], "new": []}
+
+    def check(self, url):
+        """
+        Returns:
+            str | None: output pad van de vorige run als de URL overgeslagen mag worden
+        """
+        fingerprint = self.frontier.fingerprint(url)
+        if not fingerprint or not (fingerprint["etag"] or fingerprint["last_modified"]):
+            return None
+        if not fingerprint["output_path"] or not output_exists(fingerprint["output_path"]):
+            return None
+        if not (http_first_enabled(vendor_for_url(url)) or Config.CONDITIONAL_SKIP_RENDERED):
+            return None
+        if not (self.http_fetcher and self.http_fetcher.available):
+            return None
+
+        status, etag, last_modified = self.http_fetcher.conditional(
+            url, fingerprint["etag"], fingerprint["last_modified"]
+        )
+        unchanged = status == 304 or (
+            status == 200
+            and (etag or last_modified)
+            and (etag, last_modified) == (fingerprint["etag"], fingerprint["last_modified"])
+        )
+        if not unchanged:
+            return None
+
+        self.frontier.save_fingerprint(url, checked_only=True)
+        self._add("skipped", fingerprint["output_path"])
+        print(f"  💤 Unchanged since last run (HTTP {status}), skipping.")
+        return fingerprint["output_path"]
+
+    def record(self, url, output_path, html=None, etag=None, last_modified=None):
+        """Hash de (nieuwe) output en vergelijk met de vorige run. Geeft 'new'/'changed'/'unchanged'."""
+        try:
+            content = html if html is not None else read_output(output_path)
+            content_hash = content_fingerprint(content, vendor_for_url(url))
+        except Exception as e:
+            print(f"  ⚠️  Fingerprint failed: {e}")
+            content_hash = None
+
+        previous = self.frontier.fingerprint(url)
+        if not previous or not previous["content_hash"]:
+            state = "new"
+        elif content_hash and content_hash == previous["content_hash"]:
+            state = "unchanged"
+        else:
+            state = "changed"
+
+        self.frontier.save_fingerprint(
+            url, etag=etag, last_modified=last_modified, content_hash=content_hash,
+            output_path=output_path, changed=state != "unchanged",
+        )
+        self._add(state, output_path)
+        if state == "unchanged":
+            print("  💤 Content unchanged since last run (MSE can skip it).")
+        return state
+
+    def write_manifest(self, output_dir, part=""):
+        """
+        Schrijf <output>/<Config.CHANGE_MANIFEST>: per categorie de output bestanden.
+        MSE.py verwerkt met dit manifest enkel 'changed' + 'new'.
+        Shards schrijven een deelmanifest (part '.s<i>'), zie merge_manifests().
+        """
+        path = os.path.join(output_dir, _manifest_name(part))
+        with self.lock:
+            manifest = {
+                "run_id": self.frontier.run_id,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                **{state: sorted(set(paths)) for state, paths in self.results.items()},
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return path
+
+    def print_summary(self):
+        counts = {state: len(paths) for state, paths in self.results.items()}
+        if not any(counts.values()):
+            return
+        print(f"🔎 Change detection: {counts['skipped']} skipped (conditional request), "
+              f"{counts['unchanged']} re-rendered but unchanged, {counts['changed']} changed, "
+              f"{counts['new']} new")
+
+    def _add(self, state, path):
+        with self.lock:
+            self.results[state].append(path)
+
+
+def _manifest_name(part=""):
+    stem, ext = os.path.splitext(Config.CHANGE_MANIFEST)
+    return f"{stem}{part}{ext}"
+
+
+def merge_manifests(output_dir):
+    """Voeg de deelmanifesten van de shards samen tot het manifest voor MSE."""
+    stem, ext = os.path.splitext(Config.CHANGE_MANIFEST)
+    merged = {"run_id": None, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "skipped": [], "unchanged": [], "changed": [], "new": []}
+    for name in sorted(os.listdir(output_dir)):
+        if not (name.startswith(f"{stem}.s") and name.endswith(ext)):
+            continue
+        part_path = os.path.join(output_dir, name)
+        with open(part_path, "r", encoding="utf-8") as f:
+            part = json.load(f)
+        merged["run_id"] = merged["run_id"] or part.get("run_id")
+        for state in ("skipped", "unchanged", "changed", "new"):
+            merged[state].extend(part.get(state, []))
+        os.remove(part_path)
+
+    path = os.path.join(output_dir, Config.CHANGE_MANIFEST)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, ensure_ascii=False, indent=2)
+    return path
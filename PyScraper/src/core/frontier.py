@@ -0,0 +1,485 @@
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from .config import Config
+from .crawler import domain_key
+from .fanout import canonical_url
+from utils.archive import output_exists
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url             TEXT PRIMARY KEY,
+    canonical       TEXT,                              -- fanout.canonical_url(url), uniek: dedup input vs varianten
+    domain          TEXT NOT NULL,
+    domain_hash     INTEGER,                           -- crc32(domain), voor shard partities
+    status          TEXT NOT NULL DEFAULT 'pending',   -- pending / in_progress / done / failed
+    priority        INTEGER NOT NULL DEFAULT 0,        -- hoger = eerder
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT,
+    duration        REAL,
+    output_path     TEXT,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    added_at        REAL NOT NULL,
+    updated_at      REAL,
+    depth           INTEGER NOT NULL DEFAULT 0,        -- 0 = input, >0 = variant fan-out
+    parent          TEXT,
+    plan_order      INTEGER NOT NULL DEFAULT 0         -- volgorde van de crawl planner (binnen een prioriteit)
+);
+CREATE INDEX IF NOT EXISTS idx_urls_claim ON urls (status, priority DESC, next_attempt_at);
+
+-- Eén rij per poging, voor doorvoer/fouten per run achteraf
+CREATE TABLE IF NOT EXISTS attempts (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id      INTEGER NOT NULL,
+    url         TEXT NOT NULL,
+    domain      TEXT NOT NULL,
+    ok          INTEGER NOT NULL,
+    error       TEXT,
+    duration    REAL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_run ON attempts (run_id);
+
+-- Change detection (zie core/fingerprint.py); blijft bewaard over runs heen
+CREATE TABLE IF NOT EXISTS fingerprints (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    content_hash  TEXT,
+    output_path   TEXT,
+    checked_at    REAL,
+    changed_at    REAL
+);
+
+-- Variant fan-out: prijs/beschikbaarheid zoals laatst gezien op de lijstpagina
+CREATE TABLE IF NOT EXISTS variant_state (
+    url         TEXT PRIMARY KEY,
+    fields_hash TEXT,
+    parent      TEXT,
+    seen_at     REAL
+);
+"""
+
+# Kolommen die later bijkwamen (bestaande frontier databases migreren)
+_MIGRATIONS = {
+    "urls": {"depth": "INTEGER NOT NULL DEFAULT 0", "parent": "TEXT", "domain_hash": "INTEGER",
+             "plan_order": "INTEGER NOT NULL DEFAULT 0", "canonical": "TEXT"},
+}
+
+
+def domain_hash(domain):
+    """Stabiele hash van een domein (shard partitie; Python's hash() verschilt per proces)."""
+    return zlib.crc32(domain.encode("utf-8"))
+
+
+class UrlResult:
+    """Resultaat van ScrapeEngine._process_url (truthy als er HTML bewaard is)."""
+
+    def __init__(self, ok, output_path=None, error=None):
+        self.ok = ok
+        self.output_path = output_path
+        self.error = error
+
+    def __bool__(self):
+        return bool(self.ok)
+
+
+class Frontier:
+    """
+    Duurzame crawl wachtrij in SQLite.
+
+    Elke URL heeft een status, aantal pogingen, laatste fout, duur en output pad.
+    Mislukte URLs komen terug na een exponentiële backoff (Config.RETRY_BACKOFF * 2^n)
+    tot Config.RETRIES extra pogingen op zijn. Met resume blijft de vorige toestand
+    bewaard en worden URLs die 'in_progress' bleven (crash) opnieuw ingepland.
+    Thread-safe: alle workers delen één connectie achter een lock.
+
+    Met shard=(i, n) ziet deze instantie enkel de domeinen met domain_hash % n == i,
+    zodat meerdere processen dezelfde database delen zonder elkaars URLs te claimen.
+    """
+
+    def __init__(self, db_path=None, shard=None, run_id=None):
+        self.db_path = Path(db_path or Config.FRONTIER_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        # timeout: andere shard processen kunnen de database kort locken
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+        self.run_id = run_id or int(time.time())
+        self.shard = shard
+        self.shard_filter = f"AND domain_hash % {int(shard[1])} = {int(shard[0])}" if shard else ""
+
+    def _migrate(self):
+        for table, columns in _MIGRATIONS.items():
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, definition in columns.items():
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+        # Canonieke key: een input URL en een ontdekte variant die enkel in trailing slash,
+        # host case of query volgorde verschillen zijn dezelfde rij (INSERT OR IGNORE).
+        # Bestaande rijen invullen in SQL; OR IGNORE laat latere dubbels op NULL staan.
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_urls_canonical ON urls (canonical)")
+        self.conn.create_function("canonical_url", 1, canonical_url, deterministic=True)
+        self.conn.execute("UPDATE OR IGNORE urls SET canonical = canonical_url(url) WHERE canonical IS NULL")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_urls_plan ON urls (domain, plan_order)")
+        domains = [row[0] for row in self.conn.execute("SELECT DISTINCT domain FROM urls WHERE domain_hash IS NULL")]
+        self.conn.executemany(
+            "UPDATE urls SET domain_hash = ? WHERE domain = ?", [(domain_hash(d), d) for d in domains]
+        )
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ── Vullen ────────────────────────────────────────────────
+
+    def reset(self):
+        """Nieuwe crawl: vorige URLs wissen (de attempts historiek blijft)."""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM urls")
+
+    def requeue_interrupted(self):
+        """Na een crash: URLs die nog 'in_progress' stonden opnieuw inplannen."""
+        with self.lock, self.conn:
+            return self.conn.execute(
+                f"UPDATE urls SET status = 'pending', next_attempt_at = 0 WHERE status = 'in_progress' {self.shard_filter}"
+            ).rowcount
+
+    def import_urls(self, urls, priority=0, batch_size=5000):
+        """
+        Voeg URLs toe vanuit een (lazy) iterable, in batches; bestaande URLs blijven ongewijzigd.
+        Dubbels op canonieke URL (fanout.canonical_url) worden ook genegeerd; de URL zelf
+        wordt bewaard zoals opgegeven.
+
+        Returns:
+            int: aantal nieuw toegevoegde URLs
+        """
+        added = 0
+        batch = []
+        for url in urls:
+            domain = domain_key(url)
+            batch.append((url, canonical_url(url), domain, domain_hash(domain), priority, time.time()))
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def _insert(self, rows):
+        with self.lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, canonical, domain, domain_hash, priority, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            return self.conn.total_changes - before
+
+    def add_discovered(self, urls, depth, parent, budget=None):
+        """
+        Voeg door fan-out ontdekte URLs toe (dubbels genegeerd). Dieper = lagere prioriteit.
+
+        Args:
+            budget: max. aantal fan-out URLs (depth > 0) in de frontier, over alle shard
+                    processen heen (tellen en invoegen in één write transactie)
+
+        Returns:
+            (int, int): aantal toegevoegd, aantal nieuwe URLs geweigerd door het budget
+        """
+        now = time.time()
+        rows = []
+        for url in urls:
+            domain = domain_key(url)
+            rows.append((url, canonical_url(url), domain, domain_hash(domain), -depth, now, depth, parent))
+        if not rows:
+            return 0, 0
+        with self.lock:
+            # IMMEDIATE: de write lock vóór het tellen, anders tellen twee shards dezelfde ruimte
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                room = len(rows)
+                if budget is not None:
+                    used = self.conn.execute("SELECT COUNT(*) FROM urls WHERE depth > 0").fetchone()[0]
+                    room = max(budget - used, 0)
+                added = over = 0
+                for row in rows:
+                    if added >= room:
+                        exists = self.conn.execute(
+                            "SELECT 1 FROM urls WHERE url = ? OR canonical = ?", row[:2]
+                        ).fetchone()
+                        over += not exists
+                        continue
+                    added += self.conn.execute(
+                        "INSERT OR IGNORE INTO urls (url, canonical, domain, domain_hash, priority, added_at, depth, parent) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        row,
+                    ).rowcount
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            return added, over
+
+    # ── Crawl planner (in SQLite, zonder alle pending URLs in Python te laden) ──
+    # plan_key(url) is een sorteersleutel binnen een domein (vendor, paginatype); die wordt
+    # als SQL functie geregistreerd zodat groeperen en sorteren in SQLite gebeuren.
+
+    def plan_groups(self, plan_key):
+        """(domein, plan_key, aantal) over de pending URLs."""
+        with self.lock:
+            self.conn.create_function("plan_key", 1, plan_key, deterministic=True)
+            return self.conn.execute(
+                f"""SELECT domain, plan_key(url), COUNT(*) FROM urls
+                    WHERE status = 'pending' {self.shard_filter} GROUP BY 1, 2"""
+            ).fetchall()
+
+    def set_plan(self, plan_key, domains):
+        """
+        Zet plan_order voor alle pending URLs: per domein op prioriteit, plan_key en rowid,
+        dan round-robin over de domeinen (per beurt 'slots' URLs per domein).
+
+        Args:
+            domains: [(domein, slots)] in de volgorde waarin de domeinen aan de beurt komen
+        """
+        with self.lock, self.conn:
+            self.conn.create_function("plan_key", 1, plan_key, deterministic=True)
+            self.conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS plan_domains (domain TEXT PRIMARY KEY, turn INTEGER, slots INTEGER)"
+            )
+            self.conn.execute("DELETE FROM plan_domains")
+            self.conn.executemany(
+                "INSERT INTO plan_domains VALUES (?, ?, ?)",
+                [(domain, turn, slots) for turn, (domain, slots) in enumerate(domains)],
+            )
+            # n = positie binnen het domein; beurt n / slots, daarin de domein volgorde
+            self.conn.execute(
+                f"""UPDATE urls SET plan_order = planned.position FROM (
+                        SELECT id, ROW_NUMBER() OVER (ORDER BY n / slots, turn, n % slots) AS position
+                        FROM (SELECT rowid AS id, domain, ROW_NUMBER() OVER (
+                                  PARTITION BY domain ORDER BY priority DESC, plan_key(url), rowid) - 1 AS n
+                              FROM urls WHERE status = 'pending' {self.shard_filter})
+                        JOIN plan_domains USING (domain)
+                    ) AS planned WHERE urls.rowid = planned.id"""
+            )
+
+    def plan_slots(self, domain, batch_size=5000):
+        """(plan_order, plan_key) van de pending URLs van één domein in plan volgorde (na set_plan), per batch."""
+        last = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    f"""SELECT plan_order, plan_key(url) FROM urls
+                        WHERE domain = ? AND plan_order > ? AND status = 'pending' {self.shard_filter}
+                        ORDER BY plan_order LIMIT ?""",
+                    (domain, last, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][0]
+
+    def depth(self, url):
+        with self.lock:
+            row = self.conn.execute("SELECT depth FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else 0
+
+    def attempts(self, url):
+        """Aantal eerdere (mislukte) pogingen voor deze URL."""
+        with self.lock:
+            row = self.conn.execute("SELECT attempts FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else 0
+
+    def variant_changed(self, url, fields_hash, parent):
+        """
+        Bewaar de list-level hash van een variant en zeg of de detailpagina opnieuw moet:
+        ja als de hash wijzigde, onbekend is, of er nog geen output van die pagina bestaat.
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT fields_hash FROM variant_state WHERE url = ?", (url,)).fetchone()
+            self.conn.execute(
+                """INSERT INTO variant_state (url, fields_hash, parent, seen_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET fields_hash = excluded.fields_hash,
+                       parent = excluded.parent, seen_at = excluded.seen_at""",
+                (url, fields_hash, parent, time.time()),
+            )
+        if fields_hash is None or not row or row[0] != fields_hash:
+            return True
+        fingerprint = self.fingerprint(url)
+        return not (fingerprint and fingerprint["output_path"] and output_exists(fingerprint["output_path"]))
+
+    # ── Uitdelen ──────────────────────────────────────────────
+
+    def claim(self, exclude_domains=()):
+        """
+        Neem de volgende URL (hoogste prioriteit, backoff verstreken, domein niet vol).
+
+        Returns:
+            (url, None): een URL, nu 'in_progress'
+            (None, seconds): nu niets beschikbaar, opnieuw proberen na max. seconds
+            (None, None): alles is afgewerkt
+        """
+        now = time.time()
+        excluded = list(exclude_domains)
+        placeholders = ",".join("?" * len(excluded))
+        domain_filter = f"AND domain NOT IN ({placeholders})" if excluded else ""
+
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                f"""SELECT url FROM urls
+                    WHERE status = 'pending' AND next_attempt_at <= ? {domain_filter} {self.shard_filter}
+                    ORDER BY priority DESC, plan_order, rowid LIMIT 1""",
+                [now, *excluded],
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    "UPDATE urls SET status = 'in_progress', updated_at = ? WHERE url = ?", (now, row[0])
+                )
+                return row[0], None
+
+            next_at, pending = self.conn.execute(
+                f"SELECT MIN(next_attempt_at), COUNT(*) FROM urls WHERE status = 'pending' {self.shard_filter}"
+            ).fetchone()
+            in_progress = self.conn.execute(
+                f"SELECT COUNT(*) FROM urls WHERE status = 'in_progress' {self.shard_filter}"
+            ).fetchone()[0]
+
+        if not pending and not in_progress:
+            return None, None
+        # Wachten op een verstreken backoff, of op een worker die een domein vrijgeeft
+        wait = next_at - now if pending and next_at > now else 1.0
+        if in_progress:
+            wait = min(wait, 1.0)
+        return None, max(wait, 0.1)
+
+    def complete(self, url, result, seconds):
+        """Registreer het resultaat van een poging en plan eventueel een retry in."""
+        now = time.time()
+        ok = bool(result)
+        error = None if ok else (getattr(result, "error", None) or "failed")
+        output_path = getattr(result, "output_path", None)
+
+        with self.lock, self.conn:
+            attempts = self.conn.execute(
+                "SELECT attempts FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+            attempts = (attempts[0] if attempts else 0) + 1
+
+            if ok:
+                status, next_at = "done", 0
+            elif attempts > Config.RETRIES:
+                status, next_at = "failed", 0
+            else:
+                status, next_at = "pending", now + Config.RETRY_BACKOFF * 2 ** (attempts - 1)
+
+            self.conn.execute(
+                """UPDATE urls SET status = ?, attempts = ?, last_error = ?, duration = ?,
+                       output_path = COALESCE(?, output_path), next_attempt_at = ?, updated_at = ?
+                   WHERE url = ?""",
+                (status, attempts, error, seconds, output_path, next_at, now, url),
+            )
+            self.conn.execute(
+                """INSERT INTO attempts (run_id, url, domain, ok, error, duration, finished_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (self.run_id, url, domain_key(url), int(ok), error, seconds, now),
+            )
+        if status == "pending":
+            print(f"  🔁 Retry {attempts}/{Config.RETRIES} scheduled in {next_at - now:.0f}s")
+        return status
+
+    # ── Fingerprints ──────────────────────────────────────────
+
+    def fingerprint(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, content_hash, output_path, checked_at, changed_at "
+                "FROM fingerprints WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        keys = ("etag", "last_modified", "content_hash", "output_path", "checked_at", "changed_at")
+        return dict(zip(keys, row))
+
+    def save_fingerprint(self, url, etag=None, last_modified=None, content_hash=None,
+                         output_path=None, changed=False, checked_only=False):
+        now = time.time()
+        with self.lock, self.conn:
+            if checked_only:
+                self.conn.execute("UPDATE fingerprints SET checked_at = ? WHERE url = ?", (now, url))
+                return
+            self.conn.execute(
+                """INSERT INTO fingerprints (url, etag, last_modified, content_hash, output_path, checked_at, changed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       etag = excluded.etag, last_modified = excluded.last_modified,
+                       content_hash = excluded.content_hash, output_path = excluded.output_path,
+                       checked_at = excluded.checked_at,
+                       changed_at = CASE WHEN ? THEN excluded.changed_at ELSE fingerprints.changed_at END""",
+                (url, etag, last_modified, content_hash, output_path, now, now, int(changed)),
+            )
+
+    # ── Rapportage ────────────────────────────────────────────
+
+    def status_counts(self):
+        with self.lock:
+            return dict(self.conn.execute(
+                f"SELECT status, COUNT(*) FROM urls WHERE 1 = 1 {self.shard_filter} GROUP BY status"
+            ).fetchall())
+
+    def run_throughput(self, limit=5):
+        """Per run: pogingen, ok, mislukt, wall time en pages/min (recentste eerst)."""
+        with self.lock:
+            rows = self.conn.execute(
+                """SELECT run_id, COUNT(*), SUM(ok), MIN(finished_at - duration), MAX(finished_at)
+                   FROM attempts GROUP BY run_id ORDER BY run_id DESC LIMIT ?""",
+                (limit,),
+            ).fetchall()
+        stats = []
+        for run_id, total, ok, first, last in rows:
+            wall = max((last or 0) - (first or 0), 1e-9)
+            stats.append({
+                "run_id": run_id, "attempts": total, "ok": ok or 0, "failed": total - (ok or 0),
+                "wall": wall, "pages_per_min": total / wall * 60,
+            })
+        return stats
+
+    def recent_durations(self, limit=5000):
+        """(url, duur) van de recentste geslaagde pogingen over alle runs (historiek voor de planner)."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT url, duration FROM attempts WHERE ok = 1 AND duration IS NOT NULL ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def run_attempts(self, run_id=None):
+        """(url, ok, duur) van alle pogingen in een run."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT url, ok, duration FROM attempts WHERE run_id = ?", (run_id or self.run_id,)
+            ).fetchall()
+
+    def failure_breakdown(self, limit=10):
+        """Definitief mislukte URLs gegroepeerd per domein en (ingekorte) fout."""
+        with self.lock:
+            return self.conn.execute(
+                """SELECT domain, SUBSTR(COALESCE(last_error, ''), 1, 80) AS error, COUNT(*) AS n
+                   FROM urls WHERE status = 'failed'
+                   GROUP BY domain, error ORDER BY n DESC LIMIT ?""",
+                (limit,),
+            ).fetchall()
+
+    def print_stats(self):
+        counts = self.status_counts()
+        print(f"🗂️  Frontier {self.db_path}: " + ", ".join(f"{n} {s}" for s, n in sorted(counts.items())))
+        for run in self.run_throughput():
+            print(f"   ▶ run {run['run_id']}: {run['attempts']} attempts ({run['ok']} ok, {run['failed']} failed), "
+                  f"{run['wall']:.0f}s, {run['pages_per_min']:.1f} pages/min")
+        failures = self.failure_breakdown()
+        if failures:
+            print("   ❌ Failures:")
+            for domain, error, n in failures:
+                print(f"      {n:>4}× {domain}: {error or '(no error message)'}")
@@ -0,0 +1,152 @@
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+from .config import Config
+from .pacing import PACER
+from utils.vendor_specs import vendor_for_url, http_first_enabled, has_required_content
+
+try:
+    import httpx
+except ImportError:  # Optionele dependency: zonder httpx gaat alles via de browser
+    httpx = None
+
+
+class FetchStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = defaultdict(int)
+
+    def add(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def print_summary(self):
+        if not self.counts:
+            return
+        print(f"🌐 HTTP tier: {self.counts['http_ok']} served over HTTP, "
+              f"{self.counts['escalated']} escalated (content missing), "
+              f"{self.counts['http_error']} HTTP errors, {self.counts['blocked']} block pages")
+
+
+class HttpFetcher:
+    """
+    Snelle eerste laag: haal de server-HTML op met een gepoolde HTTP/2 client
+    (keep-alive, compressie, per-host connectie limiet) en valideer die met de
+    vendor regels uit Vendor_YML.yaml. Pas als er content ontbreekt gaat de URL
+    naar de Playwright strategie.
+    """
+
+    def __init__(self, per_host=None, timeout_ms=None):
+        self.per_host = per_host or Config.HTTP_PER_HOST_LIMIT
+        self.timeout = (timeout_ms or Config.HTTP_TIMEOUT) / 1000
+        self.stats = FetchStats()
+        self.host_slots = defaultdict(lambda: threading.BoundedSemaphore(self.per_host))
+        self.slots_lock = threading.Lock()
+        self.client = self._build_client() if httpx else None
+
+    def _build_client(self):
+        options = dict(
+            follow_redirects=True,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.per_host * 8,
+                max_keepalive_connections=self.per_host * 8,
+            ),
+            headers={
+                "User-Agent": Config.HTTP_USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "nl-BE,nl;q=0.9,en;q=0.8",
+                "Accept-Encoding": "gzip, deflate, br",
+            },
+        )
+        try:
+            return httpx.Client(http2=True, **options)
+        except ImportError:
+            # 'h2' niet geïnstalleerd: HTTP/1.1 met keep-alive
+            return httpx.Client(**options)
+
+    @property
+    def available(self):
+        return self.client is not None
+
+    def _slot(self, url):
+        host = urlparse(url).netloc.lower()
+        with self.slots_lock:
+            return self.host_slots[host]
+
+    def fetch(self, url):
+        """Haal een URL op. Geeft (status, html, headers) terug, of (None, None, {}) bij elke fout (-> browser)."""
+        try:
+            PACER.acquire(url)
+            with self._slot(url):
+                response = self.client.get(url)
+                html = response.text
+        except Exception as e:
+            print(f"  ⚠️  HTTP fetch failed: {type(e).__name__}: {e}")
+            return None, None, {}
+        PACER.record(url, status=response.status_code, retry_after=response.headers.get("retry-after"))
+        return response.status_code, html, response.headers
+
+    def conditional(self, url, etag=None, last_modified=None):
+        """
+        Conditionele GET met de validators van een vorige fetch; de body wordt niet gelezen.
+
+        Returns:
+            (status, etag, last_modified): status 304 = onveranderd, None bij een fout
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        try:
+            PACER.acquire(url)
+            with self._slot(url):
+                with self.client.stream("GET", url, headers=headers) as response:
+                    PACER.record(url, status=response.status_code, retry_after=response.headers.get("retry-after"))
+                    return (response.status_code, response.headers.get("etag"),
+                            response.headers.get("last-modified"))
+        except Exception as e:
+            print(f"  ⚠️  Conditional request failed: {type(e).__name__}: {e}")
+            return None, None, None
+
+    def try_fetch(self, url, vendor=None):
+        """
+        Probeer de URL zonder browser.
+
+        Args:
+            vendor: MSE vendor key (default: afgeleid uit de URL)
+
+        Returns:
+            (str, headers) | (None, None): HTML + response headers als die alle vereiste
+            content bevat, anders None (-> browser)
+        """
+        vendor = vendor or vendor_for_url(url)
+        if not self.available or not http_first_enabled(vendor):
+            return None, None
+
+        print(f"  ⚡ Trying HTTP-first fetch ({vendor})...")
+        status, html, headers = self.fetch(url)
+        if status != 200 or not html:
+            self.stats.add("http_error")
+            print(f"  ↪️  HTTP status {status}, escalating to browser.")
+            return None, None
+
+        if PACER.is_block_page(html):
+            self.stats.add("blocked")
+            PACER.throttle(url, "block page")
+            print("  ↪️  Block page instead of content, escalating to browser.")
+            return None, None
+
+        if not has_required_content(html, vendor):
+            self.stats.add("escalated")
+            print("  ↪️  Required content missing in server HTML, escalating to browser.")
+            return None, None
+
+        self.stats.add("http_ok")
+        return html, headers
+
+    def close(self):
+        if self.client:
+            self.client.close()
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:  # Staat in requirements.txt; zonder psutil via /proc (Linux), anders geen metingen
+    psutil = None
+
+
+def child_pids(pid):
+    """Directe kindprocessen van pid."""
+    if psutil:
+        try:
+            return {child.pid for child in psutil.Process(pid).children()}
+        except psutil.Error:
+            return set()
+    return {child for child, parent in _proc_parents().items() if parent == pid}
+
+
+def tree_rss(root_pids):
+    """
+    Resident memory (bytes) van de gegeven processen en al hun afstammelingen.
+
+    Returns:
+        int | None: None als het platform niet meetbaar is (geen psutil en geen /proc)
+    """
+    if psutil:
+        total = 0
+        for pid in root_pids:
+            try:
+                root = psutil.Process(pid)
+                for process in [root, *root.children(recursive=True)]:
+                    total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for child, parent in _proc_parents().items():
+        children.setdefault(parent, []).append(child)
+    tree, todo = set(), list(root_pids)
+    while todo:
+        pid = todo.pop()
+        if pid in tree:
+            continue
+        tree.add(pid)
+        todo.extend(children.get(pid, ()))
+    return sum(_proc_rss(pid) for pid in tree)
+
+
+def _proc_parents():
+    parents = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as f:
+                # 'pid (comm) state ppid ...' - comm kan spaties/haakjes bevatten
+                parents[int(name)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return parents
+
+
+def _proc_rss(pid):
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+class MemoryStats:
+    """Browser geheugen doorheen de run: metingen per browser en het aantal context recycles."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.samples = []   # (seconden sinds start, label, pagina's, MB)
+        self.recycles = 0
+
+    def sample(self, label, pages, rss):
+        if rss is None:
+            return
+        mb = rss / 1024 / 1024
+        with self.lock:
+            self.samples.append((time.monotonic() - self.started, label, pages, mb))
+        print(f"  🧠 Browser memory [{label}]: {mb:.0f} MB after {pages} pages")
+
+    def recycled(self):
+        with self.lock:
+            self.recycles += 1
+
+    def print_summary(self):
+        with self.lock:
+            samples = list(self.samples)
+            recycles = self.recycles
+        if not samples:
+            return
+        peak = max(mb for _, _, _, mb in samples)
+        print(f"🧠 Browser memory: peak {peak:.0f} MB, {recycles} context recycles")
+        # Tijdlijn: hoogstens ~10 punten per browser
+        for label in sorted({label for _, label, _, _ in samples}):
+            own = [s for s in samples if s[1] == label]
+            step = max(1, len(own) // 10)
+            timeline = ", ".join(f"{t / 60:.0f}m {mb:.0f}MB" for t, _, _, mb in own[::step])
+            print(f"   🖥️  {label}: {timeline}")
+
+
+BROWSER_MEMORY = MemoryStats()
@@ -0,0 +1,215 @@
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from .config import Config
+from utils.vendor_specs import vendor_for_url
+
+
+class UrlMetrics:
+    """
+    Tijd per fase voor één URL (goto, cookies, login, scroll, price_wait, pagination, snapshot, ...).
+
+    Fases mogen genest zijn: elke fase krijgt enkel zijn *eigen* tijd (exclusief geneste
+    fases), zodat de som van alle fases gelijk is aan de tijd die de URL kostte.
+    Wat niet in een fase valt, komt onder 'other'. Een fase met inherit=True (bv. de
+    readiness waits) telt binnen een andere fase mee voor die fase: een wait in
+    smart_price_wait is price_wait tijd, een wait direct na goto is 'wait'.
+    """
+
+    def __init__(self, url, attempt=1):
+        self.url = url
+        self.vendor = vendor_for_url(url) or "unknown"
+        self.attempt = attempt
+        self.started = time.monotonic()
+        self.phases = defaultdict(float)
+        self.bytes = 0
+        self.tier = "browser"
+        self._stack = []  # [naam, start, tijd in geneste fases]
+
+    @contextmanager
+    def phase(self, name, inherit=False):
+        if inherit and self._stack:
+            yield
+            return
+        frame = [name, time.monotonic(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.monotonic() - frame[1]
+            self.phases[name] += elapsed - frame[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def finish(self, ok, error=None):
+        """Het JSONL record voor deze URL."""
+        total = time.monotonic() - self.started
+        phases = dict(self.phases)
+        other = total - sum(phases.values())
+        if other > 0.001:
+            phases["other"] = other
+        return {
+            "url": self.url,
+            "vendor": self.vendor,
+            "ok": bool(ok),
+            "error": error,
+            "tier": self.tier,
+            "attempt": self.attempt,
+            "bytes": self.bytes,
+            "seconds": round(total, 3),
+            "phases": {name: round(seconds, 3) for name, seconds in phases.items()},
+            "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+
+def timed(name, inherit=False):
+    """Decorator voor strategy methodes: tijd telt als fase 'name' als er een self.metrics is."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, "metrics", None)
+            with metrics.phase(name, inherit) if metrics else nullcontext():
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def phase(metrics, name):
+    """metrics.phase(name), of niets als er geen metrics zijn."""
+    return metrics.phase(name) if metrics else nullcontext()
+
+
+class MetricsCollector:
+    """
+    Schrijft één JSONL record per verwerkte URL naar Config.METRICS_DIR/urls_<run_id>.jsonl
+    (shards schrijven naar hetzelfde bestand) en maakt op het einde van de run een
+    Prometheus text-format bestand met p50/p95 per vendor en fase.
+    """
+
+    def __init__(self, metrics_dir=None):
+        self.metrics_dir = str(metrics_dir or Config.METRICS_DIR)
+        self.lock = threading.Lock()
+        self.run_id = None
+
+    def path(self, run_id=None):
+        return os.path.join(self.metrics_dir, f"urls_{run_id or self.run_id}.jsonl")
+
+    def start(self, run_id):
+        self.run_id = run_id
+
+    def record(self, record):
+        if not (Config.METRICS and self.run_id):
+            return
+        line = json.dumps({"run_id": self.run_id, **record}, ensure_ascii=False)
+        with self.lock:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            # Eén write per regel in append modus: ook veilig met meerdere shard processen
+            with open(self.path(), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def load(self, run_id=None):
+        try:
+            with open(self.path(run_id), "r", encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def write_prometheus(self, run_id=None):
+        """
+        Aggregaten van de run in Prometheus text format (Config.METRICS_PROM), bv. voor
+        de node_exporter textfile collector. Geeft het pad, of None zonder records.
+        """
+        records = self.load(run_id)
+        if not records:
+            return None
+
+        phases = defaultdict(list)
+        totals = defaultdict(list)
+        counts = defaultdict(lambda: {"ok": 0, "failed": 0, "bytes": 0, "retries": 0})
+        for record in records:
+            vendor = record["vendor"]
+            totals[vendor].append(record["seconds"])
+            for name, seconds in record["phases"].items():
+                phases[(vendor, name)].append(seconds)
+            stats = counts[vendor]
+            stats["ok" if record["ok"] else "failed"] += 1
+            stats["bytes"] += record["bytes"]
+            stats["retries"] += record["attempt"] > 1
+
+        lines = [
+            "# HELP pyscraper_phase_seconds Time per crawl phase per URL (excluding nested phases).",
+            "# TYPE pyscraper_phase_seconds summary",
+        ]
+        for (vendor, name), values in sorted(phases.items()):
+            lines += _summary("pyscraper_phase_seconds", f'vendor="{vendor}",phase="{name}"', values)
+        lines += [
+            "# HELP pyscraper_url_seconds Total time per URL.",
+            "# TYPE pyscraper_url_seconds summary",
+        ]
+        for vendor, values in sorted(totals.items()):
+            lines += _summary("pyscraper_url_seconds", f'vendor="{vendor}"', values)
+        lines += [
+            "# HELP pyscraper_urls_total Processed URLs by result.",
+            "# TYPE pyscraper_urls_total counter",
+        ]
+        for vendor, stats in sorted(counts.items()):
+            lines.append(f'pyscraper_urls_total{{vendor="{vendor}",result="ok"}} {stats["ok"]}')
+            lines.append(f'pyscraper_urls_total{{vendor="{vendor}",result="failed"}} {stats["failed"]}')
+        lines += [
+            "# HELP pyscraper_captured_bytes_total Bytes of HTML written.",
+            "# TYPE pyscraper_captured_bytes_total counter",
+        ]
+        lines += [f'pyscraper_captured_bytes_total{{vendor="{v}"}} {s["bytes"]}' for v, s in sorted(counts.items())]
+        lines += [
+            "# HELP pyscraper_retries_total URLs processed on a retry attempt.",
+            "# TYPE pyscraper_retries_total counter",
+        ]
+        lines += [f'pyscraper_retries_total{{vendor="{v}"}} {s["retries"]}' for v, s in sorted(counts.items())]
+
+        path = str(Config.METRICS_PROM)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)  # Atomisch: een collector leest nooit een half bestand
+        return path
+
+    def print_summary(self, run_id=None, top=5):
+        """Fases die de meeste tijd kostten (per vendor), met p50/p95."""
+        records = self.load(run_id)
+        if not records:
+            return
+        phases = defaultdict(list)
+        for record in records:
+            for name, seconds in record["phases"].items():
+                phases[(record["vendor"], name)].append(seconds)
+        slowest = sorted(phases.items(), key=lambda item: -sum(item[1]))[:top]
+        print(f"⏲️  Phase timing ({len(records)} URLs, top {len(slowest)} by total time):")
+        for (vendor, name), values in slowest:
+            print(f"   {vendor:<10} {name:<11} p50 {quantile(values, 0.5):.1f}s, "
+                  f"p95 {quantile(values, 0.95):.1f}s, total {sum(values):.0f}s")
+        print(f"   📈 Per-URL records: {self.path(run_id)}")
+
+
+def quantile(values, q):
+    """Nearest-rank quantiel."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _summary(metric, labels, values):
+    return [
+        f'{metric}{{{labels},quantile="0.5"}} {quantile(values, 0.5):.3f}',
+        f'{metric}{{{labels},quantile="0.95"}} {quantile(values, 0.95):.3f}',
+        f"{metric}_sum{{{labels}}} {sum(values):.3f}",
+        f"{metric}_count{{{labels}}} {len(values)}",
+    ]
+
+
+METRICS = MetricsCollector()
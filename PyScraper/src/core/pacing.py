@@ -0,0 +1,193 @@
+import math
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from .config import Config
+from .crawler import domain_key
+from .planner import page_type
+
+class TokenBucket:
+    """Token bucket met een aanpasbare rate (requests/s); reserve() geeft de wachttijd."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self, now):
+        """Neem een token (mag negatief gaan = in de wachtrij). Geeft hoe lang de caller moet wachten."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class LatencyEstimate:
+    """Online schatting van de laadtijd: EWMA + p95 over de laatste Config.PACING_WINDOW metingen."""
+
+    def __init__(self):
+        self.ewma = None
+        self.samples = deque(maxlen=Config.PACING_WINDOW)
+
+    def update(self, seconds):
+        alpha = Config.PACING_EWMA_ALPHA
+        self.ewma = seconds if self.ewma is None else alpha * seconds + (1 - alpha) * self.ewma
+        self.samples.append(seconds)
+
+    def p95(self):
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+class DomainState:
+    def __init__(self):
+        self.bucket = TokenBucket(Config.PACING_START_RATE, Config.PACING_BURST)
+        self.latency = defaultdict(LatencyEstimate)  # (paginatype, wait_until) -> schatting
+        self.cooldown_until = 0.0
+        self.streak = 0
+        self.strikes = 0
+        self.requests = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.waited = 0.0
+
+
+class DomainPacer:
+    """
+    Per-domein pacing en timeouts, i.p.v. vaste Config constanten.
+
+    - Token bucket per domein (domain_key, zoals de DomainScheduler): elke navigatie en
+      HTTP tier fetch neemt een token, een batch parallelle Phoenix tabs samen één. De
+      rate past zich aan (AIMD): na PACING_INCREASE_EVERY vlotte requests +
+      PACING_INCREASE req/s, bij 429/5xx of een block pagina x PACING_BACKOFF plus een
+      cooldown (Retry-After, anders exponentieel).
+    - Navigatie timeout per domein, paginatype en wait_until uit de gemeten laadtijden
+      (networkidle duurt structureel langer dan domcontentloaded, dus aparte schattingen):
+      max(p95 x TIMEOUT_P95_FACTOR, EWMA x TIMEOUT_EWMA_FACTOR), tussen
+      PACING_MIN_TIMEOUT en Config.TIMEOUT_PAGE_LOAD. Zonder genoeg metingen geldt
+      TIMEOUT_PAGE_LOAD. Een timeout telt als meting van PACING_TIMEOUT_PENALTY x de
+      timeout, zodat de schatting meegroeit als een site trager wordt.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.domains = defaultdict(DomainState)
+
+    def acquire(self, url):
+        """Blokkeert tot het domein een request toelaat. Geeft de wachttijd (s)."""
+        if not Config.PACING:
+            return 0.0
+        with self.lock:
+            state = self.domains[domain_key(url)]
+            now = time.monotonic()
+            wait = max(state.bucket.reserve(now), state.cooldown_until - now)
+            state.requests += 1
+            state.waited += wait
+        if wait > 0:
+            if wait >= 1:
+                print(f"  🚦 Pacing {domain_key(url)}: waiting {wait:.1f}s")
+            time.sleep(wait)
+        return wait
+
+    def timeout_ms(self, url, wait_until='domcontentloaded'):
+        """Navigatie timeout (ms) voor deze URL en deze wait_until."""
+        if not Config.PACING:
+            return Config.TIMEOUT_PAGE_LOAD
+        with self.lock:
+            estimate = self.domains[domain_key(url)].latency.get((page_type(url), wait_until))
+            if estimate is None or len(estimate.samples) < Config.PACING_MIN_SAMPLES:
+                return Config.TIMEOUT_PAGE_LOAD
+            seconds = max(estimate.p95() * Config.TIMEOUT_P95_FACTOR, estimate.ewma * Config.TIMEOUT_EWMA_FACTOR)
+        return int(min(max(seconds * 1000, Config.PACING_MIN_TIMEOUT), Config.TIMEOUT_PAGE_LOAD))
+
+    def record(self, url, seconds=None, status=None, retry_after=None, timeout_ms=None, wait_until='domcontentloaded'):
+        """
+        Resultaat van een navigatie/fetch.
+
+        Args:
+            seconds: laadtijd (None = niet meten, bv. HTTP tier)
+            status: HTTP status van het hoofddocument
+            timeout_ms: gezet als de navigatie op deze timeout afbrak
+            wait_until: load state waarop gewacht werd (aparte schatting per waarde)
+        """
+        if not Config.PACING:
+            return
+        # about:blank of een niet gecommitte navigatie (0 s) is geen meting: zou de
+        # timeout van het domein naar PACING_MIN_TIMEOUT trekken
+        if not url.startswith(("http://", "https://")) or (seconds is not None and seconds <= 0):
+            return
+        with self.lock:
+            state = self.domains[domain_key(url)]
+            if timeout_ms is not None:
+                state.timeouts += 1
+                seconds = timeout_ms / 1000 * Config.PACING_TIMEOUT_PENALTY
+            if seconds is not None:
+                state.latency[(page_type(url), wait_until)].update(seconds)
+        # 429 = te snel, 5xx = overbelast: beide betekenen minder hard duwen
+        if status is not None and (status == 429 or status >= 500):
+            self.throttle(url, f"HTTP {status}", retry_after)
+        elif status is not None and status < 400:
+            self._success(url)
+
+    def throttle(self, url, reason, retry_after=None):
+        """429/5xx of block pagina: rate omlaag en een cooldown voor het hele domein."""
+        if not Config.PACING:
+            return
+        domain = domain_key(url)
+        with self.lock:
+            state = self.domains[domain]
+            state.throttled += 1
+            state.strikes += 1
+            state.streak = 0
+            state.bucket.rate = max(state.bucket.rate * Config.PACING_BACKOFF, Config.PACING_MIN_RATE)
+            cooldown = _retry_after_seconds(retry_after)
+            if cooldown is None:
+                cooldown = min(Config.PACING_COOLDOWN * 2 ** (state.strikes - 1), Config.PACING_MAX_COOLDOWN)
+            state.cooldown_until = max(state.cooldown_until, time.monotonic() + cooldown)
+            # Eén token op het einde van de cooldown: wachtende requests komen daarna gespreid terug
+            state.bucket.tokens = 1
+            state.bucket.updated = state.cooldown_until
+            rate = state.bucket.rate
+        print(f"  🐢 {domain} pushed back ({reason}): {rate * 60:.1f} req/min, cooldown {cooldown:.0f}s")
+
+    def _success(self, url):
+        with self.lock:
+            state = self.domains[domain_key(url)]
+            state.strikes = 0
+            state.streak += 1
+            if state.streak >= Config.PACING_INCREASE_EVERY:
+                state.streak = 0
+                state.bucket.rate = min(state.bucket.rate + Config.PACING_INCREASE, Config.PACING_MAX_RATE)
+
+    def is_block_page(self, html):
+        """Captcha/WAF pagina i.p.v. content (Config.BLOCK_PAGE_PATTERNS op het begin van de HTML)."""
+        head = html[:Config.BLOCK_PAGE_SCAN]
+        return any(re.search(pattern, head, re.IGNORECASE) for pattern in Config.BLOCK_PAGE_PATTERNS)
+
+    def print_summary(self):
+        with self.lock:
+            domains = {domain: state for domain, state in self.domains.items() if state.requests}
+        if not domains:
+            return
+        print("🚦 Pacing per domain:")
+        for domain, state in sorted(domains.items()):
+            timeouts = ", ".join(
+                f"{kind}/{wait_until} p95 {estimate.p95():.1f}s"
+                for (kind, wait_until), estimate in sorted(state.latency.items()) if estimate.samples
+            )
+            print(f"   {domain}: {state.bucket.rate * 60:.1f} req/min, {state.requests} requests, "
+                  f"{state.throttled} pushbacks, {state.timeouts} timeouts, waited {state.waited:.0f}s"
+                  + (f" ({timeouts})" if timeouts else ""))
+
+
+def _retry_after_seconds(value):
+    """Retry-After in seconden (enkel de numerieke vorm), of None."""
+    try:
+        return min(float(value), Config.PACING_MAX_COOLDOWN) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+PACER = DomainPacer()
@@ -0,0 +1,193 @@
+import heapq
+import re
+import statistics
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+from .config import Config
+from .crawler import domain_key
+from .frontier import domain_hash
+from utils.vendor_specs import vendor_for_url
+
+
+def page_type(url, vendor=None):
+    """'list' of 'detail' volgens Config.PAGE_TYPES (eerste match op pad + query), anders 'page'."""
+    vendor = vendor or vendor_for_url(url)
+    parsed = urlparse(url)
+    target = f"{parsed.path}?{parsed.query}"
+    for pattern, kind in Config.PAGE_TYPES.get(vendor, ()):
+        if re.search(pattern, target):
+            return kind
+    return "page"
+
+
+def url_group(url):
+    """(domein, vendor, paginatype): de eenheid waarop de planner groepeert en schat."""
+    vendor = vendor_for_url(url)
+    return domain_key(url), vendor, page_type(url, vendor)
+
+
+class CrawlPlan:
+    """Resultaat van de planner: verwachte duur per groep en voor de hele run."""
+
+    def __init__(self, groups, estimates, expected_seconds, workers):
+        self.groups = groups            # (domein, vendor, type) -> aantal URLs
+        self.estimates = estimates      # (domein, vendor, type) -> (seconden per URL, 'history'/'default')
+        self.expected_seconds = expected_seconds
+        self.workers = workers
+        self.started = time.monotonic()
+
+    def print_summary(self):
+        total = sum(self.groups.values())
+        print(f"🧭 Crawl plan: {total} URLs in {len(self.groups)} groups, "
+              f"expected ~{self.expected_seconds / 60:.1f} min with {self.workers} workers")
+        for group, count in sorted(self.groups.items(), key=lambda item: -item[1] * self.estimates[item[0]][0]):
+            seconds, source = self.estimates[group]
+            print(f"   {'/'.join(group):<40} {count:>6} URLs × {seconds:.0f}s ({source})")
+
+    def print_report(self, attempts):
+        """
+        Verwacht vs werkelijk, voor de run en per groep.
+
+        Args:
+            attempts: (url, ok, duration) van deze run (Frontier.run_attempts)
+        """
+        actual = time.monotonic() - self.started
+        if self.expected_seconds:
+            delta = (actual - self.expected_seconds) / self.expected_seconds * 100
+            print(f"🧭 Run time: expected {self.expected_seconds / 60:.1f} min, "
+                  f"actual {actual / 60:.1f} min ({delta:+.0f}%)")
+        durations = defaultdict(list)
+        for url, ok, duration in attempts:
+            if duration is not None:
+                durations[url_group(url)].append(duration)
+        for group, values in sorted(durations.items()):
+            expected = self.estimates.get(group, (None,))[0]
+            line = f"   {'/'.join(group):<40} median {statistics.median(values):.1f}s over {len(values)}"
+            if expected:
+                line += f" (expected {expected:.0f}s)"
+            print(line)
+
+
+class CrawlPlanner:
+    """
+    Plant de volgorde van de pending URLs vóór de crawl, i.p.v. de volgorde van urls.txt.
+
+    - Per domein liggen URLs van dezelfde vendor en hetzelfde paginatype (lijst vs detail)
+      na elkaar: de sessie, consent cookies en asset cache blijven warm, en lijstpagina's
+      (lang, voeden de fan-out) komen eerst.
+    - Over domeinen heen wordt gewogen round-robin geïnterleaved (per ronde evenveel URLs
+      als de domeinlimiet), met het domein dat het meeste werk per slot heeft vooraan: zo
+      hebben alle workers werk zonder de per-domein limieten te overschrijden.
+
+    De duur per groep komt uit de frontier historiek (mediaan van geslaagde pogingen),
+    anders Config.PLAN_DEFAULT_SECONDS. De verwachte run tijd is een simulatie van de
+    DomainScheduler met die duren.
+
+    De volgorde wordt als plan_order in de frontier gezet; prioriteit (bv. fan-out diepte)
+    blijft voorgaan.
+    """
+
+    TYPE_ORDER = {"list": 0, "page": 1, "detail": 2}
+
+    def __init__(self, frontier, workers=1, shards=1):
+        self.frontier = frontier
+        self.workers = workers
+        self.shards = shards
+
+    def plan(self):
+        # Groeperen, sorteren en plan_order zetten gebeurt in SQLite: het geheugen blijft
+        # O(groepen + domeinen), niet O(pending URLs)
+        groups = {}
+        for domain, key, count in self.frontier.plan_groups(plan_key):
+            vendor, _, kind = key.split("/")
+            groups[(domain, vendor, kind)] = count
+        if not groups:
+            return None
+        estimates = self._estimates()
+        work = defaultdict(float)
+        for group, count in groups.items():
+            if group not in estimates:
+                estimates[group] = self._default(group)
+            work[group[0]] += count * estimates[group][0]
+
+        domains = sorted(work, key=lambda domain: work[domain] / _limit(domain), reverse=True)
+        self.frontier.set_plan(plan_key, [(domain, _limit(domain)) for domain in domains])
+        expected = self._simulate(domains, estimates)
+        return CrawlPlan(groups, estimates, expected, self.workers * self.shards)
+
+    def _estimates(self):
+        history = defaultdict(list)
+        for url, duration in self.frontier.recent_durations(Config.PLAN_HISTORY):
+            history[url_group(url)].append(duration)
+        return {
+            group: (statistics.median(values), "history")
+            for group, values in history.items() if len(values) >= Config.PLAN_MIN_SAMPLES
+        }
+
+    def _default(self, group):
+        return Config.PLAN_DEFAULT_SECONDS.get(group[2], Config.PLAN_DEFAULT_SECONDS["page"]), "default"
+
+    def _simulate(self, domains, estimates):
+        """
+        Verwachte wall time: per shard de DomainScheduler nabootsen (een vrije worker neemt
+        de eerste URL in plan volgorde waarvan het domein nog plaats heeft).
+        """
+        partitions = defaultdict(dict)
+        for domain in domains:
+            shard = domain_hash(domain) % self.shards if self.shards > 1 else 0
+            partitions[shard][domain] = _PlanQueue(self._durations(domain, estimates))
+        return max((_simulate_shard(queues, self.workers) for queues in partitions.values()), default=0.0)
+
+    def _durations(self, domain, estimates):
+        """(plan_order, verwachte seconden) van de pending URLs van een domein, lazy uit de frontier."""
+        for position, key in self.frontier.plan_slots(domain):
+            vendor, _, kind = key.split("/")
+            yield position, estimates[(domain, vendor, kind)][0]
+
+
+def plan_key(url):
+    """Sorteersleutel binnen een domein (SQL functie in de frontier): 'vendor/rang/paginatype'."""
+    vendor = vendor_for_url(url)
+    kind = page_type(url, vendor)
+    return f"{vendor}/{CrawlPlanner.TYPE_ORDER.get(kind, 1)}/{kind}"
+
+
+class _PlanQueue:
+    """Lazy wachtrij over (plan_order, seconden) van één domein; head = eerstvolgende of None."""
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.head = next(self.rows, None)
+
+    def popleft(self):
+        row, self.head = self.head, next(self.rows, None)
+        return row
+
+
+def _limit(domain):
+    return Config.DOMAIN_LIMITS.get(domain, Config.DEFAULT_DOMAIN_LIMIT)
+
+
+def _simulate_shard(queues, workers):
+    now = 0.0
+    free = workers
+    active = defaultdict(int)
+    running = []
+    while True:
+        while free:
+            best = None
+            for domain, queue in queues.items():
+                if queue.head and active[domain] < _limit(domain) and (best is None or queue.head[0] < queues[best].head[0]):
+                    best = domain
+            if best is None:
+                break
+            _, seconds = queues[best].popleft()
+            active[best] += 1
+            free -= 1
+            heapq.heappush(running, (now + seconds, best))
+        if not running:
+            return now
+        now, domain = heapq.heappop(running)
+        active[domain] -= 1
+        free += 1
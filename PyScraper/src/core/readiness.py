@@ -0,0 +1,134 @@
+import math
+import threading
+import time
+from .config import Config
+
+
+class Ready:
+    """
+    Eén readiness predicaat ("prijzen gerenderd", "spec tabel aanwezig", ...).
+    Strategies declareren deze in hun READINESS dict en wachten er event-driven op
+    i.p.v. vaste sleeps.
+    """
+
+    def __init__(self, kind, target, state='attached', arg=None):
+        self.kind = kind
+        self.target = target
+        self.state = state
+        self.arg = arg
+
+    @classmethod
+    def selector(cls, selector, state='attached'):
+        """Wacht via page.wait_for_selector (state: attached/visible/hidden/detached)."""
+        return cls('selector', selector, state=state)
+
+    @classmethod
+    def function(cls, expression, arg=None):
+        """Wacht tot een JS functie truthy teruggeeft (page.wait_for_function)."""
+        return cls('function', expression, arg=arg)
+
+    @classmethod
+    def response(cls, url_part):
+        """Wacht op een netwerk response waarvan de URL url_part bevat (na een actie)."""
+        return cls('response', url_part)
+
+    def wait(self, page, timeout_ms):
+        if self.kind == 'selector':
+            page.wait_for_selector(self.target, state=self.state, timeout=timeout_ms)
+        elif self.kind == 'function':
+            page.wait_for_function(self.target, arg=self.arg, timeout=timeout_ms)
+        elif self.kind == 'response':
+            page.wait_for_response(lambda r: self.target in r.url, timeout=timeout_ms)
+
+    def __repr__(self):
+        return f"Ready.{self.kind}({self.target!r})"
+
+
+class WaitStats:
+    """
+    Verzamelt hoeveel tijd de readiness waits kostten t.o.v. de oude vaste sleeps.
+    Waits die hun plafond raakten staan apart: daar is niets bespaard, ze kostten meer.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.waits = 0
+        self.waited = 0.0
+        self.legacy = 0.0
+        self.timeouts = 0
+        self.timeout_waited = 0.0
+        self.timeout_legacy = 0.0
+
+    def record(self, waited, legacy, ready):
+        with self.lock:
+            if ready:
+                self.waits += 1
+                self.waited += waited
+                self.legacy += legacy
+            else:
+                self.timeouts += 1
+                self.timeout_waited += waited
+                self.timeout_legacy += legacy
+
+    def print_summary(self):
+        if not (self.waits or self.timeouts):
+            return
+        saved = self.legacy - self.waited
+        print(f"⏱️  Readiness waits: {self.waits} ready, {self.waited:.1f}s waited "
+              f"vs {self.legacy:.1f}s fixed sleeps -> {saved:.1f}s saved")
+        if self.timeouts:
+            print(f"   {self.timeouts} hit the timeout ceiling: {self.timeout_waited:.1f}s waited "
+                  f"vs {self.timeout_legacy:.1f}s fixed sleeps -> "
+                  f"{self.timeout_waited - self.timeout_legacy:.1f}s extra")
+
+
+WAIT_STATS = WaitStats()
+
+
+def wait_for(page, checks, label='', legacy_ms=0, poll_ms=None, timeout=None):
+    """
+    Wacht tot alle checks voldaan zijn, met één gezamenlijk timeout plafond.
+
+    Args:
+        checks: Lijst van Ready predicaten
+        legacy_ms: De vaste sleep die deze wait vervangt (voor de 'saved' statistiek);
+                   het plafond wordt dan legacy_ms x Config.READY_LEGACY_FACTOR, zodat een
+                   wait die nooit klaar raakt niet veel langer duurt dan de oude sleep
+        poll_ms: Interval van de oude poll-loop; de oude wachttijd wordt dan
+                 afgerond op hele intervallen i.p.v. legacy_ms te gebruiken
+        timeout: Plafond in ms (default: zie legacy_ms, anders Config.READY_TIMEOUT)
+
+    Returns:
+        bool: True als de pagina klaar was binnen het plafond
+    """
+    if not timeout:
+        timeout = Config.READY_TIMEOUT
+        if legacy_ms:
+            timeout = min(timeout, int(legacy_ms * Config.READY_LEGACY_FACTOR))
+    started = time.monotonic()
+    ready = True
+
+    for check in checks:
+        remaining = timeout - (time.monotonic() - started) * 1000
+        if remaining <= 0:
+            ready = False
+            break
+        try:
+            check.wait(page, remaining)
+        except Exception:
+            ready = False
+            break
+
+    waited = time.monotonic() - started
+
+    if poll_ms:
+        # Oude loop: check, dan sleep(poll). Direct klaar = 0 sleeps.
+        polls = math.ceil(max(waited - 0.05, 0) * 1000 / poll_ms)
+        legacy = min(polls * poll_ms, timeout) / 1000
+    else:
+        legacy = legacy_ms / 1000
+
+    WAIT_STATS.record(waited, legacy, ready)
+    if not ready:
+        print(f"     ⏳ Readiness '{label}' not reached within {timeout}ms, continuing...")
+    return ready
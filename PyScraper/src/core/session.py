@@ -0,0 +1,177 @@
+import configparser
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from .config import Config
+
+
+@lru_cache(maxsize=None)
+def load_credentials(vendor):
+    """
+    Lees email/password voor een vendor uit credentials.ini (één keer per proces).
+
+    Returns:
+        dict | None: {'email': ..., 'password': ...} of None als ze ontbreken
+    """
+    if not os.path.exists(Config.SECRETS_PATH):
+        print(f"  ⚠️  Secrets file not found at {Config.SECRETS_PATH}")
+        return None
+
+    config = configparser.ConfigParser()
+    config.read(Config.SECRETS_PATH)
+    if vendor not in config:
+        print(f"  ⚠️  No [{vendor}] section in secrets file")
+        return None
+
+    email = config[vendor].get('email')
+    password = config[vendor].get('password')
+    if not email or not password:
+        print(f"  ⚠️  Email or password for [{vendor}] not found in secrets file")
+        return None
+    return {'email': email, 'password': password}
+
+
+class SessionManager:
+    """
+    Login één keer per vendor en hergebruik de sessie over alle URLs (en runs).
+
+    Na een login wordt de Playwright storage_state samen met de namen van de
+    cookies die de login zette bewaard in Config.SESSION_DIR/<vendor>.json.
+    Validatie is goedkoop: zijn die cookies aanwezig in de context en niet
+    verlopen? Een nieuwe context (andere worker, volgende run) krijgt de
+    cookies uit het bestand. Enkel als dat niet volstaat wordt opnieuw ingelogd.
+    """
+
+    def __init__(self, state_dir=None):
+        self.state_dir = state_dir or Config.SESSION_DIR
+        self.lock = threading.Lock()
+        self.vendor_locks = {}
+        self.states = {}
+        self.reused = 0
+        self.restored = 0
+        self.logins = 0
+
+    def ensure(self, page, strategy):
+        """
+        Zorg dat de context van page ingelogd is voor strategy.SESSION_VENDOR.
+
+        Returns:
+            bool: True als er een login flow doorlopen is (de pagina kan verplaatst zijn)
+        """
+        vendor = strategy.SESSION_VENDOR
+        domain = strategy.SESSION_DOMAIN
+        context = page.context
+
+        if self.is_valid(context, vendor, domain):
+            self._count('reused')
+            return False
+
+        # Eén login tegelijk per vendor; wie wacht krijgt daarna de verse state
+        with self._vendor_lock(vendor):
+            state = self.load_state(vendor)
+            if state and self.is_valid(context, vendor, domain, restore=True):
+                print(f"  🔐 Restored {vendor} session from disk.")
+                self._count('restored')
+                return False
+
+            credentials = load_credentials(vendor)
+            if not credentials:
+                return False
+
+            before = self._cookie_values(context, domain)
+            strategy.login(page, credentials)
+            if strategy.is_logged_in(page) is False:
+                print(f"  ❌ {vendor} login did not result in a session.")
+                return True
+
+            after = self._cookie_values(context, domain)
+            # Cookies die de login zette of wijzigde. Geen verschil = geen bewijs van een sessie:
+            # niet bewaren, anders geldt een mislukte login SESSION_MAX_AGE lang als geldig
+            auth = sorted(name for name, value in after.items() if before.get(name) != value)
+            if not auth:
+                print(f"  ❌ {vendor} login set no cookies, session not saved.")
+                return True
+            self.save_state(vendor, context, auth)
+            self._count('logins')
+            print(f"  🔐 Saved {vendor} session ({len(auth)} auth cookies).")
+            return True
+
+    def is_valid(self, context, vendor, domain, restore=False):
+        state = self.states.get(vendor)
+        if not state or not state.get('auth_cookies'):
+            return False
+        if time.time() - state.get('saved_at', 0) > Config.SESSION_MAX_AGE:
+            return False
+
+        if restore:
+            context.add_cookies(state['storage_state'].get('cookies', []))
+
+        now = time.time()
+        live = {
+            c['name'] for c in context.cookies()
+            if _matches(c, domain) and (c.get('expires', -1) in (-1, None) or c['expires'] > now)
+        }
+        return all(name in live for name in state['auth_cookies'])
+
+    def load_state(self, vendor):
+        path = self.state_dir / f"{vendor}.json"
+        if vendor not in self.states and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.states[vendor] = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  Could not read session state {path}: {e}")
+        return self.states.get(vendor)
+
+    def save_state(self, vendor, context, auth_cookies):
+        state = {
+            'saved_at': time.time(),
+            'auth_cookies': auth_cookies,
+            'storage_state': context.storage_state(),
+        }
+        self.states[vendor] = state
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self.state_dir / f"{vendor}.json"
+        # Per proces/thread een eigen tmp bestand: shards en workers schrijven tegelijk
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    def auth_cookie_names(self):
+        """Namen van de login cookies van alle bewaarde sessies (nooit als consent cookie bewaren)."""
+        if self.state_dir.exists():
+            for path in self.state_dir.glob('*.json'):
+                self.load_state(path.stem)
+        return {name for state in list(self.states.values()) for name in state.get('auth_cookies') or ()}
+
+    def print_summary(self):
+        if not (self.reused or self.restored or self.logins):
+            return
+        print(f"🔐 Sessions: {self.logins} logins, {self.restored} restored from disk, "
+              f"{self.reused} reused in-context")
+
+    def _vendor_lock(self, vendor):
+        with self.lock:
+            return self.vendor_locks.setdefault(vendor, threading.Lock())
+
+    def _count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @staticmethod
+    def _cookie_values(context, domain):
+        return {c['name']: c['value'] for c in context.cookies() if _matches(c, domain)}
+
+
+def _matches(cookie, domain):
+    """Cookie van domain of een subdomein, met een punt als grens: evilabb.com is geen abb.com."""
+    if not domain:
+        return True
+    cookie_domain = cookie.get('domain', '').lstrip('.').lower()
+    return cookie_domain == domain or cookie_domain.endswith('.' + domain)
+
+
+SESSIONS = SessionManager()
@@ -0,0 +1,124 @@
+import multiprocessing
+import queue
+import time
+from collections import defaultdict
+from .browser import clone_profile
+from .config import Config
+from .frontier import Frontier
+
+
+def _shard_main(index, count, options, results):
+    """Entry point van een shard proces: een volledige ScrapeEngine op één partitie van de frontier."""
+    from .engine import ScrapeEngine
+
+    engine = ScrapeEngine(**options, shard=(index, count))
+    report = engine.run()
+    results.put({"shard": index, **report.totals()})
+
+
+class ShardRunner:
+    """
+    Verdeel de crawl over N processen (elk een eigen Python interpreter + Chromium).
+
+    De frontier wordt één keer gevuld door het hoofdproces; elke shard claimt enkel
+    de domeinen met domain_hash % N == shard, zodat per-domein limieten en sessies
+    binnen één proces blijven. Elke shard krijgt een eigen kopie van het browser
+    profiel. Een shard die crasht wordt herstart (max. Config.SHARD_MAX_RESTARTS);
+    zijn 'in_progress' URLs worden bij de herstart opnieuw ingepland. Geeft de runner
+    een shard op, dan gaan die URLs terug naar pending en blijft de rest van de
+    partitie liggen voor een volgende run met --resume (het aantal wordt gemeld).
+    """
+
+    def __init__(self, engine, shards, run_id):
+        self.engine = engine
+        self.shards = shards
+        self.run_id = run_id
+        self.mp = multiprocessing.get_context("spawn")
+        self.results = self.mp.Queue()
+        self.totals = {}
+        self.restarts = defaultdict(int)
+
+    def _options(self, index):
+        base = self.engine.browser_manager.profile_dir
+        profile = base if index == 0 else clone_profile(base, base.with_name(f"{base.name}_s{index}"))
+        return dict(
+            input_file=self.engine.input_file,
+            output_dir=self.engine.output_dir,
+            headless=self.engine.headless,
+            workers=self.engine.workers,
+            capture_mode=self.engine.capture_mode,
+            fanout=self.engine.fanout_options,
+            run_id=self.run_id,
+            profile_dir=str(profile),
+        )
+
+    def _start(self, index):
+        process = self.mp.Process(
+            target=_shard_main,
+            args=(index, self.shards, self._options(index), self.results),
+            name=f"shard-{index}",
+        )
+        process.start()
+        return process
+
+    def _drain(self):
+        while True:
+            try:
+                totals = self.results.get_nowait()
+            except queue.Empty:
+                return
+            self.totals[totals["shard"]] = totals
+
+    def run(self):
+        print(f"🧩 Starting {self.shards} shard processes ({self.engine.workers} workers each)")
+        started = time.monotonic()
+        running = {index: self._start(index) for index in range(self.shards)}
+
+        while running:
+            time.sleep(1)
+            self._drain()
+            for index, process in list(running.items()):
+                if process.is_alive():
+                    continue
+                del running[index]
+                if process.exitcode == 0:
+                    continue
+                if self.restarts[index] >= Config.SHARD_MAX_RESTARTS:
+                    print(f"  ❌ Shard {index} crashed (exit {process.exitcode}), giving up after "
+                          f"{self.restarts[index]} restarts.")
+                    self._give_up(index)
+                    continue
+                self.restarts[index] += 1
+                print(f"  ♻️  Shard {index} crashed (exit {process.exitcode}), restart {self.restarts[index]}...")
+                running[index] = self._start(index)
+
+        self._drain()
+        self.print_summary(time.monotonic() - started)
+
+    def _give_up(self, index):
+        """Zet de 'in_progress' URLs van een opgegeven shard terug op pending en meld wat blijft liggen."""
+        frontier = Frontier(shard=(index, self.shards), run_id=self.run_id)
+        try:
+            requeued = frontier.requeue_interrupted()
+            pending = frontier.status_counts().get("pending", 0)
+        finally:
+            frontier.close()
+        print(f"     ↪️  Shard {index}: {requeued} in-progress URLs requeued, "
+              f"{pending} pending URLs left for --resume")
+
+    def print_summary(self, elapsed):
+        print(f"\n🧩 Shard summary ({elapsed:.1f}s wall time):")
+        total = 0
+        for index in range(self.shards):
+            stats = self.totals.get(index)
+            restarts = f", {self.restarts[index]} restarts" if self.restarts[index] else ""
+            if not stats:
+                print(f"   ▪ shard {index}: no report (crashed){restarts}")
+                continue
+            pages = stats["ok"] + stats["failed"]
+            total += pages
+            per_min = pages / stats["elapsed"] * 60 if stats["elapsed"] > 0 else 0.0
+            print(f"   ▪ shard {index}: {stats['ok']} ok, {stats['failed']} failed, "
+                  f"{per_min:.1f} pages/min{restarts}")
+        if elapsed > 0:
+            print(f"   ▪ total: {total} pages, {total / elapsed * 60:.1f} pages/min")
@@ -0,0 +1,207 @@
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from .config import Config
+from utils.file_ops import safe_filename_from_url
+from utils.vendor_specs import vendor_for_url
+
+
+def start_tracing(context):
+    """
+    Start één Playwright trace op de context (na elke launch/recycle). Per pagina
+    wordt daarna enkel een chunk gestart en gestopt: zonder pad wordt die niet
+    weggeschreven, wat op snelle pagina's nagenoeg niets kost.
+    """
+    if not Config.TRACING:
+        return
+    try:
+        context.tracing.start(
+            screenshots=Config.TRACE_SCREENSHOTS, snapshots=Config.TRACE_SNAPSHOTS, sources=False
+        )
+    except Exception as e:
+        print(f"  ⚠️  Could not start tracing: {e}")
+
+
+class HarRecorder:
+    """
+    Minimale HAR 1.2 van de requests van één pagina (zonder bodies). De request objecten
+    worden enkel bijgehouden; de HAR wordt pas opgebouwd als de trace bewaard wordt.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.requests = []
+        self.failures = {}
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._failed)
+
+    def _finished(self, request):
+        self.requests.append(request)
+
+    def _failed(self, request):
+        self.requests.append(request)
+        self.failures[id(request)] = request.failure
+
+    def stop(self):
+        self.page.remove_listener("requestfinished", self._finished)
+        self.page.remove_listener("requestfailed", self._failed)
+
+    def build(self):
+        entries = []
+        for request in self.requests:
+            try:
+                timing = request.timing
+                response = None if id(request) in self.failures else request.response()
+                started = timing.get("startTime", 0) / 1000
+                waited = max(0.0, timing.get("responseStart", 0) - max(timing.get("requestStart", 0), 0))
+                total = max(0.0, timing.get("responseEnd", 0))
+                entries.append({
+                    "startedDateTime": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(started)) + "Z",
+                    "time": round(total, 1),
+                    "request": {
+                        "method": request.method, "url": request.url, "httpVersion": "",
+                        "headers": [{"name": k, "value": v} for k, v in request.headers.items()],
+                        "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1,
+                    },
+                    "response": {
+                        "status": response.status if response else 0,
+                        "statusText": response.status_text if response else (self.failures.get(id(request)) or ""),
+                        "httpVersion": "", "cookies": [], "redirectURL": "", "headersSize": -1, "bodySize": -1,
+                        "headers": [{"name": k, "value": v} for k, v in (response.headers if response else {}).items()],
+                        "content": {"size": -1, "mimeType": (response.headers.get("content-type", "") if response else "")},
+                    },
+                    "cache": {},
+                    "timings": {"send": 0, "wait": round(waited, 1), "receive": 0},
+                    "_resourceType": request.resource_type,
+                })
+            except Exception:
+                continue
+        return {"log": {"version": "1.2", "creator": {"name": "PyScraper", "version": "1"}, "entries": entries}}
+
+
+class PageTrace:
+    def __init__(self, url, context, page):
+        self.url = url
+        self.vendor = vendor_for_url(url) or "unknown"
+        self.context = context
+        self.started = time.monotonic()
+        self.har = HarRecorder(page) if Config.TRACE_HAR else None
+
+
+class TraceKeeper:
+    """
+    Sampled tracing: elke pagina krijgt een trace chunk, maar die wordt enkel bewaard
+    (Config.TRACE_DIR) als de pagina faalde of trager was dan
+    max(TRACE_SLOW_SECONDS, TRACE_SLOW_FACTOR x mediaan van de vendor).
+    De map wordt begrensd op TRACE_MAX_MB (oudste traces eerst weg).
+    Bekijken: `playwright show-trace <bestand>.zip`.
+    """
+
+    def __init__(self, trace_dir=None):
+        self.trace_dir = str(trace_dir or Config.TRACE_DIR)
+        self.lock = threading.Lock()
+        self.durations = defaultdict(lambda: deque(maxlen=200))
+        self.kept = defaultdict(int)
+        self.discarded = 0
+        self.traced = 0
+        self.overhead = 0.0  # s in start_chunk/stop_chunk (de synchrone kost per pagina)
+
+    def begin(self, context, page, url):
+        if not Config.TRACING:
+            return None
+        started = time.monotonic()
+        try:
+            context.tracing.start_chunk(title=url)
+        except Exception:
+            # Tracing niet actief op deze context (bv. start mislukt)
+            return None
+        self._charge(started, pages=1)
+        return PageTrace(url, context, page)
+
+    def _charge(self, started, pages=0):
+        with self.lock:
+            self.overhead += time.monotonic() - started
+            self.traced += pages
+
+    def overhead_ms(self):
+        """Gemiddelde tracing kost per pagina (ms); het wegschrijven van bewaarde traces telt niet mee."""
+        with self.lock:
+            return self.overhead / self.traced * 1000 if self.traced else 0.0
+
+    def end(self, trace, ok):
+        """Chunk afsluiten: bewaren bij een fout of trage pagina, anders weggooien."""
+        if trace is None:
+            return None
+        seconds = time.monotonic() - trace.started
+        reason = "failed" if not ok else ("slow" if seconds > self._threshold(trace.vendor) else None)
+        with self.lock:
+            self.durations[trace.vendor].append(seconds)
+        if trace.har:
+            trace.har.stop()
+
+        if reason is None:
+            started = time.monotonic()
+            try:
+                trace.context.tracing.stop_chunk()
+            except Exception:
+                pass
+            self._charge(started)
+            with self.lock:
+                self.discarded += 1
+            return None
+
+        os.makedirs(self.trace_dir, exist_ok=True)
+        stem = f"{time.strftime('%Y%m%d_%H%M%S')}_{reason}_{safe_filename_from_url(trace.url)[:-len('.html')][:120]}"
+        path = os.path.join(self.trace_dir, f"{stem}.zip")
+        try:
+            trace.context.tracing.stop_chunk(path=path)
+            if trace.har:
+                with open(os.path.join(self.trace_dir, f"{stem}.har"), "w", encoding="utf-8") as f:
+                    json.dump(trace.har.build(), f)
+        except Exception as e:
+            print(f"  ⚠️  Could not save trace: {e}")
+            return None
+        with self.lock:
+            self.kept[reason] += 1
+        print(f"  🎞️  Trace kept ({reason}, {seconds:.1f}s): {path}")
+        self._prune()
+        return path
+
+    def print_summary(self):
+        kept = sum(self.kept.values())
+        if not (kept or self.discarded):
+            return
+        print(f"🎞️  Traces: {kept} kept ({self.kept['failed']} failed, {self.kept['slow']} slow), "
+              f"{self.discarded} discarded, ~{self.overhead_ms():.0f} ms/page tracing overhead -> {self.trace_dir}")
+
+    def _threshold(self, vendor):
+        with self.lock:
+            history = list(self.durations[vendor])
+        if len(history) < Config.TRACE_MIN_SAMPLES:
+            return Config.TRACE_SLOW_SECONDS
+        return max(Config.TRACE_SLOW_SECONDS, Config.TRACE_SLOW_FACTOR * statistics.median(history))
+
+    def _prune(self):
+        """Oudste bestanden verwijderen tot de map onder TRACE_MAX_MB zit."""
+        with self.lock:
+            try:
+                files = [os.path.join(self.trace_dir, name) for name in os.listdir(self.trace_dir)]
+                files = sorted((os.path.getmtime(p), os.path.getsize(p), p) for p in files if os.path.isfile(p))
+            except OSError:
+                return
+            total = sum(size for _, size, _ in files)
+            limit = Config.TRACE_MAX_MB * 1024 * 1024
+            for _, size, path in files:
+                if total <= limit:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
+
+
+TRACES = TraceKeeper()
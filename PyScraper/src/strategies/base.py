@@ -2,93 +2,184 @@ import time
 import random
 # BELANGRIJK: Gebruik een absolute import, geen '..'
 from core.config import Config
+from core.readiness import Ready, wait_for
+from core.metrics import phase, timed
+from core.session import SESSIONS
+from core.pacing import PACER
+from .routing import ROUTING_PROFILES
+from .consent import CONSENT
+from .fragments import capture_html
+from .scrolling import SCROLL_STATS, adaptive_scroll, legacy_scroll_seconds, rules_present
+from utils.vendor_specs import vendor_for_url, required_rules
 
 class BaseStrategy:
+    # Welke requests deze vendor niet nodig heeft (zie routing.py)
+    ROUTING = ROUTING_PROFILES['default']
+
+    # Readiness predicaten (naam -> Ready). Subclasses breiden dit uit.
+    READINESS = {
+        'content': Ready.function("() => document.readyState !== 'loading' && !!document.body && document.body.childElementCount > 0"),
+    }
+
+    # Vendor specifieke cookie knoppen, vóór de generieke geprobeerd (zie consent.py)
+    CONSENT_SELECTORS = []
+
+    # Login sessie (zie core/session.py): sectie in credentials.ini + cookie domein.
+    # None = deze vendor heeft geen login.
+    SESSION_VENDOR = None
+    SESSION_DOMAIN = None
+
+    def __init__(self):
+        # Extra output naast de HTML (naam -> JSON-serialiseerbare data), bewaard door de engine
+        self.artifacts = {}
+        self.capture_mode = Config.CAPTURE_MODE
+        # Optionele SnapshotWriter (gezet door de engine) voor multi-page captures
+        self.writer = None
+        self._stream_parts = []
+        # Optionele UrlMetrics (gezet door de engine): tijd per fase, zie core/metrics.py
+        self.metrics = None
+
     def execute(self, page, url):
         """Template methode: Navigeren -> Acties -> Scrollen -> Extracten"""
         print(f"  📡 Navigating to {url}")
         
         try:
-            page.goto(url, wait_until='networkidle', timeout=Config.TIMEOUT_PAGE_LOAD)
+            self.navigate(page, url, wait_until='networkidle')
         except Exception as e:
             print(f"  ⚠️  Navigation warning (might be timeout): {e}")
         
-        # Helper delays
-        self.random_delay()
+        # Wacht tot er content is i.p.v. een vaste delay
+        self.wait_ready(page, 'content', legacy_ms=1550)
 
         # ✨ NIEUW: Cookies accepteren indien aanwezig
         self.accept_cookies(page)
 
         # Site specifieke acties (override in child classes)
-        self.perform_actions(page)
+        with self.phase('actions'):
+            self.perform_actions(page)
         
         # Altijd scrollen voor lazy loading
-        self.random_delay() # Extra delay voor scrollen
         self.scroll_to_bottom(page)
         
         # HTML ophalen
         print("  📄 Extracting outerHTML...")
-        return page.evaluate("() => document.documentElement.outerHTML")
+        return self.capture_html(page)
+
+    def navigate(self, page, url, wait_until='domcontentloaded'):
+        """
+        page.goto met per-domein pacing en een adaptieve timeout (zie core/pacing.py).
+        De laadtijd en status gaan terug naar de pacer. Geeft de response (of None).
+        """
+        with self.phase('pacing'):
+            PACER.acquire(url)
+        timeout = PACER.timeout_ms(url, wait_until)
+        started = time.monotonic()
+        try:
+            with self.phase('navigate'):
+                response = page.goto(url, wait_until=wait_until, timeout=timeout)
+        except Exception as e:
+            if type(e).__name__ == 'TimeoutError':
+                PACER.record(url, timeout_ms=timeout, wait_until=wait_until)
+            raise
+        PACER.record(
+            url, time.monotonic() - started, response.status if response else None,
+            response.headers.get('retry-after') if response else None, wait_until=wait_until,
+        )
+        return response
+
+    @timed('snapshot')
+    def capture_html(self, page):
+        """Volledige outerHTML, of enkel de spec-fragmenten in 'fragments' capture modus."""
+        return capture_html(page, self.capture_mode)
+
+    def emit(self, fragment):
+        """Voeg een stuk HTML toe aan de output (direct naar schijf als er een writer is)."""
+        if self.writer:
+            self.writer.write(fragment)
+        else:
+            self._stream_parts.append(fragment)
+
+    def finish(self, tail=''):
+        """Sluit de output af. Geeft een StreamedSnapshot (writer) of de volledige HTML string."""
+        if self.writer:
+            return self.writer.close(tail)
+        html = "".join(self._stream_parts) + tail
+        self._stream_parts = []
+        return html
+
+    def phase(self, name):
+        """Context manager die de tijd van een stuk code als fase 'name' meet (zie core/metrics.py)."""
+        return phase(self.metrics, name)
 
     def perform_actions(self, page):
         """Override deze methode in subclasses voor kliks etc."""
         pass
 
+    @timed('login')
+    def ensure_session(self, page):
+        """
+        Log in via de gedeelde SessionManager: één keer per vendor, daarna hergebruik.
+        Geeft True als er een login flow doorlopen is.
+        """
+        if not self.SESSION_VENDOR:
+            return False
+        return SESSIONS.ensure(page, self)
+
+    def login(self, page, credentials):
+        """Vendor specifieke login flow (override in subclasses met SESSION_VENDOR)."""
+        pass
+
+    def is_logged_in(self, page):
+        """True/False als de pagina dat kan tonen, None als onbekend."""
+        return None
+
+    @timed('cookies')
     def accept_cookies(self, page):
         """
-        Probeert automatisch cookies te accepteren via bekende selectors.
-        Kan overschreven worden voor specifieke sites.
+        Klik een cookie banner weg via de ConsentResolver (één gecombineerde check,
+        geheugen per domein). Vendors geven hun eigen knoppen via CONSENT_SELECTORS.
         """
         print("  🍪 Checking for cookie banners...")
-        
-        # Veelvoorkomende cookie accept buttons (OneTrust, Cookiebot, etc.)
-        cookie_selectors = [
-            "#onetrust-accept-btn-handler",                           # OneTrust
-            "#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll", # Cookiebot
-            ".cc-btn.cc-allow",                                       # CookieConsent
-            "button[data-testid='uc-accept-all-button']",             # Usercentrics
-            "button.cm__btn.cm__btn--primary",                        # Custom (o.a. Siemens/Sommige shops)
-            "a.cc-btn.cc-dismiss",
-            "[aria-label='Accept all cookies']",
-            "button:has-text('Alles accepteren')",
-            "button:has-text('Agree and Close')",
-            "button:has-text('Accept All')",
-            "button:has-text('Alle akzeptieren')"
-        ]
-        
-        for selector in cookie_selectors:
-            try:
-                # Korte timeout om niet te lang te wachten als er niets is (1s)
-                if page.is_visible(selector, timeout=1000):
-                    print(f"     ✓ Clicking generic cookie button: {selector}")
-                    page.click(selector)
-                    self.random_delay(1500, 2500) # Even wachten tot banner weg zakt/reload
-                    return
-            except Exception:
-                continue
+        try:
+            CONSENT.resolve(page, self.CONSENT_SELECTORS)
+        except Exception as e:
+            print(f"  ⚠️  Cookie warning: {e}")
+
+    @timed('wait', inherit=True)
+    def wait_ready(self, page, *checks, legacy_ms=0, poll_ms=None, timeout=None):
+        """
+        Wacht event-driven op readiness predicaten.
+        checks zijn namen uit READINESS of losse Ready objecten.
+        """
+        resolved = []
+        for check in checks:
+            if isinstance(check, str):
+                check = self.READINESS.get(check)
+            if check is not None:
+                resolved.append(check)
+        label = ", ".join(c if isinstance(c, str) else repr(c) for c in checks)
+        return wait_for(page, resolved, label, legacy_ms=legacy_ms, poll_ms=poll_ms, timeout=timeout)
 
     def random_delay(self, min_ms=800, max_ms=2300):
         time.sleep(random.uniform(min_ms/1000, max_ms/1000))
 
-    def scroll_to_bottom(self, page):
+    @timed('scroll')
+    def scroll_to_bottom(self, page, skip_if_complete=True):
+        """
+        Adaptieve scroll voor lazy loading (zie scrolling.py).
+        Overgeslagen als de 'fetch.require' content van de vendor al in de DOM staat.
+        """
+        if skip_if_complete and rules_present(page, required_rules(vendor_for_url(page.url))):
+            height = page.evaluate("() => (document.scrollingElement || document.documentElement).scrollHeight")
+            SCROLL_STATS.record(0.0, legacy_scroll_seconds(height), skipped=True)
+            print("  📜 Spec content already present, skipping scroll.")
+            return
+
         print("  📜 Scrolling...")
-        # Simpele 'smooth scroll' implementatie
-        page.evaluate(f"""
-            async () => {{
-                await new Promise((resolve) => {{
-                    let totalHeight = 0;
-                    let distance = {Config.SCROLL_STEP};
-                    let timer = setInterval(() => {{
-                        let scrollHeight = document.body.scrollHeight;
-                        window.scrollBy(0, distance);
-                        totalHeight += distance;
-                        if(totalHeight >= scrollHeight){{
-                            clearInterval(timer);
-                            window.scrollTo(0, 0);
-                            resolve();
-                        }}
-                    }}, {Config.SCROLL_DELAY});
-                }});
-            }}
-        """)
-        self.random_delay(1000, 1500)
+        result = adaptive_scroll(page)
+        seconds = result["ms"] / 1000
+        legacy = legacy_scroll_seconds(result["height"])
+        SCROLL_STATS.record(seconds, legacy)
+        note = " (max scroll time reached)" if result["timedOut"] else ""
+        print(f"     {result['height']}px in {result['jumps']} jumps, {seconds:.1f}s "
+              f"vs ~{legacy:.1f}s fixed-step{note}")
@@ -0,0 +1,202 @@
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse
+from core.config import Config
+from core.session import SESSIONS
+
+# Veelvoorkomende cookie accept buttons (OneTrust, Cookiebot, ...). Playwright CSS:
+# ':has-text' is hoofdletterongevoelig en open shadow roots (Usercentrics) worden doorzocht.
+GENERIC_SELECTORS = [
+    "#onetrust-accept-btn-handler",                           # OneTrust
+    "#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll", # Cookiebot
+    ".cc-btn.cc-allow",                                       # CookieConsent
+    "button[data-testid='uc-accept-all-button']",             # Usercentrics
+    "button.cm__btn.cm__btn--primary",                        # Custom (o.a. Siemens/Sommige shops)
+    "a.cc-btn.cc-dismiss",
+    "[aria-label='Accept all cookies']",
+    "button:has-text('Alles accepteren')",
+    "button:has-text('Agree and Close')",
+    "button:has-text('Accept All')",
+    "button:has-text('Alle akzeptieren')",
+]
+
+
+def consent_domain(url):
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+class ConsentResolver:
+    """
+    Cookie banners wegklikken met geheugen per domein.
+
+    - Alle bekende selectors in één gecombineerde wait i.p.v. één timeout per selector
+    - Per domein onthouden welke selector werkte en welke consent cookies de klik zette:
+      enkel cookies met een CMP naam (Config.CONSENT_COOKIE_PATTERNS) en nooit login cookies
+      van de session store, ook al wijzigden andere cookies tijdens de klik
+    - Die cookies worden vóór de navigatie in de context gezet (preseed), zodat
+      een volgend bezoek (ook met een ander profiel) geen banner meer krijgt
+    - Domeinen waar de laatste bezoeken geen banner verscheen krijgen een korte wait
+    - De state file wordt enkel bij een wijziging geschreven en gedeeld met andere shard
+      processen: vóór het schrijven wordt de file opnieuw gelezen en enkel dit domein
+      aangepast
+    """
+
+    def __init__(self, state_path=None):
+        self.state_path = state_path or Config.CONSENT_STATE_PATH
+        self.lock = threading.Lock()
+        self.state = None
+        self.skipped = 0
+        self.clicked = 0
+        self.none = 0
+
+    def preseed(self, context, url):
+        """Zet de onthouden consent cookies van dit domein in de context (indien ontbrekend)."""
+        memory = self._memory(consent_domain(url))
+        # Ook state van vóór de filter kan sessie cookies bevatten: die niet meer zetten
+        cookies = consent_cookies(memory.get("cookies") or [])
+        if not cookies:
+            return
+        present = {(c["name"], c.get("domain")) for c in context.cookies()}
+        now = time.time()
+        missing = [
+            c for c in cookies
+            if (c["name"], c.get("domain")) not in present
+            and (c.get("expires", -1) in (-1, None) or c["expires"] > now)
+        ]
+        if missing:
+            context.add_cookies(missing)
+
+    def resolve(self, page, selectors=None):
+        """
+        Klik de consent banner weg als die er is.
+
+        Args:
+            selectors: vendor specifieke selectors, worden vóór de generieke geprobeerd
+
+        Returns:
+            str | None: de selector die geklikt werd
+        """
+        domain = consent_domain(page.url)
+        memory = self._memory(domain)
+        candidates = list(dict.fromkeys([memory.get("handler")] + list(selectors or []) + GENERIC_SELECTORS))
+        candidates = [c for c in candidates if c]
+        combined = ", ".join(candidates)
+
+        names = {c["name"] for c in consent_cookies(memory.get("cookies") or [])}
+        present = {c["name"] for c in page.context.cookies() if _on_domain(c, domain)}
+        quiet = memory.get("no_banner", 0) >= Config.CONSENT_NO_BANNER_VISITS
+        if names and names <= present:
+            # Consent staat al in het profiel: enkel een directe check
+            if not page.locator(combined).first.is_visible():
+                self._count("skipped")
+                return None
+            timeout = 0
+        elif quiet:
+            # Dit domein toonde de laatste bezoeken geen banner: korte wait i.p.v. de volle timeout
+            timeout = Config.CONSENT_QUICK_TIMEOUT
+        else:
+            timeout = Config.CONSENT_TIMEOUT
+
+        try:
+            if timeout:
+                page.wait_for_selector(combined, state="visible", timeout=timeout)
+        except Exception:
+            if quiet:
+                self._count("skipped")
+                return None
+            self._count("none")
+            self._remember(domain, no_banner=memory.get("no_banner", 0) + 1)
+            return None
+
+        for selector in candidates:
+            button = page.locator(selector).first
+            try:
+                if not button.is_visible():
+                    continue
+                before = {c["name"]: c["value"] for c in page.context.cookies() if _on_domain(c, domain)}
+                print(f"     ✓ Clicking cookie button: {selector}")
+                button.click()
+                try:
+                    page.wait_for_selector(selector, state="hidden", timeout=5000)
+                except Exception:
+                    pass
+                cookies = consent_cookies(
+                    c for c in page.context.cookies()
+                    if _on_domain(c, domain) and before.get(c["name"]) != c["value"]
+                )
+                self._count("clicked")
+                self._remember(domain, handler=selector, cookies=cookies, no_banner=0)
+                return selector
+            except Exception:
+                continue
+        return None
+
+    def print_summary(self):
+        if not (self.skipped or self.clicked or self.none):
+            return
+        print(f"🍪 Consent: {self.clicked} banners clicked, {self.skipped} skipped (remembered), "
+              f"{self.none} pages without banner")
+
+    def _memory(self, domain):
+        with self.lock:
+            if self.state is None:
+                self.state = self._load()
+            return dict(self.state.get(domain) or {})
+
+    def _remember(self, domain, **values):
+        """Pas de state van een domein aan; enkel schrijven als er echt iets wijzigt."""
+        with self.lock:
+            if self.state is None:
+                self.state = self._load()
+            if not values.get("cookies"):
+                values.pop("cookies", None)
+            entry = {**(self.state.get(domain) or {}), **values}
+            if entry == self.state.get(domain):
+                return
+            # Opnieuw lezen: andere shard processen kunnen intussen andere domeinen bewaard hebben
+            self.state = self._load()
+            self.state[domain] = {**(self.state.get(domain) or {}), **values}
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp = f"{self.state_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp, self.state_path)
+
+    def _load(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  Could not read consent state {self.state_path}: {e}")
+            return {}
+
+    def _count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def consent_cookies(cookies):
+    """Enkel de cookies die een CMP zet (Config.CONSENT_COOKIE_PATTERNS), zonder login cookies."""
+    auth = SESSIONS.auth_cookie_names()
+    return [
+        c for c in cookies
+        if c["name"] not in auth
+        and any(re.search(pattern, c["name"], re.IGNORECASE) for pattern in Config.CONSENT_COOKIE_PATTERNS)
+    ]
+
+
+def _on_domain(cookie, domain):
+    """Cookie hoort bij domain (of een subdomein ervan), met een punt als grens: badabb.com is geen abb.com."""
+    cookie_domain = cookie.get("domain", "").lstrip(".").lower()
+    if not cookie_domain:
+        return False
+    return f".{domain}".endswith(f".{cookie_domain}") or f".{cookie_domain}".endswith(f".{domain}")
+
+
+CONSENT = ConsentResolver()
@@ -0,0 +1,88 @@
+import random
+from core.config import Config
+from utils.vendor_specs import vendor_for_url, fragment_selectors, needs_inline_scripts
+
+# Bouwt een minimaal geldig document: <head> essentials + alleen de elementen die
+# MSE leest (in documentvolgorde, zonder geneste dubbels). Headings gaan mee omdat
+# nearest_heading() de sectienaam uit de voorafgaande h1-h6 haalt.
+_FRAGMENT_JS = """({selectors, inlineScripts}) => {
+    const picked = new Set();
+    const add = (el) => { if (el) picked.add(el); };
+
+    for (const sel of selectors.concat(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])) {
+        try { document.querySelectorAll(sel).forEach(add); } catch (e) { /* ongeldige selector */ }
+    }
+    if (inlineScripts) {
+        document.querySelectorAll('script:not([src])').forEach(s => {
+            if (/var\\s+model\\s*=/.test(s.textContent)) add(s);
+        });
+    }
+
+    // Alleen top-level elementen; geneste matches zitten al in hun voorouder
+    const tops = [...picked].filter(el => {
+        for (let p = el.parentElement; p; p = p.parentElement) if (picked.has(p)) return false;
+        return true;
+    });
+    tops.sort((a, b) => a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1);
+
+    const head = [];
+    document.querySelectorAll(
+        'head > title, head > base, link[rel="canonical"], meta[name], meta[property], meta[charset], script[type="application/ld+json"]'
+    ).forEach(el => head.push(el.outerHTML));
+
+    const lang = document.documentElement.getAttribute('lang') || '';
+    return '<!DOCTYPE html><html' + (lang ? ` lang="${lang}"` : '') + '><head>' + head.join('') +
+           '</head><body>' + tops.map(el => el.outerHTML).join('\\n') + '</body></html>';
+}"""
+
+
+def capture_fragment_html(page, selectors, inline_scripts=False):
+    return page.evaluate(_FRAGMENT_JS, {"selectors": selectors, "inlineScripts": inline_scripts})
+
+
+def capture_html(page, mode="full"):
+    """
+    Haal de HTML van de huidige pagina op.
+
+    In 'fragments' modus enkel wat de vendor specs uit Vendor_YML.yaml nodig hebben.
+    Vendors zonder bruikbare specs (generic, label_value, ...) krijgen de volledige pagina.
+    Op een sample (Config.FRAGMENT_VERIFY_RATE) wordt de MSE output van fragment en
+    volledige pagina vergeleken.
+    """
+    def full():
+        return page.evaluate("() => document.documentElement.outerHTML")
+
+    if mode != "fragments":
+        return full()
+
+    vendor = vendor_for_url(page.url)
+    selectors = fragment_selectors(vendor)
+    if selectors is None:
+        return full()
+
+    fragment = capture_fragment_html(page, selectors, needs_inline_scripts(vendor))
+
+    if random.random() < Config.FRAGMENT_VERIFY_RATE:
+        full_html = full()
+        if verify_fragment(fragment, full_html) is False:
+            # Fragment mist iets: deze pagina volledig bewaren
+            return full_html
+    return fragment
+
+
+def verify_fragment(fragment, full_html):
+    """Vergelijk MSE output op fragment vs volledige pagina en log het resultaat."""
+    from utils.mse_bridge import compare_mse_output
+
+    try:
+        equal, diffs = compare_mse_output(fragment, full_html)
+    except Exception as e:
+        print(f"     ⚠️ Fragment verification skipped: {e}")
+        return None
+
+    ratio = len(fragment) / max(len(full_html), 1)
+    if equal:
+        print(f"     🔬 Fragment verified: MSE output identical ({ratio:.0%} of full size)")
+    else:
+        print(f"     ❗ Fragment MISMATCH vs full page in: {', '.join(map(str, diffs))}")
+    return equal
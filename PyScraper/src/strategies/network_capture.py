@@ -0,0 +1,222 @@
+import json
+import math
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+# Veelgebruikte namen voor paginatie parameters in XHR/fetch API's
+PAGE_SIZE_KEYS = ("pageSize", "pagesize", "size", "limit", "top", "rows", "itemsPerPage", "perPage")
+OFFSET_KEYS = ("offset", "skip", "start", "from")
+PAGE_KEYS = ("page", "pageIndex", "pageNumber", "currentPage", "pageNo")
+TOTAL_KEYS = ("total", "totalCount", "totalResults", "totalItems", "numberOfResults", "totalNumberOfResults")
+
+# Headers die fetch() in de browser zelf zet (of weigert)
+_SKIP_HEADERS = {"content-length", "host", "cookie", "connection", "accept-encoding", "origin", "referer"}
+
+_REPLAY_JS = """async (requests) => Promise.all(requests.map(async (r) => {
+    try {
+        const res = await fetch(r.url, {method: r.method, headers: r.headers, body: r.body, credentials: 'include'});
+        return {url: r.url, status: res.status, data: res.ok ? await res.json() : null};
+    } catch (e) {
+        return {url: r.url, status: 0, data: null, error: String(e)};
+    }
+}))"""
+
+
+def largest_item_list(data):
+    """Zoek recursief de langste lijst van objecten in een JSON response (= de items)."""
+    best = []
+    if isinstance(data, list):
+        if data and all(isinstance(x, dict) for x in data):
+            best = data
+        for x in data:
+            found = largest_item_list(x)
+            if len(found) > len(best):
+                best = found
+    elif isinstance(data, dict):
+        for value in data.values():
+            found = largest_item_list(value)
+            if len(found) > len(best):
+                best = found
+    return best
+
+
+def _find_key(data, keys):
+    """Geef (dict, key) voor de eerste key uit keys in een (geneste) dict."""
+    if isinstance(data, dict):
+        for key in keys:
+            if key in data and isinstance(data[key], (int, str)) and str(data[key]).isdigit():
+                return data, key
+        for value in data.values():
+            found = _find_key(value, keys)
+            if found:
+                return found
+    return None
+
+
+class JsonResponseCapture:
+    """
+    Luistert naar XHR/fetch responses met JSON en bewaart ze.
+    De body wordt pas na afloop gelezen (niet in de event handler zelf).
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.responses = []
+        self._records = {}  # index -> gelezen record (bodies maar één keer ophalen)
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        self.responses.append(response)
+
+    def stop(self):
+        self.page.remove_listener("response", self._on_response)
+
+    def collect(self, start=0):
+        """Lees de bodies vanaf index start. Geeft een lijst van {url, method, post_data, headers, data}."""
+        for i, response in enumerate(self.responses):
+            if i in self._records:
+                continue
+            try:
+                data = response.json()
+            except Exception:
+                self._records[i] = None
+                continue
+            request = response.request
+            self._records[i] = {
+                "url": response.url,
+                "method": request.method,
+                "post_data": request.post_data,
+                "headers": {k: v for k, v in request.headers.items() if k.lower() not in _SKIP_HEADERS},
+                "status": response.status,
+                "data": data,
+            }
+        return [self._records[i] for i in range(start, len(self.responses)) if self._records.get(i)]
+
+
+def pagination_record(records):
+    """De paginatie call = de response met de meeste items."""
+    best, best_len = None, 0
+    for record in records:
+        n = len(largest_item_list(record["data"]))
+        if n > best_len:
+            best, best_len = record, n
+    return best
+
+
+class PagedReplay:
+    """
+    Speelt een gecapturede paginatie request opnieuw af vanuit de page context
+    (zelfde cookies/sessie), met een grotere page size en meerdere pagina's tegelijk.
+    """
+
+    def __init__(self, record, page_size, concurrency):
+        self.record = record
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.query = parse_qs(urlparse(record["url"]).query)
+        self.body = None
+        if record.get("post_data"):
+            try:
+                self.body = json.loads(record["post_data"])
+            except ValueError:
+                self.body = None
+
+    def _locate(self, keys):
+        """Zoek een parameter in querystring of JSON body. Geeft ('query'|'body', container, key)."""
+        for key in keys:
+            if key in self.query and self.query[key][0].isdigit():
+                return "query", self.query, key
+        found = _find_key(self.body, keys) if self.body else None
+        if found:
+            return "body", found[0], found[1]
+        return None
+
+    def supported(self):
+        return self._locate(PAGE_SIZE_KEYS) is not None and (
+            self._locate(OFFSET_KEYS) is not None or self._locate(PAGE_KEYS) is not None
+        )
+
+    def _build(self, overrides):
+        """Maak een request spec met aangepaste parameters."""
+        query = {k: list(v) for k, v in self.query.items()}
+        body = json.loads(json.dumps(self.body)) if self.body is not None else None
+
+        for keys, value in overrides:
+            where = self._locate(keys)
+            if not where:
+                continue
+            kind, container, key = where
+            if kind == "query":
+                query[key] = [str(value)]
+            else:
+                target = _find_key(body, (key,))
+                if target:
+                    target[0][key] = value if isinstance(container[key], int) else str(value)
+
+        parts = urlparse(self.record["url"])
+        url = urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+        return {
+            "url": url,
+            "method": self.record["method"],
+            "headers": self.record["headers"],
+            "body": json.dumps(body) if body is not None else None,
+        }
+
+    def _page_requests(self, first, count):
+        offset = self._locate(OFFSET_KEYS)
+        if offset:
+            return [self._build([(PAGE_SIZE_KEYS, self.page_size), (OFFSET_KEYS, (first + i) * self.page_size)])
+                    for i in range(count)]
+
+        # Page-index paginatie: de gecapturede call was pagina 2 -> basis index = waarde - 1
+        kind, container, key = self._locate(PAGE_KEYS)
+        base = int(container[key][0] if kind == "query" else container[key]) - 1
+        return [self._build([(PAGE_SIZE_KEYS, self.page_size), (PAGE_KEYS, base + first + i)])
+                for i in range(count)]
+
+    def run(self, page, max_pages=100):
+        """
+        Haal alle pagina's op. Geeft de samengevoegde items lijst, of None als het mislukt.
+        """
+        total_loc = _find_key(self.record["data"], TOTAL_KEYS)
+        total = int(total_loc[0][total_loc[1]]) if total_loc else None
+
+        items = []
+        next_page = 0
+        while True:
+            if total is not None:
+                remaining = math.ceil(total / self.page_size) - next_page
+                if remaining <= 0:
+                    break
+                batch = min(self.concurrency, remaining)
+            else:
+                batch = self.concurrency
+
+            results = page.evaluate(_REPLAY_JS, self._page_requests(next_page, batch))
+            next_page += batch
+
+            short_page = False
+            for result in results:
+                if result["status"] != 200 or result["data"] is None:
+                    print(f"     ⚠️ Replay request failed ({result['status']}): {result['url'][:100]}")
+                    return None
+                page_items = largest_item_list(result["data"])
+                if short_page and page_items:
+                    # Korte pagina gevolgd door nog items: server negeert onze page size
+                    print("     ⚠️ Server caps the page size, replay not reliable.")
+                    return None
+                items.extend(page_items)
+                if len(page_items) < self.page_size:
+                    short_page = True
+
+            if (short_page and total is None) or next_page >= max_pages:
+                break
+
+        if total is not None and len(items) < total:
+            # Bv. total 150 in één replay pagina van 200, maar de server gaf er 20: afgekapt
+            print(f"     ⚠️ Replay returned {len(items)} of {total} items, replay not reliable.")
+            return None
+        return items
@@ -1,58 +1,77 @@
 import time
-import configparser
+from urllib.parse import urlparse, parse_qsl, urlencode
 from playwright.sync_api import Page
 from .base import BaseStrategy
+from .routing import ROUTING_PROFILES, apply_routing
 from core.config import Config
+from core.readiness import Ready
+from core.metrics import timed
+from core.pacing import PACER
+
+_PRICES_RENDERED_JS = """() => {
+    const prices = document.querySelectorAll('sh-product-price');
+    if (prices.length === 0) return true;  // Geen prijs componenten: niets om op te wachten
+    for (const el of prices) {
+        if (el.shadowRoot && el.shadowRoot.textContent.trim().length > 0) return true;
+    }
+    return false;
+}"""
+
+# Resultaten van de huidige lijstpagina (zonder paginatie, anders komt die TIG keer voor)
+_RESULTS_JS = """() => {
+    const container = document.querySelector('#se-result');
+    if (!container) return null;
+    const clone = container.cloneNode(true);
+    clone.querySelectorAll('.se-pagination').forEach(e => e.remove());
+    return {html: clone.innerHTML, count: clone.querySelectorAll('article.se-result-pos').length};
+}"""
+
+# Paginanummer -> absolute href van alle paginatie links
+_PAGE_LINKS_JS = """() => {
+    const links = {};
+    document.querySelectorAll('a[data-se-page-number]').forEach(a => {
+        const n = parseInt(a.getAttribute('data-se-page-number'), 10);
+        if (n && a.href && !a.href.startsWith('javascript:') && !links[n]) links[n] = a.href;
+    });
+    return links;
+}"""
+
+# Laadtijd (s, tot domcontentloaded), HTTP status en URL van de navigatie in een tab
+_NAVIGATION_TIMING_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return null;
+    return {url: nav.name, seconds: nav.domContentLoadedEventEnd / 1000, status: nav.responseStatus || null};
+}"""
 
 class PhoenixStrategy(BaseStrategy):
-    def accept_cookies(self, page: Page):
-        """Specifieke cookie afhandeling voor Phoenix Contact (Usercentrics)"""
-        print("  🍪 Checking for Phoenix cookie banner...")
-        
-        try:
-            # Wacht even zodat de banner zeker geladen is (Usercentrics is soms traag)
-            time.sleep(2)
-
-            # Shadow DOM aanpak voor Usercentrics (vaak zit de knop in een shadow root)
-            # We zoeken naar de parent container, vaak id='usercentrics-root'
-            uc_root = page.locator("#usercentrics-root")
-            if uc_root.count() > 0:
-                print("  Found #usercentrics-root, checking shadow DOM...")
-                # In Playwright gaan locators standaard door open shadow roots heen.
-                # Dus we zoeken direct naar de knop data-testid='uc-accept-all-button'
-            
-            # 1. Specifiek ID/TestID
-            accept_btn = page.locator("button[data-testid='uc-accept-all-button']")
-            if accept_btn.is_visible():
-                accept_btn.click()
-                print("  ✅ Clicked 'Allow All' (Usercentrics testid)")
-                return
+    ROUTING = ROUTING_PROFILES['phoenix']
+    SESSION_VENDOR = 'phoenix'
+    SESSION_DOMAIN = 'phoenixcontact.com'
+    # Usercentrics (knop zit in een open shadow root onder #usercentrics-root)
+    CONSENT_SELECTORS = [
+        "button[data-testid='uc-accept-all-button']",
+        "button:has-text('Allow All')",
+        "button:has-text('Accept All')",
+        "button:has-text('Alles accepteren')",
+        "button:has-text('Alle akzeptieren')",
+    ]
 
-            # 2. Alternatieve selector voor de groene knop
-            green_btn = page.locator(".sc-dcJsrY.hCAyXb") # Class names kunnen dynamisch zijn, riskant
-            
-            # 3. Tekst match (case insensitive en exact)
-            # Zoek naar knoppen die 'Allow All' of 'Alles accepteren' bevatten
-            possible_texts = ["Allow All", "Accept All", "Alles accepteren", "Alle akzeptieren"]
-            
-            for text in possible_texts:
-                btn = page.get_by_role("button", name=text)
-                if btn.is_visible():
-                    btn.click()
-                    print(f"  ✅ Clicked '{text}' button")
-                    return
-
-            # 4. Als er een shadow root is (soms bij Usercentrics)
-            base_accept = super().accept_cookies(page)
-            
-        except Exception as e:
-            print(f"  ⚠️  Cookie warning: {e}")
+    READINESS = {
+        **BaseStrategy.READINESS,
+        'app': Ready.function("""() => !!document.querySelector('#se-result, .productdetails, #cu-login, #cu-logout')
+                                   || document.readyState === 'complete'"""),
+        'results': Ready.selector("#se-result article.se-result-pos"),
+        'specs': Ready.function("""() => !!document.querySelector('.productdetails table, .specifications')
+                                     || document.readyState === 'complete'"""),
+        'prices': Ready.function(_PRICES_RENDERED_JS),
+        'page_size_menu': Ready.selector('.edd-option[title="50"]', state='visible'),
+    }
 
     def perform_actions(self, page: Page):
         print("  🕵️  Detecting Phoenix Contact specific actions...")
         
         # 1. Login Logic
-        self.login(page)
+        self.ensure_session(page)
         
         # 2. Setup Page Size (50 items)
         self.set_page_size(page)
@@ -73,20 +92,21 @@ class PhoenixStrategy(BaseStrategy):
         print(f"  📡 Navigating to {url}")
         
         try:
-            page.goto(url, wait_until='domcontentloaded', timeout=Config.TIMEOUT_PAGE_LOAD)
+            self.navigate(page, url, wait_until='domcontentloaded')
         except Exception as e:
             print(f"  ⚠️  Navigation warning: {e}")
 
-        # Basic setup we will use a wait here to make sure cookies load
-        time.sleep(2)
+        # Wacht tot de pagina (lijst/detail/header) er is i.p.v. vaste 2s
+        self.wait_ready(page, 'app', legacy_ms=2000)
         self.accept_cookies(page)
-        self.login(page)
+        # Login enkel als de bewaarde sessie niet (meer) geldig is
+        logged_in_now = self.ensure_session(page)
         
         # Check if we were redirected away from the product page (e.g. to profile dashboard)
-        if page.url != url:
+        if logged_in_now and page.url != url:
             print(f"  🔙 Redirected to {page.url}, going back to product list/page...")
-            page.goto(url, wait_until='domcontentloaded', timeout=Config.TIMEOUT_PAGE_LOAD)
-            time.sleep(2)
+            self.navigate(page, url, wait_until='domcontentloaded')
+            self.wait_ready(page, 'app', legacy_ms=2000)
 
         # DETECTIE: Is dit een Lijst of een Product Detail Pagina?
         # Lijsten hebben meestal de id #se-result of dropdowns voor pagina grootte
@@ -103,43 +123,25 @@ class PhoenixStrategy(BaseStrategy):
         """Handelt enkele productpagina's af."""
         # Scrollen om alles te laden (specificaties, footer, etc)
         self.scroll_to_bottom(page)
-        time.sleep(3)
+        self.wait_ready(page, 'specs', legacy_ms=3000)
 
         # Probeer ook hier Shadow DOM prijzen vrij te maken (zit vaak in de header/sidebar)
         self.fix_shadow_prices(page)
         
         # Return full HTML
-        return page.evaluate("() => document.documentElement.outerHTML")
+        return self.capture_html(page)
 
+    @timed('price_wait')
     def fix_shadow_prices(self, page: Page):
         """Helper om shadow dom prijzen te fixen (Code duplicatie voorkomen)"""
         # --- SMART PRICE CHECK ---
-        max_retries = 3
-        for attempt in range(max_retries):
-            price_status = page.evaluate("""() => {
-                const prices = document.querySelectorAll('sh-product-price');
-                if (prices.length === 0) return { found: false, filled: 0 };
-                
-                let filled = 0;
-                prices.forEach(el => {
-                    if (el.shadowRoot && el.shadowRoot.textContent.trim().length > 0) {
-                        filled++;
-                    }
-                });
-                return { found: true, total: prices.length, filled: filled };
-            }""")
-            
-            if not price_status['found']:
-                # Op detailpagina's is de prijs soms niet in een <sh-product-price> maar elders,
-                # of er is gewoon geen prijs component. We loggen het en gaan door.
-                # print("  ⚠️ No price components found (might be normal for detail page).")
-                break 
-            elif price_status['filled'] == 0:
-                print(f"  ⏳ Attempt {attempt+1}/{max_retries}: Prices components found but empty. Waiting...")
-                time.sleep(5)
-            else:
-                print(f"  ✅ Prices detected ({price_status['filled']}/{price_status['total']} items).")
-                break
+        # Op detailpagina's is er soms geen <sh-product-price> component; het predicaat
+        # is dan direct waar. Oude loop: 3 pogingen met 5s sleep -> plafond 15s.
+        if self.wait_ready(page, 'prices', poll_ms=5000, timeout=15000):
+            filled = page.evaluate("""() => Array.from(document.querySelectorAll('sh-product-price'))
+                .filter(el => el.shadowRoot && el.shadowRoot.textContent.trim().length > 0).length""")
+            if filled:
+                print(f"  ✅ Prices detected ({filled} items).")
         
         # Extractie
         page.evaluate("""() => {
@@ -151,6 +153,7 @@ class PhoenixStrategy(BaseStrategy):
             });
         }""")
 
+    @timed('pagination')
     def execute_list_mode(self, page: Page):
         """Oude logica voor lijsten scraping"""
         # Set size to 50
@@ -158,7 +161,7 @@ class PhoenixStrategy(BaseStrategy):
         self.scroll_to_bottom(page) # Load prices for page 1
         
         # Initialize scraping variables
-        collected_product_html = []
+        pages_captured = 0
         current_page_num = 1
         
         # Sla EERST de basis van de pagina op (header, footer, styles)
@@ -174,31 +177,36 @@ class PhoenixStrategy(BaseStrategy):
              return clone.outerHTML;
         }""")
 
+        # Skeleton opsplitsen: alles vóór de placeholder kan meteen weg (streaming),
+        # de rest sluit het document af.
+        skeleton_head, _, skeleton_tail = page_skeleton.partition('<!-- PRODUCTS_PLACEHOLDER -->')
+        del page_skeleton
+        self.emit(skeleton_head)
+
         while True:
             print(f"  📄 Processing list page {current_page_num}...")
             
             # Wait for dynamic prices (scroll)
             self.scroll_to_bottom(page)
-            time.sleep(2) # Korter wachten, 5s is veel
+            self.wait_ready(page, 'results', legacy_ms=2000)
 
             # Fix shadow prices
             self.fix_shadow_prices(page)
             
             # 1. HUIDIGE pagina content opslaan (Alleen de innerHTML van de grid)
-            page_content = page.evaluate("""() => {
-                const container = document.querySelector('#se-result');
-                if (!container) return null;
-                
-                // Verwijder paginatie uit de snapshot anders komt die TIG keer voor
-                const clone = container.cloneNode(true);
-                clone.querySelectorAll('.se-pagination').forEach(e => e.remove());
-                
-                return clone.innerHTML;
-            }""")
+            result = page.evaluate(_RESULTS_JS)
             
-            if page_content:
-                collected_product_html.append(page_content)
-                print(f"     -> Content captured for page {current_page_num} ({len(page_content)} bytes)")
+            if result:
+                pages_captured = self._emit_list_page(result["html"], pages_captured)
+                print(f"     -> Content captured for page {current_page_num} ({len(result['html'])} bytes)")
+
+            # Pagina 2..N in parallelle tabs i.p.v. één voor één door te klikken
+            if current_page_num == 1 and result and Config.PHOENIX_PARALLEL_PAGES:
+                parallel = self.capture_pages_parallel(page, result["count"])
+                if parallel is not None:
+                    for html in parallel:
+                        pages_captured = self._emit_list_page(html, pages_captured)
+                    break
 
             # 2. Zoeken naar VOLGENDE pagina knop
             next_page_link = page.locator(f"a[data-se-page-number='{current_page_num + 1}']").first
@@ -208,12 +216,10 @@ class PhoenixStrategy(BaseStrategy):
                 try:
                     next_page_link.click()
                     # Wait for next page specific element
-                    try:
-                        page.wait_for_selector(f"a.se-active[data-se-page-number='{current_page_num + 1}']", timeout=10000)
-                    except:
+                    next_active = Ready.selector(f"a.se-active[data-se-page-number='{current_page_num + 1}']")
+                    if not self.wait_ready(page, next_active):
                         print("     ⚠️ Timeout waiting for pagination update, assuming loaded...")
-                        time.sleep(3)
-                        
+
                     current_page_num += 1
                 except Exception as e:
                     print(f"  ⚠️  Pagination click failed: {e}")
@@ -222,29 +228,141 @@ class PhoenixStrategy(BaseStrategy):
                 print("  ⏹️  No next page found, stopping pagination.")
                 break
 
-        print(f"  📦 Assembling {len(collected_product_html)} pages of data in Python...")
-        
-        # We plakken alles aan elkaar in Python, NIET in de browser
-        all_products_html = "\n<!-- PAGE BREAK -->\n".join(collected_product_html)
-        
-        # Injecteer de producten in de skeleton
-        full_html = page_skeleton.replace('<!-- PRODUCTS_PLACEHOLDER -->', all_products_html)
-        
-        return full_html
+        print(f"  📦 Assembled {pages_captured} pages of data.")
+
+        # Producten staan al tussen de skeleton delen; enkel nog afsluiten
+        return self.finish(skeleton_tail)
 
-    def login(self, page: Page):
+    def _emit_list_page(self, html, pages_captured):
+        if pages_captured:
+            self.emit("\n<!-- PAGE BREAK -->\n")
+        self.emit(html)
+        return pages_captured + 1
+
+    def list_page_urls(self, page: Page):
+        """
+        Leid de URL van elke lijstpagina af uit de paginatie links.
+
+        De link naar pagina 2 moet een query parameter met waarde '2' hebben
+        (en pagina 3, indien zichtbaar, dezelfde parameter met '3').
+
+        Returns:
+            dict | None: paginanummer -> URL voor pagina 2..N, of None zonder bruikbaar patroon
+        """
+        links = {int(n): href for n, href in page.evaluate(_PAGE_LINKS_JS).items()}
+        if 2 not in links:
+            return None
+
+        total = max(links)
+        base = urlparse(links[2])
+        params = parse_qsl(base.query, keep_blank_values=True)
+        keys = [k for k, v in params if v == "2"]
+        if 3 in links:
+            keys = [k for k in keys if dict(parse_qsl(urlparse(links[3]).query)).get(k) == "3"]
+        if len(keys) != 1:
+            return None
+
+        key = keys[0]
+        urls = {}
+        for n in range(2, total + 1):
+            query = urlencode([(k, str(n) if k == key else v) for k, v in params])
+            urls[n] = base._replace(query=query).geturl()
+        return urls
+
+    def capture_pages_parallel(self, page: Page, first_count):
+        """
+        Haal pagina 2..N op in parallelle tabs van dezelfde (ingelogde) context.
+
+        Maximaal Config.PHOENIX_PARALLEL_TABS tabs tegelijk; het resultaat staat in
+        paginavolgorde. Alle tabs behalve de laatste moeten evenveel artikels tonen als
+        pagina 1 (anders werd de paginagrootte niet overgenomen en klopt de verdeling niet).
+
+        Returns:
+            list | None: HTML per pagina, of None om terug te vallen op doorklikken
+        """
+        urls = self.list_page_urls(page)
+        if not urls:
+            print("  ↪️  No page URL pattern found, paginating sequentially.")
+            return None
+
+        total = max(urls)
+        tabs_limit = max(1, Config.PHOENIX_PARALLEL_TABS)
+        profile = self.ROUTING if Config.BLOCK_RESOURCES else None
+        print(f"  🗂️  Fetching pages 2..{total} in parallel ({tabs_limit} tabs)...")
+
+        started = time.monotonic()
+        pages = []
+        numbers = sorted(urls)
+        for i in range(0, len(numbers), tabs_limit):
+            batch = numbers[i:i + tabs_limit]
+            tabs = []
+            try:
+                # Eén token per batch: de tabs zijn pagina's van dezelfde sessie en laden samen,
+                # per-URL pacing zou de categorie weer zo traag maken als sequentieel doorklikken
+                with self.phase('pacing'):
+                    PACER.acquire(urls[batch[0]])
+                # Eerst alle navigaties laten committen (enkel tot de response headers),
+                # daarna pas op de DOM wachten: de tabs laden verder tegelijk
+                for n in batch:
+                    tab = page.context.new_page()
+                    tabs.append((n, tab))
+                    apply_routing(tab, profile)
+                    tab.goto(urls[n], wait_until='commit', timeout=PACER.timeout_ms(urls[n], 'domcontentloaded'))
+
+                for n, tab in tabs:
+                    self.wait_tab_loaded(tab, urls[n])
+                    self.wait_ready(tab, 'results', legacy_ms=2000)
+                    # Sprong naar onder triggert de lazy prijzen in alle tabs tegelijk
+                    tab.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+
+                for n, tab in tabs:
+                    self.fix_shadow_prices(tab)
+                    result = tab.evaluate(_RESULTS_JS)
+                    if not result or (n < total and result["count"] != first_count):
+                        found = result["count"] if result else 0
+                        print(f"     ⚠️ Page {n} has {found} items (expected {first_count}), falling back.")
+                        return None
+                    pages.append(result["html"])
+                    print(f"     -> Content captured for page {n} ({len(result['html'])} bytes)")
+            except Exception as e:
+                print(f"  ⚠️  Parallel pagination failed: {e}")
+                return None
+            finally:
+                for _, tab in tabs:
+                    tab.close()
+
+        print(f"  ⏱️  {len(pages)} pages in {time.monotonic() - started:.1f}s (parallel)")
+        return pages
+
+    def wait_tab_loaded(self, tab: Page, url):
+        """
+        Wacht op domcontentloaded van een parallelle tab (navigatie al gecommit met goto)
+        en geef de laadtijd door aan de pacer.
+        """
+        timeout = PACER.timeout_ms(url, 'domcontentloaded')
+        try:
+            tab.wait_for_load_state('domcontentloaded', timeout=timeout)
+        except Exception as e:
+            if type(e).__name__ == 'TimeoutError':
+                PACER.record(url, timeout_ms=timeout, wait_until='domcontentloaded')
+            raise
+        # Navigation Timing i.p.v. een eigen klok: de tabs laden tegelijk maar worden na elkaar afgewacht
+        timing = tab.evaluate(_NAVIGATION_TIMING_JS)
+        # Enkel de navigatie naar deze URL meten, niet about:blank of een tussenpagina
+        if timing and timing['url'] == url:
+            PACER.record(url, timing['seconds'], timing['status'], wait_until='domcontentloaded')
+
+    def is_logged_in(self, page: Page):
+        if page.locator("#cu-logout").count() > 0:
+            return True
+        if page.locator("#cu-login").count() > 0:
+            return False
+        return None
+
+    def login(self, page: Page, credentials):
         print("  🔑 Performing Login...")
-        
-        # Read credentials
-        config = configparser.ConfigParser()
-        config.read(Config.SECRETS_PATH)
-        
-        if 'phoenix' not in config:
-            print("  ⚠️  No [phoenix] section in credentials.ini")
-            return
-            
-        email = config['phoenix'].get('email')
-        password = config['phoenix'].get('password')
+        email = credentials['email']
+        password = credentials['password']
         
         # 1. Click Login Link
         try:
@@ -335,20 +453,27 @@ class PhoenixStrategy(BaseStrategy):
         except Exception as e:
             print(f"  ⚠️ Login failed or skipped: {e}")
 
+    @timed('pagination')
     def set_page_size(self, page: Page):
         print("  📏 Setting page size to 50...")
         try:
             # Open Dropdown - gebruik .first om strict mode te fixen
             page.locator(".edd-head").first.click()
-            time.sleep(0.5)
+            self.wait_ready(page, 'page_size_menu', legacy_ms=500, timeout=2000)
             
+            before = page.locator('#se-result article.se-result-pos').count()
+
             # Select 50 - gebruik .first
             option_50 = page.locator('.edd-option[title="50"]').first
             if option_50.is_visible():
                 option_50.click()
                 print("  Selected 50 items")
-                # Wait for HTMX swap
-                time.sleep(3)
+                # Wait for HTMX swap: meer artikelen of een nieuwe paginatie
+                swapped = Ready.function(
+                    "(prev) => document.querySelectorAll('#se-result article.se-result-pos').length > prev",
+                    arg=before,
+                )
+                self.wait_ready(page, swapped, legacy_ms=3000, timeout=3000)
             else:
                 print("  Option '50' not found")
         except Exception as e:
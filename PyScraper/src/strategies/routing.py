@@ -0,0 +1,152 @@
+import re
+from urllib.parse import urlparse
+from core.config import Config
+
+# Hosts die nooit iets bijdragen aan de DOM die MSE leest (analytics, ads, chat widgets)
+TRACKER_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "facebook.net",
+    "facebook.com",
+    "connect.facebook.net",
+    "linkedin.com",
+    "licdn.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "hotjar.io",
+    "mouseflow.com",
+    "demdex.net",
+    "omtrdc.net",
+    "adobedtm.com",
+    "everesttech.net",
+    "qualtrics.com",
+    "livechatinc.com",
+    "zendesk.com",
+    "zopim.com",
+    "salesforceliveagent.com",
+    "intercom.io",
+    "youtube.com",
+    "ytimg.com",
+    "vimeo.com",
+]
+
+# Consent managers moeten blijven laden, anders kunnen we de banner niet wegklikken
+CONSENT_HOSTS = [
+    "usercentrics.eu",
+    "cookielaw.org",
+    "onetrust.com",
+    "cookiebot.com",
+]
+
+
+class RoutingProfile:
+    """
+    Beschrijft welke requests een vendor niet nodig heeft.
+
+    Args:
+        name: Naam voor logging
+        block_types: Playwright resource types om af te breken (image, font, media, ...)
+        block_hosts: Host suffixes om af te breken (third-party trackers etc.)
+        allow: (host suffix, pad regex of None) paren die ALTIJD doorgaan (kritieke
+               scripts, bv. prijs widgets). Verankerd op host en pad: een tracker URL
+               met 'price' in de query matcht niet.
+    """
+
+    def __init__(self, name, block_types=None, block_hosts=None, allow=None):
+        self.name = name
+        self.block_types = set(block_types if block_types is not None else ["image", "media", "font"])
+        self.block_hosts = list(block_hosts if block_hosts is not None else TRACKER_HOSTS)
+        self.allow = [(host, re.compile(path) if path else None) for host, path in allow or []]
+        self.allow += [(host, None) for host in CONSENT_HOSTS]
+
+    def should_block(self, request):
+        parsed = urlparse(request.url)
+        host = parsed.netloc.lower()
+        if any(_on_host(host, h) and (path is None or path.search(parsed.path)) for h, path in self.allow):
+            return False
+        if request.resource_type in self.block_types:
+            return True
+        return any(_on_host(host, h) for h in self.block_hosts)
+
+
+def _on_host(host, suffix):
+    return host == suffix or host.endswith("." + suffix)
+
+
+class RoutingStats:
+    """Telt geblokkeerde/doorgelaten requests voor één pagina."""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.blocked = 0
+        self.blocked_bytes = 0  # Schatting: geblokkeerde requests downloaden niets
+        self.allowed = 0
+        self.allowed_bytes = 0
+
+    def on_response(self, response):
+        try:
+            self.allowed_bytes += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    def print_summary(self):
+        total = self.blocked + self.allowed
+        if not total:
+            return
+        print(f"  🚧 Routing [{self.profile.name}]: blocked {self.blocked}/{total} requests "
+              f"(~{self.blocked_bytes / 1024:.0f} KB saved est.), "
+              f"loaded {self.allowed_bytes / 1024:.0f} KB")
+
+
+def apply_routing(page, profile):
+    """
+    Installeer het routing profiel op een pagina (page.route).
+    Toegelaten requests gaan via route.fallback() zodat andere route handlers kunnen volgen.
+
+    Let op: zodra er een route op de pagina of de context staat, gebruikt Chromium zijn
+    HTTP cache niet meer. De asset cache (core/asset_cache.py, ASSET_CACHE = True) is zelf
+    een context route, dus ook met BLOCK_RESOURCES = False staat de HTTP cache uit en is de
+    asset cache de enige cache: wat die niet bewaart (documenten, XHR, korte max-age) wordt
+    op elke pagina opnieuw gedownload (zie de 'loaded' KB in de rapportage). Enkel met
+    ASSET_CACHE = False én BLOCK_RESOURCES = False werkt de HTTP cache van Chromium.
+    """
+    stats = RoutingStats(profile)
+    if profile is None:
+        return stats
+
+    def handler(route):
+        request = route.request
+        if profile.should_block(request):
+            stats.blocked += 1
+            stats.blocked_bytes += Config.ROUTING_EST_BYTES.get(request.resource_type, Config.ROUTING_EST_BYTES["other"])
+            route.abort("blockedbyclient")
+        else:
+            stats.allowed += 1
+            route.fallback()
+
+    page.route("**/*", handler)
+    page.on("response", stats.on_response)
+    return stats
+
+
+# ═══════════════════════════════════════════════════════════════
+# PROFIELEN PER VENDOR
+# ═══════════════════════════════════════════════════════════════
+ROUTING_PROFILES = {
+    "default": RoutingProfile("default"),
+    "siemens": RoutingProfile("siemens"),
+    "phoenix": RoutingProfile(
+        "phoenix",
+        # sh-product-price/availability web components zijn first-party scripts
+        allow=[("phoenixcontact.com", r"sh-product|shop-components")],
+    ),
+    "schneider": RoutingProfile(
+        "schneider",
+        # Prijs widgets (pes-product-price) + product cards niet blokkeren (enkel first-party)
+        allow=[("se.com", r"price|pes-|product-cards|availability")],
+    ),
+}
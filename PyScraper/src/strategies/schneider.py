@@ -1,7 +1,225 @@
+import difflib
+import itertools
+import os
+import random
 import time
 from playwright.sync_api import Page
 from .base import BaseStrategy
+from .routing import ROUTING_PROFILES
 from core.config import Config
+from core.readiness import Ready
+from core.metrics import timed
+from utils.file_ops import safe_filename_from_url
+
+# Wordt ook gebruikt om op een wijziging na paginatie te wachten
+_LIST_STATE_JS = """() => {
+    const w = document.querySelector('product-cards-wrapper');
+    return w ? w.getAttribute('product-ids') : document.body.innerText.substring(0, 200);
+}"""
+
+_PRICES_RENDERED_JS = """() => {
+    const prices = document.querySelectorAll('.price, .product-price, pes-product-price');
+    if (prices.length === 0) return false;
+
+    for (let p of prices) {
+        if (p.textContent.trim().length > 0) return true;
+        if (p.shadowRoot && p.shadowRoot.textContent.trim().length > 0) return true;
+    }
+    return false;
+}"""
+
+# Snapshot engine: één diepe traversal (shadow hosts + target), daarna een array-join
+# builder i.p.v. string concatenatie per node, zonder de oude 15-niveau grens.
+# Escaping is exact die van _LEGACY_SNAPSHOT_JS (tekst ongewijzigd, in attributen enkel
+# '"' -> &quot;), dus geen outerHTML: dat escapet tekst en '&' en MSE leest het anders.
+# Shadow content komt in een <div class="scraped-shadow-root"> zoals voorheen; de native
+# getHTML({serializableShadowRoots}) levert <template shadowrootmode> op (en native
+# escaping), waarvan BeautifulSoup de tekst als TemplateString buiten get_text() houdt.
+# Die modus is dus opt-in.
+_SNAPSHOT_JS = """({isFirst, debug, declarative}) => {
+    const t0 = performance.now();
+    const TARGETS = ['product-cards-wrapper', '.range-products-tab__products-list'];
+
+    // 1. Eén traversal: shadow hosts verzamelen + eerste target match (shadow root eerst, zoals voorheen)
+    const hosts = [];
+    const found = {};
+    const stack = [document.documentElement];
+    while (stack.length) {
+        const el = stack.pop();
+        for (const sel of TARGETS) {
+            if (!found[sel] && el.matches(sel)) found[sel] = el;
+        }
+        const kids = el.children;
+        for (let i = kids.length - 1; i >= 0; i--) stack.push(kids[i]);
+        if (el.shadowRoot) {
+            hosts.push(el);
+            const shadowKids = el.shadowRoot.children;
+            for (let i = shadowKids.length - 1; i >= 0; i--) stack.push(shadowKids[i]);
+        }
+    }
+
+    const root = isFirst ? document.documentElement : (found[TARGETS[0]] || found[TARGETS[1]] || document.body);
+
+    function openTag(el, out, depth) {
+        const tag = el.tagName.toLowerCase();
+        out.push('<', tag);
+        for (const attr of el.attributes) out.push(' ', attr.name, '="', attr.value.replace(/"/g, '&quot;'), '"');
+        if (debug) out.push(' data-depth="', depth, '"');
+        out.push('>');
+        return tag;
+    }
+
+    function serialize(node, out, depth) {
+        if (node.nodeType === Node.TEXT_NODE) {
+            out.push(node.nodeValue);
+            return;
+        }
+        if (node.nodeType !== Node.ELEMENT_NODE) return;
+
+        const tag = openTag(node, out, depth);
+        if (node.shadowRoot) {
+            if (debug) {
+                out.push('<div class="scraped-shadow-root" style="border: 1px dashed red; margin: 5px; padding: 5px;">',
+                         `<!-- START SHADOW ROOT of ${tag} -->`);
+            } else {
+                out.push('<div class="scraped-shadow-root">');
+            }
+            for (const child of node.shadowRoot.childNodes) serialize(child, out, depth + 1);
+            if (debug) out.push(`<!-- END SHADOW ROOT of ${tag} -->`);
+            out.push('</div>');
+        }
+        for (const child of node.childNodes) serialize(child, out, depth + 1);
+        out.push('</', tag, '>');
+    }
+
+    const out = [];
+    let mode = 'flatten';
+    if (debug) {
+        out.push(isFirst ? '<!-- SNAPSHOT INFO: Full Page (incl HEAD) -->'
+                         : `<!-- SNAPSHOT INFO: Target found: ${root.tagName} IDs: ${root.getAttribute('product-ids')} -->`);
+    }
+    if (declarative && typeof root.getHTML === 'function') {
+        mode = 'getHTML';
+        const tag = openTag(root, out, 0);
+        out.push(root.getHTML({serializableShadowRoots: true, shadowRoots: hosts.map(h => h.shadowRoot)}), '</', tag, '>');
+    } else {
+        serialize(root, out, 0);
+    }
+
+    return {html: out.join(''), ms: performance.now() - t0, mode, hosts: hosts.length};
+}"""
+
+# Serializer van vóór de herschrijving, enkel nog als referentie voor
+# Config.SNAPSHOT_VERIFY_RATE (MSE output oud vs nieuw vergelijken)
+_LEGACY_SNAPSHOT_JS = """(is_first) => {
+    const MAX_DEPTH = 15;
+
+    function serializeNode(node, depth) {
+        if (depth > MAX_DEPTH) return '';
+
+        if (node.nodeType === Node.TEXT_NODE) {
+             return node.nodeValue;
+        }
+
+        if (node.nodeType === Node.ELEMENT_NODE) {
+            const tagName = node.tagName.toLowerCase();
+
+            let html = `<${tagName}`;
+            if (node.attributes) {
+                for (let i = 0; i < node.attributes.length; i++) {
+                     const attr = node.attributes[i];
+                     html += ` ${attr.name}="${attr.value.replace(/"/g, '&quot;')}"`;
+                }
+            }
+            html += ` data-depth="${depth}"`; // Debug info
+            html += '>';
+
+            let childrenHtml = '';
+
+            // 1. Shadow DOM content (PRIORITEIT)
+            if (node.shadowRoot) {
+                childrenHtml += '<div class="scraped-shadow-root" style="border: 1px dashed red; margin: 5px; padding: 5px;">';
+                childrenHtml += `<!-- START SHADOW ROOT of ${tagName} -->`;
+
+                // FIX: We moeten zeker weten dat we children ophalen
+                const shadowChildren = Array.from(node.shadowRoot.childNodes);
+                 childrenHtml += `<!-- Found ${shadowChildren.length} shadow children -->`;
+
+                shadowChildren.forEach(child => {
+                    childrenHtml += serializeNode(child, depth + 1);
+                });
+
+                childrenHtml += `<!-- END SHADOW ROOT of ${tagName} -->`;
+                childrenHtml += '</div>';
+            }
+
+            // 2. Light DOM children
+            if (node.childNodes.length > 0) {
+                Array.from(node.childNodes).forEach(child => {
+                     childrenHtml += serializeNode(child, depth + 1);
+                });
+            }
+
+            html += childrenHtml;
+            html += `</${tagName}>`;
+            return html;
+        }
+
+        return '';
+    }
+
+    // We moeten de 'product-cards-wrapper' vinden, OOK als die in een shadow root zit.
+    // document.querySelector kan niet in shadow roots kijken.
+    // We gebruiken een brute-force searcher.
+
+    function findElementDeep(root, selector) {
+        if (root.matches && root.matches(selector)) return root;
+        if (root.shadowRoot) {
+            const found = findElementDeep(root.shadowRoot, selector);
+            if (found) return found;
+        }
+
+        const children = root.children || root.childNodes; // childNodes voor shadowRoot
+        for (let i = 0; i < children.length; i++) {
+            const el = children[i];
+            if (el.nodeType === 1) { // ELEMENT_NODE
+                const found = findElementDeep(el, selector);
+                if (found) return found;
+                 // Check shadow root of child
+                if (el.shadowRoot) {
+                     const shadowFound = findElementDeep(el.shadowRoot, selector);
+                     if (shadowFound) return shadowFound;
+                }
+            }
+        }
+        return null;
+    }
+
+    // LOGICA: Eerste pagina -> Hele site (voor metadata)
+    //         Vervolg paginas -> Alleen content
+
+    if (is_first) {
+         const logComment = `<!-- SNAPSHOT INFO: Full Page (incl HEAD) -->`;
+         return logComment + serializeNode(document.documentElement, 0);
+    }
+
+    // Vervolg pagina's: Alleen nieuwe content
+    let target = findElementDeep(document.body, 'product-cards-wrapper');
+
+    if (!target) {
+        // Fallback naar de lijst container
+        target = findElementDeep(document.body, '.range-products-tab__products-list');
+        if (!target) target = document.body;
+    }
+
+    // Log voor debugging
+    const logComment = `<!-- SNAPSHOT INFO: Target found: ${target.tagName} IDs: ${target.getAttribute('product-ids')} -->`;
+
+    return logComment + serializeNode(target, 0);
+}"""
+
+_VERIFY_SEQ = itertools.count(1)
+
 
 class SchneiderStrategy(BaseStrategy):
     """
@@ -9,45 +227,38 @@ class SchneiderStrategy(BaseStrategy):
     Ondersteunt zowel productlijst-pagina's (Ranges) als detailpagina's.
     """
 
-    def accept_cookies(self, page: Page):
-        print("  🍪 Checking for Schneider cookie banner...")
-        try:
-            # Wacht even op de banner
-            time.sleep(2)
-            
-            # Schneider heeft vaak een Shadow DOM banner of een 'Onetrust' banner
-            # 1. Probeer generieke teksten
-            possible_texts = ["Accept All", "Alles accepteren", "Akkoord", "Allow all cookies"]
-            
-            for text in possible_texts:
-                # Zoek naar knoppen die deze tekst bevatten
-                # We gebruiken een brede selector omdat IDs vaak veranderen
-                btn = page.get_by_role("button", name=text)
-                if btn.count() > 0 and btn.is_visible():
-                    print(f"  ✅ Found cookie button with text '{text}'")
-                    btn.click()
-                    return
-
-            # 2. Specifieke selector voor OneTrust (indien aanwezig)
-            onetrust_btn = page.locator("#onetrust-accept-btn-handler")
-            if onetrust_btn.count() > 0 and onetrust_btn.is_visible():
-                print("  ✅ Clicked OneTrust accept button")
-                onetrust_btn.click()
-                return
+    ROUTING = ROUTING_PROFILES['schneider']
+    # OneTrust of een eigen banner met tekstknoppen
+    CONSENT_SELECTORS = [
+        "#onetrust-accept-btn-handler",
+        "button:has-text('Accept All')",
+        "button:has-text('Alles accepteren')",
+        "button:has-text('Akkoord')",
+        "button:has-text('Allow all cookies')",
+    ]
 
-        except Exception as e:
-            print(f"  ⚠️ Cookie handling warning: {e}")
+    def __init__(self):
+        super().__init__()
+        self.snapshot_stats = []  # (bytes, ms) per snapshot
+
+    READINESS = {
+        **BaseStrategy.READINESS,
+        'app': Ready.function("""() => !!document.querySelector('product-cards-wrapper[product-ids], [plain-all-data], .button-list')
+                                   || document.readyState === 'complete'"""),
+        'cards': Ready.selector("product-cards-wrapper[product-ids]"),
+        'prices': Ready.function(_PRICES_RENDERED_JS),
+    }
 
     def execute(self, page: Page, url: str):
         print(f"  📡 Navigating to {url}")
         
         try:
-            page.goto(url, wait_until='domcontentloaded', timeout=Config.TIMEOUT_PAGE_LOAD)
+            self.navigate(page, url, wait_until='domcontentloaded')
         except Exception as e:
             print(f"  ⚠️ Navigation warning: {e}")
 
-        # Wacht op initiële load
-        time.sleep(3)
+        # Wacht op initiële load (lijst wrapper, product JSON of load event)
+        self.wait_ready(page, 'app', legacy_ms=3000)
         self.accept_cookies(page)
 
         # DETECTIE: Is dit een Lijst (Range) of Detail pagina?
@@ -80,8 +291,9 @@ class SchneiderStrategy(BaseStrategy):
         self.expand_shadow_dom(page)
         
         # Return full HTML
-        return page.evaluate("() => document.documentElement.outerHTML")
+        return self.capture_html(page)
 
+    @timed('pagination')
     def execute_list_mode(self, page: Page):
         """Handelt multi-page lijsten af."""
         
@@ -96,13 +308,13 @@ class SchneiderStrategy(BaseStrategy):
                 if "active" not in classes:
                     print("  🔲 Switching to List View...")
                     list_btn.click()
-                    time.sleep(2) 
+                    self.wait_ready(page, 'cards', legacy_ms=2000, timeout=5000)
                 else:
                     print("  ✅ List View already active.")
         except Exception as e:
             print(f"  ⚠️ Could not switch to List View: {e}")
 
-        collected_html_parts = []
+        pages_captured = 0
         current_page_num = 1
         
         while True:
@@ -135,7 +347,8 @@ class SchneiderStrategy(BaseStrategy):
                 # Strip closing tags van page 1
                 page_content = page_content.replace('</body>', '').replace('</html>', '')
             
-            collected_html_parts.append(page_content)
+            self.emit(page_content)
+            pages_captured += 1
             print(f"     -> Content captured ({len(page_content)} bytes)")
 
             # Zoek VOLGENDE knop 
@@ -147,10 +360,7 @@ class SchneiderStrategy(BaseStrategy):
             
             if next_btn.count() > 0:
                 # Capture huidige state VOOR de klik (voor vergelijking)
-                previous_state_hash = page.evaluate("""() => {
-                    const w = document.querySelector('product-cards-wrapper');
-                    return w ? w.getAttribute('product-ids') : document.body.innerText.substring(0, 200);
-                }""")
+                previous_state_hash = page.evaluate(_LIST_STATE_JS)
 
                 # ... (rest van click logic blijft grotendeels gelijk, maar we halen expand_shadow_dom weg) ->
                 
@@ -187,25 +397,13 @@ class SchneiderStrategy(BaseStrategy):
                         print("  ⏳ Waiting for content update...")
                         
                         # Wacht tot het product-ids attribuut verandert
-                        try:
-                            updated = False
-                            for _ in range(20): # 10 sec
-                                time.sleep(0.5)
-                                current_state_hash = page.evaluate("""() => {
-                                    const w = document.querySelector('product-cards-wrapper');
-                                    return w ? w.getAttribute('product-ids') : document.body.innerText.substring(0, 200);
-                                }""")
-                                
-                                if current_state_hash != previous_state_hash:
-                                    print("  ✅ Content update detected.")
-                                    updated = True
-                                    break
-                            
-                            if not updated:
-                                print("  ⚠️ Warning: Content did not appear to change after click.")
-                                
-                        except Exception as wait_err:
-                            print(f"  ⚠️ Content wait error: {wait_err}")
+                        changed = Ready.function(
+                            f"(prev) => ({_LIST_STATE_JS})() !== prev", arg=previous_state_hash
+                        )
+                        if self.wait_ready(page, changed, poll_ms=500):
+                            print("  ✅ Content update detected.")
+                        else:
+                            print("  ⚠️ Warning: Content did not appear to change after click.")
 
                         current_page_num += 1
                         
@@ -216,12 +414,16 @@ class SchneiderStrategy(BaseStrategy):
                 print("  ⏹️ No next page button found.")
                 break
 
-        print(f"  📦 Assembling {len(collected_html_parts)} pages of data...")
+        print(f"  📦 Assembled {pages_captured} pages of data.")
+        if self.snapshot_stats:
+            total_kb = sum(b for b, _ in self.snapshot_stats) / 1024
+            total_ms = sum(ms for _, ms in self.snapshot_stats)
+            print(f"     📸 Snapshots: {total_kb:.0f} KB total, {total_ms:.0f} ms serialization")
         
         # Voeg handmatig de sluit-tags toe die we eerder hebben gestript
-        full_html = "".join(collected_html_parts) + "</body></html>"
-        return full_html
+        return self.finish("</body></html>")
 
+    @timed('snapshot')
     def get_snapshot_html(self, page: Page, is_first_page: bool = False):
         """
         Genereert een string representatie van de DOM inclusief expanded shadow roots.
@@ -231,116 +433,65 @@ class SchneiderStrategy(BaseStrategy):
             is_first_page: Als True, pakken we de hele <html> tag om <head> (canonical) mee te hebben.
                            Als False, pakken we alleen de content wrapper.
         """
-        return page.evaluate("""(is_first) => {
-            const MAX_DEPTH = 15;
-            
-            function serializeNode(node, depth) {
-                if (depth > MAX_DEPTH) return '';
-                
-                if (node.nodeType === Node.TEXT_NODE) {
-                     return node.nodeValue;
-                }
-                
-                if (node.nodeType === Node.ELEMENT_NODE) {
-                    const tagName = node.tagName.toLowerCase();
-                    
-                    let html = `<${tagName}`;
-                    if (node.attributes) {
-                        for (let i = 0; i < node.attributes.length; i++) {
-                             const attr = node.attributes[i];
-                             html += ` ${attr.name}="${attr.value.replace(/"/g, '&quot;')}"`;
-                        }
-                    }
-                    html += ` data-depth="${depth}"`; // Debug info
-                    html += '>';
-                    
-                    let childrenHtml = '';
-                    
-                    // 1. Shadow DOM content (PRIORITEIT)
-                    if (node.shadowRoot) {
-                        childrenHtml += '<div class="scraped-shadow-root" style="border: 1px dashed red; margin: 5px; padding: 5px;">';
-                        childrenHtml += `<!-- START SHADOW ROOT of ${tagName} -->`;
-                        
-                        // FIX: We moeten zeker weten dat we children ophalen
-                        const shadowChildren = Array.from(node.shadowRoot.childNodes);
-                         childrenHtml += `<!-- Found ${shadowChildren.length} shadow children -->`;
+        result = page.evaluate(_SNAPSHOT_JS, {
+            'isFirst': is_first_page,
+            'debug': Config.SNAPSHOT_DEBUG,
+            'declarative': Config.SNAPSHOT_DECLARATIVE_SHADOW,
+        })
 
-                        shadowChildren.forEach(child => {
-                            childrenHtml += serializeNode(child, depth + 1);
-                        });
-                        
-                        childrenHtml += `<!-- END SHADOW ROOT of ${tagName} -->`;
-                        childrenHtml += '</div>';
-                    }
-                    
-                    // 2. Light DOM children
-                    if (node.childNodes.length > 0) {
-                        Array.from(node.childNodes).forEach(child => {
-                             childrenHtml += serializeNode(child, depth + 1);
-                        });
-                    }
-                    
-                    html += childrenHtml;
-                    html += `</${tagName}>`;
-                    return html;
-                }
-                
-                return '';
-            }
+        size = len(result['html'])
+        self.snapshot_stats.append((size, result['ms']))
+        print(f"     📸 Snapshot: {size / 1024:.0f} KB in {result['ms']:.0f} ms "
+              f"({result['mode']}, {result['hosts']} shadow roots)")
+        if random.random() < Config.SNAPSHOT_VERIFY_RATE:
+            self.verify_snapshot(page, is_first_page, result['html'])
+        return result['html']
 
-            // We moeten de 'product-cards-wrapper' vinden, OOK als die in een shadow root zit.
-            // document.querySelector kan niet in shadow roots kijken.
-            // We gebruiken een brute-force searcher.
-            
-            function findElementDeep(root, selector) {
-                if (root.matches && root.matches(selector)) return root;
-                if (root.shadowRoot) {
-                    const found = findElementDeep(root.shadowRoot, selector);
-                    if (found) return found;
-                }
-                
-                const children = root.children || root.childNodes; // childNodes voor shadowRoot
-                for (let i = 0; i < children.length; i++) {
-                    const el = children[i];
-                    if (el.nodeType === 1) { // ELEMENT_NODE
-                        const found = findElementDeep(el, selector);
-                        if (found) return found;
-                         // Check shadow root of child
-                        if (el.shadowRoot) {
-                             const shadowFound = findElementDeep(el.shadowRoot, selector);
-                             if (shadowFound) return shadowFound;
-                        }
-                    }
-                }
-                return null;
-            }
+    def verify_snapshot(self, page: Page, is_first_page, html):
+        """
+        Vergelijk de MSE output van de nieuwe serializer met die van de oude (_LEGACY_SNAPSHOT_JS)
+        op dezelfde DOM. De escaping is dezelfde; verschillen kunnen enkel nog komen van
+        content dieper dan de oude 15-niveau grens. Ze worden gelogd, de capture blijft die
+        van de nieuwe serializer. Met Config.SNAPSHOT_VERIFY_DIR worden beide outputs en
+        hun diff bewaard.
+        """
+        from utils.mse_bridge import compare_mse_output
 
-            // LOGICA: Eerste pagina -> Hele site (voor metadata)
-            //         Vervolg paginas -> Alleen content
-            
-            if (is_first) {
-                 const logComment = `<!-- SNAPSHOT INFO: Full Page (incl HEAD) -->`;
-                 return logComment + serializeNode(document.documentElement, 0);
-            }
-            
-            // Vervolg pagina's: Alleen nieuwe content
-            let target = findElementDeep(document.body, 'product-cards-wrapper');
-            
-            if (!target) {
-                // Fallback naar de lijst container
-                target = findElementDeep(document.body, '.range-products-tab__products-list');
-                if (!target) target = document.body;
-            }
-            
-            // Log voor debugging
-            const logComment = `<!-- SNAPSHOT INFO: Target found: ${target.tagName} IDs: ${target.getAttribute('product-ids')} -->`;
-            
-            return logComment + serializeNode(target, 0);
-        }""", is_first_page)
+        try:
+            legacy = page.evaluate(_LEGACY_SNAPSHOT_JS, is_first_page)
+            equal, diffs = compare_mse_output(html, legacy)
+        except Exception as e:
+            print(f"     ⚠️ Snapshot verification skipped: {e}")
+            return None
+
+        if equal:
+            print(f"     🔬 Snapshot verified: MSE output identical to legacy serializer "
+                  f"({len(html) / max(len(legacy), 1):.0%} of legacy size)")
+        else:
+            print(f"     ❗ Snapshot MISMATCH vs legacy serializer in: {', '.join(map(str, diffs))}")
+        if Config.SNAPSHOT_VERIFY_DIR:
+            self.record_snapshot_diff(page.url, legacy, html, diffs)
+        return equal
+
+    def record_snapshot_diff(self, url, legacy, html, mse_diffs):
+        """Bewaar legacy/nieuwe snapshot en een unified diff (één tag per regel) in SNAPSHOT_VERIFY_DIR."""
+        os.makedirs(Config.SNAPSHOT_VERIFY_DIR, exist_ok=True)
+        # Volgnummer: bij doorklikken blijft page.url vaak gelijk
+        stem = os.path.join(Config.SNAPSHOT_VERIFY_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}_{next(_VERIFY_SEQ):04d}_"
+                                                       f"{safe_filename_from_url(url)[:-len('.html')][:100]}")
+        lines = {name: text.replace('>', '>\n').splitlines(keepends=True) for name, text in
+                 (("legacy", legacy), ("new", html))}
+        for name, text in (("legacy", legacy), ("new", html)):
+            with open(f"{stem}.{name}.html", "w", encoding="utf-8") as f:
+                f.write(text)
+        with open(f"{stem}.diff", "w", encoding="utf-8") as f:
+            f.write(f"# {url}\n# MSE output differs in: {', '.join(map(str, mse_diffs)) or 'nothing'}\n")
+            f.writelines(difflib.unified_diff(lines["legacy"], lines["new"], "legacy", "new"))
 
     def expand_shadow_dom(self, page: Page):
         pass
 
+    @timed('price_wait')
     def smart_price_wait(self, page: Page):
         """Wacht tot prijzen zichtbaar zijn en fixt Shadow DOM indien nodig."""
         login_selectors = [
@@ -362,27 +513,11 @@ class SchneiderStrategy(BaseStrategy):
              print("  👤 Guest detected (Login button visible): Skipping smart price wait.")
              return
 
-        max_retries = 3
         print("  💰 Checking for prices...")
-        
-        for attempt in range(max_retries):
-            found_prices = page.evaluate("""() => {
-                const prices = document.querySelectorAll('.price, .product-price, pes-product-price');
-                if (prices.length === 0) return false;
-                
-                for (let p of prices) {
-                    if (p.textContent.trim().length > 0) return true;
-                    if (p.shadowRoot && p.shadowRoot.textContent.trim().length > 0) return true;
-                }
-                return false;
-            }""")
-            
-            if found_prices:
-                print("  ✅ Prices detected.")
-                break
-            else:
-                print(f"  ⏳ Attempt {attempt+1}/{max_retries}: Waiting for prices...")
-                time.sleep(4)
+
+        # Oude loop: 3 pogingen met 4s sleep -> plafond 12s
+        if self.wait_ready(page, 'prices', poll_ms=4000, timeout=12000):
+            print("  ✅ Prices detected.")
 
         page.evaluate("""() => {
             const targets = document.querySelectorAll('*');
@@ -0,0 +1,136 @@
+import math
+import threading
+from core.config import Config
+
+# Scroll per viewport hoogte en stop zodra er niets nieuws meer laadt:
+# - MutationObserver: nieuwe DOM nodes (lazy componenten, extra kaarten)
+# - IntersectionObserver: lazy images/iframes die in beeld komen
+# - fetch/XHR in-flight teller en nog ladende images
+# Beneden aangekomen wordt gewacht tot alles quietMs stil is; groeit de pagina, dan gaat het verder.
+_ADAPTIVE_SCROLL_JS = """async ({settleMs, quietMs, maxMs}) => {
+    const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+    const start = performance.now();
+    let lastActivity = start;
+    let inflight = 0;
+    const mark = () => { lastActivity = performance.now(); };
+
+    const mo = new MutationObserver(muts => {
+        if (muts.some(m => m.addedNodes.length)) mark();
+    });
+    mo.observe(document.body, {childList: true, subtree: true});
+
+    const io = new IntersectionObserver(entries => {
+        if (entries.some(e => e.isIntersecting)) mark();
+    }, {rootMargin: '200px'});
+    document.querySelectorAll('img[loading="lazy"], img[data-src], iframe[loading="lazy"]').forEach(el => io.observe(el));
+
+    const origFetch = window.fetch;
+    const origSend = XMLHttpRequest.prototype.send;
+    window.fetch = function (...args) {
+        inflight++; mark();
+        return origFetch.apply(this, args).finally(() => { inflight--; mark(); });
+    };
+    XMLHttpRequest.prototype.send = function (...args) {
+        inflight++; mark();
+        this.addEventListener('loadend', () => { inflight--; mark(); }, {once: true});
+        return origSend.apply(this, args);
+    };
+
+    const pendingImages = () => {
+        const limit = window.innerHeight * 2;
+        return [...document.images].filter(img => {
+            if (img.complete) return false;
+            const r = img.getBoundingClientRect();
+            return r.bottom > -limit && r.top < limit;
+        }).length;
+    };
+    const quiet = () => inflight <= 0 && pendingImages() === 0 && performance.now() - lastActivity >= quietMs;
+
+    const scroller = document.scrollingElement || document.documentElement;
+    let y = 0, jumps = 0, timedOut = false;
+    try {
+        while (true) {
+            if (performance.now() - start > maxMs) { timedOut = true; break; }
+            const height = scroller.scrollHeight;
+            if (y + window.innerHeight >= height) {
+                if (quiet()) break;
+                await sleep(50);
+                continue;
+            }
+            y = Math.min(y + window.innerHeight, height);
+            window.scrollTo(0, y);
+            jumps++;
+            await sleep(settleMs);
+        }
+    } finally {
+        mo.disconnect();
+        io.disconnect();
+        window.fetch = origFetch;
+        XMLHttpRequest.prototype.send = origSend;
+        window.scrollTo(0, 0);
+    }
+    return {ms: performance.now() - start, jumps, height: scroller.scrollHeight, timedOut};
+}"""
+
+# Zelfde regeltypes als vendor_specs.match_rule, maar in de pagina (zonder HTML te kopiëren)
+_RULES_PRESENT_JS = """(rules) => rules.every(rule => {
+    try {
+        if (rule.id) return !!document.getElementById(rule.id);
+        if (rule.selector) return !!document.querySelector(rule.selector);
+        if (rule.class_contains) return !!document.querySelector(`[class*="${rule.class_contains}"]`);
+        if (rule.text_contains) return (document.body.innerText || '').toLowerCase().includes(rule.text_contains.toLowerCase());
+        if (rule.regex) return new RegExp(rule.regex).test(document.documentElement.outerHTML);
+    } catch (e) { /* ongeldige selector/regex */ }
+    return false;
+})"""
+
+
+class ScrollStats:
+    """Scrolltijd t.o.v. de oude vaste scroll (SCROLL_STEP px per SCROLL_DELAY ms + ~1.25s delay)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.scrolls = 0
+        self.skipped = 0
+        self.seconds = 0.0
+        self.legacy = 0.0
+
+    def record(self, seconds, legacy, skipped=False):
+        with self.lock:
+            self.scrolls += 1
+            self.skipped += skipped
+            self.seconds += seconds
+            self.legacy += legacy
+
+    def print_summary(self):
+        if not self.scrolls:
+            return
+        print(f"📜 Scrolling: {self.scrolls} scrolls ({self.skipped} skipped), {self.seconds:.1f}s "
+              f"vs ~{self.legacy:.1f}s fixed-step scroll -> {self.legacy - self.seconds:.1f}s saved")
+
+
+SCROLL_STATS = ScrollStats()
+
+
+def legacy_scroll_seconds(height):
+    """Geschatte duur van de oude scroll: 1 stap per SCROLL_DELAY tot scrollHeight, plus random_delay(1000, 1500)."""
+    return math.ceil(height / Config.SCROLL_STEP) * Config.SCROLL_DELAY / 1000 + 1.25
+
+
+def rules_present(page, rules):
+    """True als alle (fetch.require) regels al in de live DOM matchen."""
+    return bool(rules) and page.evaluate(_RULES_PRESENT_JS, rules)
+
+
+def adaptive_scroll(page):
+    """
+    Scroll tot er niets nieuws meer laadt.
+
+    Returns:
+        dict: ms, jumps, height, timedOut
+    """
+    return page.evaluate(_ADAPTIVE_SCROLL_JS, {
+        "settleMs": Config.SCROLL_SETTLE_MS,
+        "quietMs": Config.SCROLL_QUIET_MS,
+        "maxMs": Config.SCROLL_MAX_MS,
+    })
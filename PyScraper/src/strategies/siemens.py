@@ -1,20 +1,40 @@
+import re
 from .base import BaseStrategy
+from .routing import ROUTING_PROFILES
 from core.config import Config
+from core.readiness import Ready
+from core.metrics import timed
+from .network_capture import JsonResponseCapture, PagedReplay, pagination_record, largest_item_list
+
+_BODY_OPEN = re.compile(r'<body[^>]*>', re.IGNORECASE)
+_VARIANT_COUNT_JS = "() => document.querySelectorAll('#productVariants .catalog-list-item').length"
 
 class SiemensStrategy(BaseStrategy):
+    ROUTING = ROUTING_PROFILES['siemens']
+    SESSION_VENDOR = 'siemens'
+    SESSION_DOMAIN = 'siemens.com'
+    LOGIN_BUTTON = 'xpath=//*[@id="headerLoginButton"]'
+    CONSENT_SELECTORS = ["button[data-testid='uc-accept-all-button']"]
+
+    READINESS = {
+        **BaseStrategy.READINESS,
+        'list_view': Ready.function("() => { const i = document.querySelector('input#listView'); return !!i && i.checked; }"),
+        'tech_table': Ready.selector("sie-ps-technical-data table, table.TEPreviewTable"),
+    }
+
     def execute(self, page, url):
         # 1. Navigeer
         print(f"  📡 Navigating to {url}")
         try:
-            page.goto(url, wait_until='networkidle', timeout=Config.TIMEOUT_PAGE_LOAD)
+            self.navigate(page, url, wait_until='networkidle')
         except Exception as e:
             print(f"  ⚠️  Navigation warning: {e}")
         
-        self.random_delay()
-        self._accept_cookies(page)
+        self.wait_ready(page, 'content', legacy_ms=1550)
+        self.accept_cookies(page)
 
-        # 2. Login indien nodig
-        self._login(page)
+        # 2. Login indien nodig (bewaarde sessie wordt hergebruikt)
+        self.ensure_session(page)
         
         # 3. Bepaal paginatype
         # We kijken of de 'Lijst weergave' controls aanwezig zijn.
@@ -31,13 +51,24 @@ class SiemensStrategy(BaseStrategy):
         print("  🧩 Type Detected: Product Variants Page")
         
         self._set_list_view(page)
-        self._load_all_variants(page)
+
+        capture = JsonResponseCapture(page) if Config.SIEMENS_CAPTURE_VARIANT_JSON else None
+        replayed = None
+        if capture and Config.SIEMENS_VARIANT_REPLAY:
+            replayed = self._replay_variant_pages(page, capture)
+
+        if replayed is None:
+            self._load_all_variants(page)
+
+        if capture:
+            capture.stop()
+            self._store_variant_json(capture, replayed)
         
-        # Gebruik de snelle jump voor extractie (variant lijsten zijn te lang voor slow scroll)
-        self._quick_scroll_bottom(page)
+        # Adaptieve scroll springt per viewport, ook voor lange variant lijsten
+        self.scroll_to_bottom(page)
         
         print("  📄 Extracting Variants HTML...")
-        return page.content()
+        return self.capture_html(page)
 
     def _execute_product_strategy(self, page):
         """Logica voor enkel product (Commercieel + Technische Tab extractie)"""
@@ -45,9 +76,19 @@ class SiemensStrategy(BaseStrategy):
         
         # --- Deel 1: Commerciële data ---
         print("  📸 Processing Step 1: Commercial Tab...")
-        # Gebruik de standaard 'langzame' scroll van BaseStrategy voor lazy loading
+        # Standaard (adaptieve) scroll van BaseStrategy voor lazy loading
         self.scroll_to_bottom(page) 
-        html_commercial = page.content()
+        html_commercial = self.capture_html(page)
+
+        # Alles tot de sluitende body tag kan al weggeschreven worden (streaming);
+        # de tech tab content komt daarna, de staart sluit het document af.
+        body_close = html_commercial.find("</body>")
+        if body_close == -1:
+            # Fallback als er geen body tag is
+            body_close = len(html_commercial)
+        self.emit(html_commercial[:body_close])
+        commercial_tail = html_commercial[body_close:]
+        del html_commercial
         
         # --- Deel 2: Technische data ---
         # Probeer naar tweede tab te gaan
@@ -55,74 +96,53 @@ class SiemensStrategy(BaseStrategy):
             print("  📸 Processing Step 2: Technical Tab...")
             # Wederom scrollen op de nieuwe pagina
             self.scroll_to_bottom(page)
-            html_tech = page.content()
+            html_tech = self.capture_html(page)
             
             print("  ➕ Concatenating HTML outputs (Commercial + Technical)...")
             
             # BELANGRIJK: We injecteren de content van de 2e pagina IN de body van de 1e pagina.
             # Simpelweg erachter plakken zorgt voor ongeldige HTML (dubbele <html/body> tags)
             # waardoor parsers (zoals BeautifulSoup) het tweede deel volledig negeren.
-            import re
-            
-            tech_content = html_tech
-            tech_body_match = re.search(r'<body[^>]*>(.*?)</body>', html_tech, re.DOTALL | re.IGNORECASE)
-            if tech_body_match:
-                tech_content = tech_body_match.group(1)
+            # Enkel de body grenzen zoeken (geen DOTALL regex over de hele pagina).
+            start, end = 0, len(html_tech)
+            body_open = _BODY_OPEN.search(html_tech)
+            if body_open:
+                close = html_tech.find("</body>", body_open.end())
+                if close != -1:
+                    start, end = body_open.end(), close
             
             separator = "\n\n<!-- ============================================= -->\n" \
                         "<!-- === APPENDED DATA: TECHNISCHE GEGEVENS TAB === -->\n" \
                         "<!-- ============================================= -->\n\n"
             
             # Injecteer voor de sluitende body tag van de commerciële HTML
-            if "</body>" in html_commercial:
-                final_html = html_commercial.replace("</body>", separator + tech_content + "\n</body>")
-                return final_html
-            else:
-                # Fallback als er geen body tag is
-                return html_commercial + separator + tech_content
+            self.emit(separator)
+            self.emit(html_tech[start:end] + ("\n" if commercial_tail else ""))
         
-        return html_commercial
-
-    def _login(self, page):
-        """Voert de login procedure uit indien niet ingelogd."""
-        import configparser
-        import os
+        return self.finish(commercial_tail)
 
-        # Check of we moeten inloggen. We gebruiken de specifieke XPath van de knop.
-        login_button_selector = 'xpath=//*[@id="headerLoginButton"]'
-        
+    def is_logged_in(self, page):
+        """Login knop in de header = niet ingelogd. De header laadt soms traag (max 5s)."""
         try:
-             # We wachten heel even (max 5s) tot de knop verschijnt, voor het geval de header traag laadt
-             page.wait_for_selector(login_button_selector, state='visible', timeout=5000)
-        except:
-             # Timeout = knop niet gevonden
-             print(f"  ℹ️  Already logged in or login button not found (checked {login_button_selector}).")
-             return
+            page.wait_for_selector(self.LOGIN_BUTTON, state='visible', timeout=5000)
+            return False
+        except Exception:
+            return True
 
-        print("  🔑 Initiating login sequence...")
-        
-        # Laad credentials
-        config = configparser.ConfigParser()
-        if not os.path.exists(Config.SECRETS_PATH):
-             print(f"  ⚠️  Secrets file not found at {Config.SECRETS_PATH}")
-             return
-            
-        config.read(Config.SECRETS_PATH)
-        if 'siemens' not in config:
-             print("  ⚠️  No [siemens] section in secrets file")
-             return
+    def login(self, page, credentials):
+        """Voert de login procedure uit indien niet ingelogd."""
+        if self.is_logged_in(page):
+            print(f"  ℹ️  Already logged in or login button not found (checked {self.LOGIN_BUTTON}).")
+            return
 
-        email = config['siemens'].get('email')
-        password = config['siemens'].get('password')
-        
-        if not email or not password:
-             print("  ⚠️  Email or password not found in secrets file")
-             return
+        print("  🔑 Initiating login sequence...")
+        email = credentials['email']
+        password = credentials['password']
 
         try:
              # 1. Klik op login knop in header
              # Selector van gebruiker: //*[@id="headerLoginButton"]
-             login_btn = page.locator('xpath=//*[@id="headerLoginButton"]').first
+             login_btn = page.locator(self.LOGIN_BUTTON).first
              if login_btn.is_visible():
                   print("  👆 Clicking header login button...")
                   login_btn.click()
@@ -165,25 +185,10 @@ class SiemensStrategy(BaseStrategy):
 
     #From here: Helper Functions
     
-    def _accept_cookies(self, page):
-        cookie_selectors = [
-            'button[data-testid="uc-accept-all-button"]',
-            '#usercentrics-root button[data-testid="uc-accept-all-button"]'
-        ]
-        for sel in cookie_selectors:
-            if page.locator(sel).is_visible():
-                try:
-                    print("  🍪 Accepting cookies...")
-                    page.click(sel)
-                    self.random_delay()
-                    break
-                except:
-                    pass
-
+    @timed('actions')
     def _set_list_view(self, page):
         print("  👀 Checking View State...")
         try:
-            self.random_delay(1000, 1500)
             list_view_label = page.locator('label[for="listView"]')
             is_active = page.locator('input#listView').is_checked()
             
@@ -192,17 +197,17 @@ class SiemensStrategy(BaseStrategy):
             elif list_view_label.count() > 0:
                 print("  📋 Switching to List View...")
                 list_view_label.first.scroll_into_view_if_needed()
-                self.random_delay(500)
                 list_view_label.click(force=True)
-                self.random_delay(2000, 3000)
+                self.wait_ready(page, 'list_view', legacy_ms=2500, timeout=5000)
             else:
                 fallback = page.get_by_title("Lijst weergave")
                 if fallback.count() > 0:
                     fallback.click(force=True)
-                    self.random_delay(2000, 3000)
+                    self.wait_ready(page, 'list_view', legacy_ms=2500, timeout=5000)
         except Exception as e:
             print(f"  ⚠️  Could not switch to List View: {e}")
 
+    @timed('pagination')
     def _load_all_variants(self, page):
         print("  🔄 Starting Infinite Scroll Loop...")
         load_more_selector = "button.infinite-pagination__load-more-btn"
@@ -213,9 +218,11 @@ class SiemensStrategy(BaseStrategy):
                 try:
                     print("  👇 Clicking 'Meer laden'...")
                     button.scroll_into_view_if_needed()
-                    self.random_delay(500, 1000)
+                    before = page.evaluate(_VARIANT_COUNT_JS)
                     button.click()
-                    self.random_delay(2000, 3000) 
+                    # Wacht tot er nieuwe varianten in de lijst staan
+                    grown = Ready.function(f"(prev) => ({_VARIANT_COUNT_JS})() > prev", arg=before)
+                    self.wait_ready(page, grown, legacy_ms=2500)
                 except Exception as e:
                     print(f"  ⚠️  Error clicking 'Meer laden': {e}")
                     break
@@ -223,6 +230,63 @@ class SiemensStrategy(BaseStrategy):
                 print("  ✅ All variants loaded.")
                 break
 
+    @timed('pagination')
+    def _replay_variant_pages(self, page, capture):
+        """
+        Klik één keer 'Meer laden' om de paginatie API te leren kennen en speel die
+        daarna zelf af (grotere pagina's, parallel). Geeft de items of None (-> klikken).
+        """
+        button = page.locator("button.infinite-pagination__load-more-btn")
+        if not button.is_visible():
+            return None
+
+        already_seen = len(capture.responses)
+        before = page.evaluate(_VARIANT_COUNT_JS)
+        button.click()
+        grown = Ready.function(f"(prev) => ({_VARIANT_COUNT_JS})() > prev", arg=before)
+        self.wait_ready(page, grown, legacy_ms=2500)
+
+        record = pagination_record(capture.collect(start=already_seen))
+        if not record:
+            print("  ℹ️  No paging API response seen, falling back to clicking.")
+            return None
+
+        replay = PagedReplay(record, Config.SIEMENS_REPLAY_PAGE_SIZE, Config.SIEMENS_REPLAY_CONCURRENCY)
+        if not replay.supported():
+            print("  ℹ️  Paging parameters not recognised, falling back to clicking.")
+            return None
+
+        print(f"  ⚡ Replaying paging API ({Config.SIEMENS_REPLAY_PAGE_SIZE}/page, {Config.SIEMENS_REPLAY_CONCURRENCY} parallel)...")
+        items = replay.run(page)
+        if items is not None:
+            print(f"  ✅ {len(items)} variants fetched via API.")
+        return items
+
+    def _store_variant_json(self, capture, replayed):
+        """Bewaar de gestructureerde varianten als sidecar (siemens_variants.json)."""
+        records = capture.collect()
+        record = pagination_record(records)
+        if replayed is not None:
+            items, source = replayed, "replay"
+        else:
+            # Alle 'Meer laden' responses van dezelfde endpoint samenvoegen
+            endpoint = record["url"].split("?")[0] if record else None
+            items = [item for r in records if endpoint and r["url"].split("?")[0] == endpoint
+                     for item in largest_item_list(r["data"])]
+            source = "capture"
+
+        if not items:
+            return
+
+        print(f"  🗂️  Captured {len(items)} variant records from the paging API ({source}).")
+        self.artifacts["siemens_variants"] = {
+            "source": source,
+            "endpoint": record["url"] if record else None,
+            "responses": len(records),
+            "items": items,
+        }
+
+    @timed('actions')
     def _click_tech_tab(self, page):
         print("  🖱️  Looking for 'Technische gegevens' tab...")
         try:
@@ -234,7 +298,7 @@ class SiemensStrategy(BaseStrategy):
             if tab_locator.count() > 0:
                 print("  👇 Clicking Tech Tab...")
                 tab_locator.first.click(force=True)
-                self.random_delay(3000, 4000) # Goede delay voor laden nieuwe content
+                self.wait_ready(page, 'tech_table', legacy_ms=3500)
                 return True
             else:
                 print("  ⚠️  Tab 'Technische gegevens' not found.")
@@ -242,11 +306,4 @@ class SiemensStrategy(BaseStrategy):
             print(f"  ⚠️  Error clicking tab: {e}")
         return False
 
-    def _quick_scroll_bottom(self, page):
-        """Snelle scroll voor lange lijsten."""
-        print("  ⚡ Fast-Scrolling to bottom...")
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        self.random_delay(1500, 2500)
-        page.evaluate("window.scrollTo(0, 0)")
-
     # Opmerking: perform_actions is niet meer nodig omdat we execute() overriden.
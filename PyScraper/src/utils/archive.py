@@ -0,0 +1,236 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+import zlib
+from core.config import Config
+from utils.vendor_specs import vendor_for_url
+
+# Output pad van een record in het archief: '<segment>.warc.gz#<offset>'
+_LOCATOR = re.compile(r"^(?P<segment>.+\.warc\.gz)#(?P<offset>\d+)$")
+_CHUNK = 1024 * 1024
+
+
+def parse_locator(path):
+    """(segment, offset) als path naar een archief record wijst, anders None."""
+    match = _LOCATOR.match(str(path))
+    return (match.group("segment"), int(match.group("offset"))) if match else None
+
+
+def is_locator(path):
+    return parse_locator(path) is not None
+
+
+def output_exists(path):
+    """os.path.exists, maar ook voor archief locators (het segment moet bestaan)."""
+    located = parse_locator(path)
+    return os.path.exists(located[0] if located else path)
+
+
+def read_record(path):
+    """
+    Lees één record via random access: seek naar de offset en decompressie van enkel
+    dat gzip member. Geeft (headers, payload bytes).
+    """
+    segment, offset = parse_locator(path)
+    with open(segment, "rb") as f:
+        f.seek(offset)
+        decompressor = zlib.decompressobj(wbits=31)
+        data = []
+        while not decompressor.eof:
+            chunk = f.read(_CHUNK)
+            if not chunk:
+                raise EOFError(f"Truncated archive record: {path}")
+            data.append(decompressor.decompress(chunk))
+    return _parse_record(b"".join(data))
+
+
+def _parse_record(raw):
+    head, _, body = raw.partition(b"\r\n\r\n")
+    headers = {}
+    for line in head.decode("utf-8").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip()] = value.strip()
+    return headers, body[:int(headers.get("Content-Length", len(body)))]
+
+
+class ArchiveWriter:
+    """
+    WARC-achtig archief voor gecapturede pagina's i.p.v. één los .html bestand per URL.
+
+    Elk record (WARC/1.1 headers + HTML) is een apart gzip member in een rollend segment
+    (<output>/archive/pages-<run>-<pid>-<n>.warc.gz, nieuw segment boven
+    Config.ARCHIVE_SEGMENT_MB). Een record kan dus los gedecomprimeerd worden vanaf zijn
+    offset; de sidecar index (<segment>.idx, JSONL) zegt per URL waar. Sidecar data
+    (bv. Siemens variant JSON) gaat mee als 'metadata' record.
+
+    Het output pad van een pagina wordt '<segment>#<offset>' (zie read_record, en
+    MainScraperEngine/core/archive.py voor de MSE kant).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.archive_dir = None
+        self.run_id = None
+        self.segment = None
+        self.file = None
+        self.index = None
+        self.sequence = 0
+        self.segments = 0
+        self.records = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def start(self, output_dir, run_id):
+        self.archive_dir = os.path.join(str(output_dir), "archive")
+        self.run_id = run_id
+
+    def write_page(self, url, html=None, path=None, strategy=None, capture_mode=None):
+        """
+        Archiveer een pagina: een HTML string, of het pad van een gestreamde capture.
+
+        Returns:
+            str: locator '<segment>#<offset>'
+        """
+        return self._write(url, html if path is None else path, "resource", "text/html; charset=utf-8", {
+            "PyScraper-Vendor": vendor_for_url(url),
+            "PyScraper-Strategy": strategy,
+            "PyScraper-Capture-Mode": capture_mode,
+        }, streamed=path is not None)
+
+    def write_sidecar(self, url, name, data):
+        """Extra data bij een pagina als WARC 'metadata' record."""
+        payload = json.dumps(data, ensure_ascii=False)
+        return self._write(url, payload, "metadata", "application/json", {
+            "PyScraper-Vendor": vendor_for_url(url),
+            "PyScraper-Name": name,
+        })
+
+    def _write(self, url, content, record_type, content_type, extra, streamed=False):
+        if streamed:
+            length, digest = _file_digest(content)
+        else:
+            body = content.encode("utf-8") if isinstance(content, str) else content
+            length, digest = len(body), hashlib.sha256(body).hexdigest()
+
+        record_id = f"<urn:uuid:{uuid.uuid4()}>"
+        date = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        headers = {
+            "WARC-Type": record_type,
+            "WARC-Record-ID": record_id,
+            "WARC-Date": date,
+            "WARC-Target-URI": url,
+            "WARC-Block-Digest": f"sha256:{digest}",
+            "Content-Type": content_type,
+            **{k: v for k, v in extra.items() if v},
+            "Content-Length": str(length),
+        }
+        head = ("WARC/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n").encode("utf-8")
+
+        with self.lock:
+            self._ensure_segment()
+            offset = self.file.tell()
+            try:
+                if streamed:
+                    self._write_member_from_file(head, content)
+                else:
+                    # Eén gzip member per record: los te decomprimeren vanaf zijn offset
+                    self.file.write(gzip.compress(head + body + b"\r\n\r\n", compresslevel=Config.ARCHIVE_COMPRESSLEVEL))
+                self.file.flush()
+            except BaseException:
+                self._discard_partial(offset)
+                raise
+            size = self.file.tell() - offset
+            entry = {
+                "url": url, "offset": offset, "length": size, "type": record_type,
+                "name": extra.get("PyScraper-Name"), "date": date, "id": record_id,
+                "digest": f"sha256:{digest}", "size": length,
+            }
+            self.index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.index.flush()
+            self.records += 1
+            self.bytes_in += length
+            self.bytes_out += size
+            return f"{self.segment}#{offset}"
+
+    def _write_member_from_file(self, head, path):
+        """Gestreamde capture in stukken comprimeren, zonder het hele document in geheugen."""
+        compressor = zlib.compressobj(Config.ARCHIVE_COMPRESSLEVEL, zlib.DEFLATED, 31)
+        self.file.write(compressor.compress(head))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b""):
+                self.file.write(compressor.compress(chunk))
+        self.file.write(compressor.compress(b"\r\n\r\n"))
+        self.file.write(compressor.flush())
+
+    def _discard_partial(self, offset):
+        """
+        Half geschreven member weg (bv. leesfout midden in een gestreamde capture), zodat
+        het volgende record niet achter een kapot member komt; lock vastgehouden.
+        """
+        try:
+            self.file.truncate(offset)
+            self.file.seek(offset)
+        except OSError:
+            # Niet terug te draaien (schijf vol?): volgende records in een nieuw segment
+            try:
+                self._close_segment()
+            except OSError:
+                self.file = self.index = None
+
+    def _ensure_segment(self):
+        """Open (of rol naar) een segment; lock vastgehouden."""
+        limit = Config.ARCHIVE_SEGMENT_MB * 1024 * 1024
+        if self.file is not None and self.file.tell() < limit:
+            return
+        self._close_segment()
+        os.makedirs(self.archive_dir, exist_ok=True)
+        # pid in de naam: shard processen schrijven elk hun eigen segmenten
+        while True:
+            self.sequence += 1
+            name = f"pages-{self.run_id}-{os.getpid()}-{self.sequence:05d}.warc.gz"
+            self.segment = os.path.join(self.archive_dir, name)
+            if not os.path.exists(self.segment):
+                break
+        self.segments += 1
+        self.file = open(self.segment, "ab")
+        self.index = open(f"{self.segment}.idx", "a", encoding="utf-8")
+        info = f"software: PyScraper\r\nformat: WARC File Format 1.1\r\nrun-id: {self.run_id}\r\n".encode("utf-8")
+        head = (f"WARC/1.1\r\nWARC-Type: warcinfo\r\nWARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+                f"WARC-Date: {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}\r\nWARC-Filename: {name}\r\n"
+                f"Content-Type: application/warc-fields\r\nContent-Length: {len(info)}\r\n\r\n").encode("utf-8")
+        self.file.write(gzip.compress(head + info + b"\r\n\r\n", compresslevel=Config.ARCHIVE_COMPRESSLEVEL))
+
+    def _close_segment(self):
+        if self.file is not None:
+            self.file.close()
+            self.index.close()
+            self.file = self.index = None
+
+    def close(self):
+        with self.lock:
+            self._close_segment()
+
+    def print_summary(self):
+        if not self.records:
+            return
+        ratio = self.bytes_out / self.bytes_in if self.bytes_in else 0
+        print(f"🗄️  Archive: {self.records} records, {self.bytes_in / 1024 / 1024:.1f} MB -> "
+              f"{self.bytes_out / 1024 / 1024:.1f} MB ({ratio:.0%}) in {self.segments} segment(s) -> {self.archive_dir}")
+
+
+def _file_digest(path):
+    sha = hashlib.sha256()
+    length = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            sha.update(chunk)
+            length += len(chunk)
+    return length, sha.hexdigest()
+
+
+ARCHIVE = ArchiveWriter()
@@ -0,0 +1,215 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from core.config import Config
+from utils.vendor_specs import vendor_for_url, volatile_rules
+
+_CHUNK = 1024 * 1024
+
+# Stukken HTML die per request wijzigen zonder dat de pagina inhoudelijk verandert.
+# (patroon, vervanging); vendors voegen er via 'fetch.volatile' in Vendor_YML.yaml aan toe.
+_VOLATILE = [
+    # Attributen met per-request waarden
+    (r'\s(?:nonce|integrity|data-csrf[\w-]*|data-request-id|data-timestamp)="[^"]*"', ""),
+    # CSRF meta tags, hidden token inputs en tokens in inline JSON
+    (r'(<meta[^>]+name="[^"]*(?:csrf|xsrf)[^"]*"[^>]*content=")[^"]*"', r'\1"'),
+    (r'(<input[^>]+name="[^"]*(?:token|csrf)[^"]*"[^>]*value=")[^"]*"', r'\1"'),
+    (r'("(?:csrfToken|csrf_token|xsrfToken|authenticity_token|requestId|nonce)"\s*:\s*")[^"]*"', r'\1"'),
+    # Session ids in URLs
+    (r";jsessionid=[^?#\"']*", ""),
+    (r"([?&])(?:sid|sessionid|_ga|_gl)=[^&#\"']*", r"\1"),
+    # Timestamps en cache busters
+    (r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?", ""),
+    (r"([?&](?:_|t|ts|timestamp|cb)=)\d{10,13}", r"\1"),
+]
+
+
+@lru_cache(maxsize=None)
+def _rules(vendor):
+    rules = list(_VOLATILE)
+    for rule in volatile_rules(vendor):
+        if "regex" in rule:
+            rules.append((rule["regex"], rule.get("replace", "")))
+        elif "attribute" in rule:
+            rules.append((rf'\s{re.escape(rule["attribute"])}="[^"]*"', ""))
+    return [(re.compile(pattern, re.IGNORECASE), replace) for pattern, replace in rules]
+
+
+def normalize_html(html, vendor):
+    """HTML zonder volatiele stukken (tokens, nonces, timestamps, session ids), voor de content hash."""
+    for pattern, replace in _rules(vendor):
+        html = pattern.sub(replace, html)
+    return html
+
+
+def content_key(html, vendor):
+    """sha256 van de genormaliseerde HTML: dezelfde key = inhoudelijk dezelfde pagina."""
+    return hashlib.sha256(normalize_html(html, vendor).encode("utf-8")).hexdigest()
+
+
+def _html_chunks(path):
+    """
+    Lees een gestreamde capture in stukken van ~_CHUNK die op een '>' eindigen, zodat de
+    volatiele patronen (binnen een tag of attribuut) niet over een grens vallen.
+
+    Beperking: een match die toch over een grens loopt (bv. een '>' in een token waarde)
+    wordt niet genormaliseerd; dat kost enkel een extra blob, geen fout resultaat.
+    """
+    carry = ""
+    with open(path, "r", encoding="utf-8") as f:
+        for block in iter(lambda: f.read(_CHUNK), ""):
+            block = carry + block
+            cut = block.rfind(">") + 1
+            carry = block[cut:]
+            if cut:
+                yield block[:cut]
+    if carry:
+        yield carry
+
+
+class BlobStore:
+    """
+    Content-addressed opslag van captures over runs heen.
+
+    Een pagina wordt bewaard onder de hash van zijn genormaliseerde HTML
+    (<output>/blobs/objects/<key[:2]>/<key>.html.gz); een pagina die enkel in tokens of
+    timestamps verschilt van een eerdere capture wordt dus niet opnieuw opgeslagen
+    (de eerste capture blijft het blob). Sidecar JSON gaat op dezelfde manier (.json.gz).
+
+    Per run een manifest (<output>/blobs/manifests/<run_id>.jsonl): URL -> blob, met of
+    het blob nieuw was. Het output pad van een pagina is het blob pad; de bestandsnaam
+    is de content key, die MSE als key voor zijn resultaat cache gebruikt.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.store_dir = None
+        self.run_id = None
+        self.pages = 0
+        self.new = 0
+        self.bytes_in = 0
+        self.bytes_stored = 0
+
+    def start(self, output_dir, run_id):
+        self.store_dir = os.path.join(str(output_dir), "blobs")
+        self.run_id = run_id
+
+    def put_page(self, url, html=None, path=None):
+        """
+        Bewaar een pagina (HTML string, of het pad van een gestreamde capture).
+        Een gestreamde capture wordt in stukken gehasht en gecomprimeerd (zie _html_chunks),
+        niet in zijn geheel ingelezen.
+
+        Returns:
+            str: pad van het blob
+        """
+        vendor = vendor_for_url(url)
+        if path is not None:
+            key, size, blob, stored = self._put_file(path, vendor)
+        else:
+            key = content_key(html, vendor)
+            body = html.encode("utf-8")
+            size = len(body)
+            blob, stored = self._put(key, ".html.gz", body)
+        self._record({"url": url, "vendor": vendor, "key": key, "blob": blob, "bytes": size, "new": bool(stored)})
+        with self.lock:
+            self.pages += 1
+            self.new += bool(stored)
+            self.bytes_in += size
+            self.bytes_stored += stored
+        return blob
+
+    def put_json(self, url, name, data):
+        """Sidecar data (bv. Siemens variant JSON) als blob; key = hash van de canonieke JSON."""
+        payload = json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        key = hashlib.sha256(payload).hexdigest()
+        blob, stored = self._put(key, ".json.gz", payload)
+        self._record({"url": url, "name": name, "key": key, "blob": blob, "bytes": len(payload), "new": bool(stored)})
+        with self.lock:
+            self.bytes_stored += stored
+        return blob
+
+    def _put(self, key, suffix, payload):
+        """Schrijf het object als het nog niet bestaat. Geeft (pad, geschreven bytes)."""
+        path = self._object_path(key, suffix)
+        if os.path.exists(path):
+            return path, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = gzip.compress(payload, compresslevel=Config.BLOB_COMPRESSLEVEL)
+        # Atomisch: een ander proces (shard) met dezelfde inhoud schrijft hetzelfde object
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp, path)
+        return path, len(compressed)
+
+    def _put_file(self, source, vendor):
+        """
+        Hash en comprimeer een HTML bestand in één doorgang; de key is pas op het einde
+        gekend, dus eerst naar een tmp bestand en dan op zijn plaats zetten (of weggooien).
+
+        Returns:
+            (key, bytes in, pad, geschreven bytes)
+        """
+        objects = os.path.join(self.store_dir, "objects")
+        os.makedirs(objects, exist_ok=True)
+        tmp = os.path.join(objects, f"stream.{os.getpid()}.{threading.get_ident()}.tmp")
+        sha = hashlib.sha256()
+        size = 0
+        with open(tmp, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=Config.BLOB_COMPRESSLEVEL) as out:
+            for chunk in _html_chunks(source):
+                sha.update(normalize_html(chunk, vendor).encode("utf-8"))
+                body = chunk.encode("utf-8")
+                out.write(body)
+                size += len(body)
+        key = sha.hexdigest()
+        path = self._object_path(key, ".html.gz")
+        if os.path.exists(path):
+            os.remove(tmp)
+            return key, size, path, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        stored = os.path.getsize(tmp)
+        os.replace(tmp, path)
+        return key, size, path, stored
+
+    def _object_path(self, key, suffix):
+        return os.path.join(self.store_dir, "objects", key[:2], f"{key}{suffix}")
+
+    def manifest_path(self, run_id=None):
+        return os.path.join(self.store_dir, "manifests", f"{run_id or self.run_id}.jsonl")
+
+    def _record(self, entry):
+        line = json.dumps({**entry, "stored_at": time.strftime("%Y-%m-%dT%H:%M:%S")}, ensure_ascii=False)
+        with self.lock:
+            os.makedirs(os.path.dirname(self.manifest_path()), exist_ok=True)
+            # Eén write per regel in append modus: ook veilig met meerdere shard processen
+            with open(self.manifest_path(), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def manifest(self, run_id=None):
+        """URL -> blob pad van de pagina's in een run (laatste capture per URL)."""
+        pages = {}
+        try:
+            with open(self.manifest_path(run_id), "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if not entry.get("name"):
+                        pages[entry["url"]] = entry["blob"]
+        except FileNotFoundError:
+            pass
+        return pages
+
+    def print_summary(self):
+        if not self.pages:
+            return
+        print(f"🧬 Blob store: {self.pages} pages, {self.new} new blobs, {self.pages - self.new} deduplicated, "
+              f"{self.bytes_in / 1024 / 1024:.1f} MB captured -> {self.bytes_stored / 1024 / 1024:.1f} MB stored "
+              f"-> {self.manifest_path()}")
+
+
+BLOBS = BlobStore()
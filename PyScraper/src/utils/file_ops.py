@@ -1,26 +1,30 @@
 import os
 import re
+import gzip
+import json
 from urllib.parse import urlparse
 from pathlib import Path
 
 def ensure_dir(path):
     Path(path).mkdir(parents=True, exist_ok=True)
 
-def read_urls(filepath):
+def iter_urls(filepath):
+    """Lees URLs regel per regel (streaming, ook voor zeer grote lijsten)."""
     if not os.path.exists(filepath):
         # Maak dummy file aan als hij niet bestaat
         ensure_dir(os.path.dirname(filepath))
         with open(filepath, 'w') as f:
             f.write("# P plak je URLs hier, 1 per regel\n")
-        return []
+        return
 
-    urls = []
     with open(filepath, 'r', encoding='utf-8') as f:
         for line in f:
             line = line.strip()
             if line and not line.startswith('#'):
-                urls.append(line)
-    return urls
+                yield line
+
+def read_urls(filepath):
+    return list(iter_urls(filepath))
 
 def save_html(output_dir, url, content):
     filename = safe_filename_from_url(url)
@@ -30,6 +34,74 @@ def save_html(output_dir, url, content):
         f.write(content)
     return filepath
 
+class StreamedSnapshot:
+    """Resultaat van een strategy die zelf al naar schijf gestreamd heeft."""
+
+    def __init__(self, path, size, parts):
+        self.path = path
+        self.size = size
+        self.parts = parts
+
+
+class SnapshotWriter:
+    """
+    Schrijft een HTML document stuk voor stuk weg zodra een pagina gecaptured is,
+    i.p.v. alles in geheugen te verzamelen. Het bestand heet '<naam>.partial' tot
+    close(); na een crash blijft de partial met alle pagina's tot dan toe bestaan.
+    """
+
+    def __init__(self, output_dir, url, compress=False):
+        filename = safe_filename_from_url(url) + ('.gz' if compress else '')
+        self.path = os.path.join(output_dir, filename)
+        self.partial_path = self.path + '.partial'
+        self.compress = compress
+        self.file = None
+        self.size = 0
+        self.parts = 0
+
+    def write(self, fragment):
+        if self.file is None:
+            # Pas openen bij de eerste write: strategies die niet streamen laten geen bestand achter
+            if self.compress:
+                self.file = gzip.open(self.partial_path, 'wt', encoding='utf-8')
+            else:
+                self.file = open(self.partial_path, 'w', encoding='utf-8')
+
+        self.file.write(fragment)
+        # Flush per fragment: gzip doet een Z_SYNC_FLUSH, dus ook de partial .gz is leesbaar
+        self.file.flush()
+        self.size += len(fragment)
+        self.parts += 1
+
+    def close(self, tail=''):
+        """Sluit de document envelope af en zet het bestand op zijn definitieve naam."""
+        if self.file is None:
+            return None
+        self.write(tail)
+        self.file.close()
+        self.file = None
+        os.replace(self.partial_path, self.path)
+        return StreamedSnapshot(self.path, self.size, self.parts - 1)
+
+    def abort(self, tail=''):
+        """Na een fout: envelope afsluiten maar als .partial bewaren."""
+        if self.file is None:
+            return None
+        self.write(tail)
+        self.file.close()
+        self.file = None
+        return self.partial_path
+
+
+def save_sidecar(output_dir, url, name, data):
+    """Schrijf extra data (bv. gecapturede API JSON) naast de HTML: <bestand>.<name>.json"""
+    base = safe_filename_from_url(url)[:-len('.html')]
+    filepath = os.path.join(output_dir, f"{base}.{name}.json")
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    return filepath
+
 def safe_filename_from_url(url: str) -> str:
     parsed = urlparse(url)
     domain = parsed.netloc.replace('www.', '')
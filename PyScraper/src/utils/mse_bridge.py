@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from core.config import Config
+
+# MSE en PyScraper hebben allebei een top-level 'core' package, dus MSE draait
+# in een apart proces met zijn eigen sys.path.
+_RUNNER = """
+import contextlib, io, json, sys
+sys.path.insert(0, sys.argv[1])
+from core.scraper import scrape_file
+
+results = {}
+for path in sys.argv[2:]:
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = scrape_file(path)
+        result.get("metadata", {}).pop("extraction_timestamp", None)
+        results[path] = result
+    except Exception as e:
+        results[path] = {"error": str(e)}
+json.dump(results, sys.stdout, ensure_ascii=False)
+"""
+
+
+def run_mse(paths, timeout=300):
+    """
+    Draai MSE op een lijst HTML bestanden.
+
+    Returns:
+        dict: pad -> MSE resultaat (zonder extraction_timestamp), of {"error": ...}
+    """
+    if not paths:
+        return {}
+
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    proc = subprocess.run(
+        [sys.executable, "-c", _RUNNER, str(Config.MSE_DIR), *[str(p) for p in paths]],
+        capture_output=True, text=True, encoding="utf-8", timeout=timeout, env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"MSE failed: {proc.stderr.strip()[-500:]}")
+    return json.loads(proc.stdout)
+
+
+def run_mse_html(*html_docs):
+    """Draai MSE op HTML strings (via tijdelijke bestanden). Geeft resultaten in dezelfde volgorde."""
+    with tempfile.TemporaryDirectory(prefix="mse_") as tmp:
+        paths = []
+        for i, html in enumerate(html_docs):
+            path = os.path.join(tmp, f"doc_{i}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+            paths.append(path)
+        results = run_mse(paths)
+        return [results[p] for p in paths]
+
+
+def compare_mse_output(html_a, html_b):
+    """
+    Vergelijk de MSE output (vendor + kv) van twee HTML documenten.
+
+    Returns:
+        (bool, list): gelijk?, lijst van secties die verschillen
+    """
+    a, b = run_mse_html(html_a, html_b)
+    if "error" in a or "error" in b:
+        return False, [a.get("error") or b.get("error")]
+
+    diffs = []
+    if a.get("vendor") != b.get("vendor"):
+        diffs.append("vendor")
+    kv_a, kv_b = a.get("kv", {}), b.get("kv", {})
+    for section in sorted(set(kv_a) | set(kv_b)):
+        if kv_a.get(section) != kv_b.get(section):
+            diffs.append(section)
+    return not diffs, diffs
@@ -0,0 +1,164 @@
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+import yaml
+from bs4 import BeautifulSoup
+from core.config import Config
+
+# Zelfde mapping als MainScraperEngine/core/detector.py (canonical URL -> vendor)
+URL_VENDOR_MAP = {
+    "new.abb.com": "abb",
+    "abb.com": "abb",
+    "phoenixcontact.com": "phoenix",
+    "new.schneider-electric.com": "schneider",
+    "se.com": "schneider",
+    "siemens.com": "siemens",
+    "vega.com": "vega",
+    "nexans.": "nexans",
+}
+
+
+@lru_cache(maxsize=1)
+def load_vendor_configs():
+    """Laad Vendor_YML.yaml van MainScraperEngine (één keer per proces)."""
+    with open(Config.VENDOR_YML_PATH, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def vendor_for_url(url):
+    """Geef de MSE vendor key voor een URL, of 'generic'."""
+    netloc = urlparse(url).netloc.lower()
+    for domain, vendor in URL_VENDOR_MAP.items():
+        if domain in netloc:
+            return vendor
+    return "generic"
+
+
+def vendor_config(vendor):
+    return load_vendor_configs().get(vendor) or {}
+
+
+def match_rule(soup, html, rule):
+    """
+    Evalueer één detect/require regel zoals MSE dat doet.
+    Extra type 'regex' matcht op de ruwe HTML (bv. ABB's 'var model = {').
+    """
+    if "id" in rule:
+        return soup.find(id=rule["id"]) is not None
+    if "selector" in rule:
+        return soup.select_one(rule["selector"]) is not None
+    if "class_contains" in rule:
+        search_class = rule["class_contains"]
+        return soup.find(class_=lambda c: c and search_class in c) is not None
+    if "text_contains" in rule:
+        return rule["text_contains"].lower() in soup.get_text().lower()
+    if "regex" in rule:
+        return re.search(rule["regex"], html) is not None
+    return False
+
+
+def has_required_content(html, vendor):
+    """
+    Check of HTML alles bevat wat MSE voor deze vendor nodig heeft.
+
+    Gebruikt 'fetch.require' (ALLE regels moeten matchen) indien geconfigureerd,
+    anders de structurele 'detect' regels (minstens één moet matchen).
+    """
+    config = vendor_config(vendor)
+    soup = BeautifulSoup(html, "html.parser")
+
+    require = (config.get("fetch") or {}).get("require")
+    if require:
+        return all(match_rule(soup, html, rule) for rule in require)
+
+    # text_contains matcht ook op een lege app-shell, dus niet bruikbaar als bewijs
+    detect = [r for r in (config.get("detect") or []) if "text_contains" not in r]
+    return any(match_rule(soup, html, rule) for rule in detect)
+
+
+def required_rules(vendor):
+    """De 'fetch.require' regels van een vendor (leeg als er geen zijn)."""
+    return (vendor_config(vendor).get("fetch") or {}).get("require") or []
+
+
+def volatile_rules(vendor):
+    """De 'fetch.volatile' regels van een vendor (extra volatiele stukken voor de blob store)."""
+    return (vendor_config(vendor).get("fetch") or {}).get("volatile") or []
+
+
+def http_first_enabled(vendor):
+    return bool((vendor_config(vendor).get("fetch") or {}).get("http_first"))
+
+
+# Spec keys die (top-level) CSS selectors bevatten
+_SELECTOR_KEYS = ("rows", "selector", "variant_selector", "json_selector", "cards_selector")
+# Spec types die de hele pagina doorzoeken en dus geen fragmenten toelaten
+_WHOLE_PAGE_TYPES = ("label_value",)
+# Datasheet fallback zoekt alle links die naar een datasheet lijken
+_DATASHEET_LINKS = (
+    "a[href$='.pdf' i]", "a[href*='datasheet' i]", "a[href*='productfiche' i]",
+    "a[href*='datenblatt' i]", "a[href*='/product/pdf/' i]",
+)
+# Schneider image fallbacks (zie schneider/json_parser.py _extract_image_url)
+_SCHNEIDER_IMAGE = (
+    "div.zoom__viewer", "img.zoom__img", "div.mobile-media__slide", "div.mobile-media__slide-360",
+    "[href*='download.schneider-electric.com']", "[src*='download.schneider-electric.com']",
+)
+
+
+def fragment_selectors(vendor):
+    """
+    Leid uit de specs + detect regels af welke elementen MSE leest voor deze vendor.
+
+    Returns:
+        list | None: CSS selectors, of None als de vendor de volledige pagina nodig heeft
+    """
+    config = vendor_config(vendor)
+    if vendor == "generic" or not config.get("specs"):
+        return None
+
+    selectors = []
+    for spec in config["specs"]:
+        spec_type = spec.get("type")
+        if spec_type in _WHOLE_PAGE_TYPES:
+            return None
+
+        container = spec.get("container")
+        if container and container != "body":
+            selectors.append(container)
+        elif spec_type == "table":
+            selectors.append(spec.get("tables", "table"))
+        elif spec_type in ("dl", "li_split"):
+            # Zonder container zoeken deze extractors in de hele body
+            return None
+
+        for key in _SELECTOR_KEYS:
+            if isinstance(spec.get(key), str):
+                selectors.append(spec[key])
+        selectors.extend(spec.get("selectors") or [])
+
+        if spec_type == "datasheet_link":
+            selectors.extend(_DATASHEET_LINKS)
+        if spec_type == "schneider_json":
+            selectors.extend(_SCHNEIDER_IMAGE)
+
+    for rule in config.get("detect") or []:
+        if "id" in rule:
+            selectors.append(f"#{rule['id']}")
+        elif "selector" in rule:
+            selectors.append(rule["selector"])
+        elif "class_contains" in rule:
+            selectors.append(f"[class*='{rule['class_contains']}']")
+
+    # Volgorde behouden, dubbels weg
+    return list(dict.fromkeys(selectors))
+
+
+def has_variant_spec(vendor):
+    """Heeft deze vendor een product_variants spec (lijstpagina's met variant URLs)?"""
+    return any(s.get("type") == "product_variants" for s in vendor_config(vendor).get("specs") or [])
+
+
+def needs_inline_scripts(vendor):
+    """ABB leest 'var model = {...}' uit een inline script."""
+    return any(s.get("type") == "abb_json" for s in vendor_config(vendor).get("specs") or [])
@@ -0,0 +1,46 @@
+// Minimale DOM voor de Schneider snapshot serializers (tests/test_snapshot_serializer.py):
+// boom als JSON uit Python's html.parser, shadow roots onder "shadow". Geen browser nodig.
+const fs = require('fs');
+class Node_ { }
+Node_.ELEMENT_NODE = 1; Node_.TEXT_NODE = 3; Node_.COMMENT_NODE = 8;
+class ShadowRoot { constructor(host) { this.host = host; this.childNodes = []; this.nodeType = 11; }
+  get children() { return this.childNodes.filter(n => n.nodeType === 1); } }
+class Text { constructor(v, p) { this.nodeType = 3; this.nodeValue = v; this.parentNode = p; } }
+class Comment { constructor(v, p) { this.nodeType = 8; this.nodeValue = v; this.parentNode = p; } }
+class Element {
+  constructor(tag, attrs, parent) { this.nodeType = 1; this.localName = tag; this.tagName = tag.toUpperCase();
+    this.attributes = attrs.map(([name, value]) => ({name, value: value === null ? '' : value}));
+    this.childNodes = []; this.parentNode = parent; this.shadowRoot = null; }
+  get children() { return this.childNodes.filter(n => n.nodeType === 1); }
+  get parentElement() { return this.parentNode instanceof Element ? this.parentNode : null; }
+  getAttribute(n) { const a = this.attributes.find(a => a.name === n); return a ? a.value : null; }
+  matches(sel) { if (sel.startsWith('.')) return (this.getAttribute('class') || '').split(/\s+/).includes(sel.slice(1));
+    return this.localName === sel; }
+}
+function build(j, parent) {
+  if (j.t === 'text') return new Text(j.v, parent);
+  if (j.t === 'comment') return new Comment(j.v, parent);
+  const el = new Element(j.tag, j.attrs, parent);
+  el.childNodes = j.children.map(c => build(c, el));
+  if (j.shadow) { el.shadowRoot = new ShadowRoot(el); el.shadowRoot.childNodes = j.shadow.map(c => build(c, el.shadowRoot)); }
+  return el;
+}
+const [,, treeFile, jsFile, outFile] = process.argv;
+const tree = JSON.parse(fs.readFileSync(treeFile, 'utf8'));
+const { legacy, current } = JSON.parse(fs.readFileSync(jsFile, 'utf8'));
+const results = {};
+for (const [name, t] of Object.entries(tree)) {
+  const root = build(t, null);
+  global.Node = Node_; global.ShadowRoot = ShadowRoot; global.performance = { now: () => 0 };
+  global.document = { documentElement: root, body: root.children.find(c => c.localName === 'body') };
+  const L = eval(legacy), C = eval(current);
+  results[name] = {};
+  for (const isFirst of [true, false]) {
+    results[name][isFirst ? 'first' : 'next'] = {
+      legacy: L(isFirst),
+      debug: C({isFirst, debug: true, declarative: false}).html,
+      plain: C({isFirst, debug: false, declarative: false}).html,
+    };
+  }
+}
+fs.writeFileSync(outFile, JSON.stringify(results));
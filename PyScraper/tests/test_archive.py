@@ -0,0 +1,116 @@
+"""
+Archief: PyScraper schrijft (utils/archive.py), MSE leest (MainScraperEngine/core/archive.py).
+Locator round trip, records na een half geschreven member en output_exists op locators.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from utils.archive import ArchiveWriter, is_locator, output_exists, parse_locator, read_record
+
+# MSE heeft ook een top-level 'core' package: de reader onder een eigen naam laden
+_spec = importlib.util.spec_from_file_location("mse_archive", Config.MSE_DIR / "core" / "archive.py")
+mse_archive = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(mse_archive)
+
+URL_A = "https://www.se.com/nl/nl/product/A1/"
+URL_B = "https://www.se.com/nl/nl/product/B2/"
+URL_C = "https://www.se.com/nl/nl/product/C3/"
+
+
+class ArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = Path(tempfile.mkdtemp())
+        self.writer = ArchiveWriter()
+        self.writer.start(self.workdir, "test")
+
+    def tearDown(self):
+        self.writer.close()
+
+    def test_round_trip(self):
+        html = "<html><body>" + "<p>€ 12,34</p>" * 500 + "</body></html>"
+        streamed = self.workdir / "capture.html"
+        streamed.write_text("<html>streamed</html>", encoding="utf-8")
+
+        page = self.writer.write_page(URL_A, html=html, strategy="SchneiderStrategy")
+        sidecar = self.writer.write_sidecar(URL_A, "variants", {"items": [1, 2]})
+        from_file = self.writer.write_page(URL_B, path=str(streamed))
+
+        headers, payload = read_record(page)
+        self.assertEqual(payload.decode("utf-8"), html)
+        self.assertEqual(headers["WARC-Target-URI"], URL_A)
+        self.assertEqual(headers["PyScraper-Strategy"], "SchneiderStrategy")
+        self.assertEqual(read_record(from_file)[1], b"<html>streamed</html>")
+
+        # MSE kant: dezelfde locator, de index en sequentieel
+        self.assertEqual(mse_archive.read_locator(page).text, html)
+        self.assertEqual(mse_archive.find(self.writer.archive_dir, URL_B).locator, from_file)
+        self.assertEqual(mse_archive.find(self.writer.archive_dir, URL_A, "metadata", "variants").text,
+                         '{"items": [1, 2]}')
+        self.assertEqual(mse_archive.read_locator(sidecar).type, "metadata")
+        records = list(mse_archive.iter_records(self.writer.archive_dir))
+        self.assertEqual([(r.url, r.locator) for r in records], [(URL_A, page), (URL_B, from_file)])
+
+    def test_record_after_partial_write(self):
+        first = self.writer.write_page(URL_A, html="<p>a</p>")
+
+        def broken_stream(head, path):
+            # Leesfout midden in een gestreamde capture: een half gzip member staat al in het segment
+            self.writer.file.write(b"\x1f\x8b\x08\x00" + os.urandom(64))
+            raise OSError("capture file disappeared")
+
+        with mock.patch.object(self.writer, "_write_member_from_file", side_effect=broken_stream):
+            streamed = self.workdir / "capture.html"
+            streamed.write_text("<p>b</p>", encoding="utf-8")
+            with self.assertRaises(OSError):
+                self.writer.write_page(URL_B, path=str(streamed))
+        appended = self.writer.write_page(URL_C, html="<p>c</p>")
+
+        self.assertEqual(read_record(appended)[1], b"<p>c</p>")
+        self.assertEqual(mse_archive.read_locator(first).text, "<p>a</p>")
+        records = list(mse_archive.iter_records(self.writer.archive_dir))
+        self.assertEqual([r.url for r in records], [URL_A, URL_C])
+        self.assertIsNone(mse_archive.find(self.writer.archive_dir, URL_B))
+
+    def test_reader_skips_damaged_member(self):
+        # Segment van vóór de rollback (of een crash): half member met erna nog records
+        first = self.writer.write_page(URL_A, html="<p>a</p>" * 200)
+        second = self.writer.write_page(URL_B, html="<p>b</p>" * 200)
+        segment, offset = parse_locator(second)
+        self.writer.file.truncate(offset + (os.path.getsize(segment) - offset) // 2)
+        self.writer.file.seek(0, os.SEEK_END)
+        appended = self.writer.write_page(URL_C, html="<p>c</p>")
+        self.writer.write_page(URL_A, html="<p>a2</p>")
+        self.writer.file.truncate(self.writer.file.tell() - 10)  # afgebroken laatste record
+
+        self.assertEqual(mse_archive.read_locator(appended).text, "<p>c</p>")
+        with contextlib.redirect_stdout(io.StringIO()) as log:
+            records = list(mse_archive.iter_records(segment))
+        self.assertEqual([r.locator for r in records], [first, appended])
+        self.assertEqual(log.getvalue().count("skipping damaged record"), 2)
+
+    def test_output_exists_on_locator(self):
+        locator = self.writer.write_page(URL_A, html="<p>a</p>")
+        self.assertTrue(is_locator(locator))
+        self.assertTrue(output_exists(locator))
+        self.assertFalse(output_exists(str(self.workdir / "archive" / "missing.warc.gz#0")))
+        self.assertTrue(output_exists(str(self.workdir)))
+        self.assertFalse(is_locator(str(self.workdir / "page.html")))
+        self.writer.close()
+        os.remove(parse_locator(locator)[0])
+        self.assertFalse(output_exists(locator))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+AssetCache: LRU eviction boven ASSET_CACHE_MAX_MB en de regels van asset_ttl
+(max-age drempel, geversioneerde URLs, immutable, no-store/private).
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.asset_cache import AssetCache, asset_ttl
+from core.config import Config
+
+KB = 1024
+
+
+class AssetTtlTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = Config.ASSET_CACHE_MIN_MAX_AGE, Config.ASSET_CACHE_MAX_TTL
+        Config.ASSET_CACHE_MIN_MAX_AGE, Config.ASSET_CACHE_MAX_TTL = 3600, 86400
+
+    def tearDown(self):
+        Config.ASSET_CACHE_MIN_MAX_AGE, Config.ASSET_CACHE_MAX_TTL = self.saved
+
+    def test_max_age(self):
+        url = "https://www.se.com/static/app.js"
+        self.assertIsNone(asset_ttl(url, {}))
+        self.assertIsNone(asset_ttl(url, {"cache-control": "public, max-age=600"}))
+        self.assertEqual(asset_ttl(url, {"cache-control": "public, max-age=7200"}), 7200)
+        self.assertEqual(asset_ttl(url, {"cache-control": "max-age=31536000"}), 86400)  # plafond
+
+    def test_versioned_and_immutable(self):
+        for url in ["https://www.se.com/static/bundle.3f9a1c2e.js",
+                    "https://www.se.com/static/a1b2c3d4e5/app.css",
+                    "https://www.se.com/static/app.js?v=123",
+                    "https://www.se.com/static/app.js?x=1&hash=ab12"]:
+            with self.subTest(url=url):
+                self.assertEqual(asset_ttl(url, {"cache-control": "max-age=60"}), 86400)
+        self.assertEqual(asset_ttl("https://www.se.com/app.js", {"cache-control": "max-age=60, immutable"}), 86400)
+        self.assertIsNone(asset_ttl("https://www.se.com/app.js?page=2", {}))
+
+    def test_no_store_and_private(self):
+        url = "https://www.se.com/static/bundle.3f9a1c2e.js"
+        self.assertIsNone(asset_ttl(url, {"cache-control": "no-store"}))
+        self.assertIsNone(asset_ttl(url, {"cache-control": "private, max-age=86400, immutable"}))
+
+
+class AssetCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.max_mb = Config.ASSET_CACHE_MAX_MB
+        Config.ASSET_CACHE_MAX_MB = 0.25  # 256 KB
+        self.cache = AssetCache(Path(tempfile.mkdtemp()))
+
+    def tearDown(self):
+        Config.ASSET_CACHE_MAX_MB = self.max_mb
+        self.cache.close()
+
+    def store(self, name, size):
+        url = f"https://www.se.com/static/{name}"
+        self.cache.store(url, {"content-type": "text/javascript", "set-cookie": "x=1"}, name.encode() * size, 3600)
+        return url
+
+    def test_round_trip_keeps_selected_headers(self):
+        url = self.store("a.js", 10)
+        headers, body = self.cache.lookup(url)
+        self.assertEqual(body, b"a.js" * 10)
+        self.assertEqual(headers, {"content-type": "text/javascript"})
+
+    def test_lru_eviction(self):
+        a = self.store("a.js", 25 * KB)  # 100 KB per object
+        b = self.store("b.js", 25 * KB)
+        time.sleep(0.01)
+        self.assertIsNotNone(self.cache.lookup(a))  # a recenter gebruikt dan b
+        time.sleep(0.01)
+        c = self.store("c.js", 25 * KB)  # 300 KB > 256 KB: b (minst recent) moet weg
+
+        self.assertIsNone(self.cache.lookup(b))
+        self.assertIsNotNone(self.cache.lookup(a))
+        self.assertIsNotNone(self.cache.lookup(c))
+        self.assertEqual(self.cache.evicted, 1)
+        objects = [p for p in (self.cache.cache_dir / "objects").rglob("*") if p.is_file()]
+        self.assertEqual(len(objects), 2)
+
+    def test_same_content_one_object(self):
+        first = "https://www.se.com/static/x.js"
+        second = "https://cdn.se.com/x.js"
+        for url in (first, second):
+            self.cache.store(url, {}, b"same", 3600)
+        self.assertEqual(self.cache.conn.execute("SELECT COUNT(*) FROM objects").fetchone()[0], 1)
+        self.assertEqual(self.cache.lookup(second)[1], b"same")
+
+    def test_expired_entry_is_a_miss(self):
+        self.cache.store("https://www.se.com/static/old.js", {}, b"old", -1)
+        self.assertIsNone(self.cache.lookup("https://www.se.com/static/old.js"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+ConsentResolver: enkel cookies van een bekende CMP worden als consent onthouden en in
+andere contexts gezet; sessie/tracking cookies die rond de klik wijzigden en login
+cookies van de session store niet.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from core.session import SessionManager
+from strategies import consent
+from strategies.consent import ConsentResolver
+
+URL = "https://www.se.com/nl/nl/product/A1/"
+
+
+def cookie(name, value="1"):
+    return {"name": name, "value": value, "domain": ".se.com", "path": "/", "expires": -1}
+
+
+class CookieContext:
+    def __init__(self, cookies=()):
+        self.jar = list(cookies)
+
+    def cookies(self):
+        return [dict(c) for c in self.jar]
+
+    def add_cookies(self, cookies):
+        self.jar.extend(cookies)
+
+
+class BannerButton:
+    """Accept knop: de klik zet de CMP cookie, maar ook een sessie en een login cookie."""
+
+    def __init__(self, context):
+        self.context = context
+
+    @property
+    def first(self):
+        return self
+
+    def is_visible(self):
+        return True
+
+    def click(self):
+        self.context.add_cookies([cookie("OptanonConsent", "groups=C0001:1"), cookie("OptanonAlertBoxClosed"),
+                                  cookie("JSESSIONID", "abc"), cookie("sso_token", "t0k3n")])
+
+
+class BannerPage:
+    def __init__(self, context):
+        self.context = context
+        self.url = URL
+
+    def locator(self, selector):
+        return BannerButton(self.context)
+
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        pass
+
+
+class ConsentCookieTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = Path(tempfile.mkdtemp())
+        self.sessions = consent.SESSIONS
+        consent.SESSIONS = SessionManager(self.workdir / "sessions")
+        consent.SESSIONS.states["se"] = {"saved_at": 0, "auth_cookies": ["sso_token"], "storage_state": {}}
+        self.resolver = ConsentResolver(str(self.workdir / "consent.json"))
+
+    def tearDown(self):
+        consent.SESSIONS = self.sessions
+
+    def test_click_remembers_cmp_cookies_only(self):
+        context = CookieContext([cookie("_ga")])
+        self.assertIsNotNone(self.resolver.resolve(BannerPage(context)))
+        with open(self.workdir / "consent.json", "r", encoding="utf-8") as f:
+            names = [c["name"] for c in json.load(f)["se.com"]["cookies"]]
+        self.assertEqual(names, ["OptanonConsent", "OptanonAlertBoxClosed"])
+
+    def test_preseed_skips_session_cookies_from_old_state(self):
+        state = {"se.com": {"handler": "#onetrust-accept-btn-handler",
+                            "cookies": [cookie("OptanonConsent"), cookie("JSESSIONID"), cookie("sso_token"),
+                                        cookie("euconsent-v2"), cookie("didomi_token")]}}
+        (self.workdir / "consent.json").write_text(json.dumps(state), encoding="utf-8")
+        context = CookieContext()
+        self.resolver.preseed(context, URL)
+        self.assertEqual([c["name"] for c in context.jar], ["OptanonConsent", "euconsent-v2", "didomi_token"])
+
+    def test_auth_cookies_from_session_files_excluded(self):
+        sessions = SessionManager(self.workdir / "stored")
+        os.makedirs(sessions.state_dir)
+        (sessions.state_dir / "abb.json").write_text(json.dumps({"auth_cookies": ["CookieConsentToken"]}),
+                                                   encoding="utf-8")
+        consent.SESSIONS = sessions
+        kept = consent.consent_cookies([cookie("CookieConsentToken"), cookie("CookieConsent")])
+        self.assertEqual([c["name"] for c in kept], ["CookieConsent"])
+
+    def test_patterns(self):
+        names = ["OptanonConsent", "CookieConsent", "euconsent-v2", "didomi_token", "_evidon_consent_cookie",
+                 "uc_user_interaction", "cookieconsent_status", "cmplz_marketing", "notice_preferences",
+                 "_ga", "JSESSIONID", "SESSION", "XSRF-TOKEN", "ak_bmsc", "visitor_id"]
+        kept = [c["name"] for c in consent.consent_cookies(cookie(n) for n in names)]
+        self.assertEqual(kept, names[:9])
+
+
+if __name__ == "__main__":
+    unittest.main()
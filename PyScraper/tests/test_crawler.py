@@ -0,0 +1,74 @@
+"""
+ConcurrentCrawler: een exception buiten de strategie mag de worker niet stoppen; de URL
+gaat met de fout terug naar de frontier (retry/backoff, hier meteen 'failed').
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from core.crawler import ConcurrentCrawler
+from core.frontier import Frontier, UrlResult
+
+URLS = ["https://www.se.com/nl/nl/product/A1/", "https://www.se.com/nl/nl/product/B2/"]
+
+
+class IdleBrowser:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class RaisingEngine:
+    """_process_url faalt buiten strategy.execute voor de eerste URL (bv. browser crash)."""
+
+    headless = True
+
+    def __init__(self):
+        self.browser_manager = mock.Mock(profile_dir=Path(tempfile.mkdtemp()) / "profile")
+        self.processed = []
+
+    def _process_url(self, url, browser_manager):
+        self.processed.append(url)
+        if url == URLS[0]:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return UrlResult(True, "out.html")
+
+
+class WorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.retries = Config.RETRIES
+        Config.RETRIES = 0
+        self.frontier = Frontier(Path(tempfile.mkdtemp()) / "frontier.db")
+        self.frontier.import_urls(URLS)
+
+    def tearDown(self):
+        Config.RETRIES = self.retries
+        self.frontier.close()
+
+    def test_exception_releases_url(self):
+        engine = RaisingEngine()
+        with mock.patch("core.crawler.BrowserManager", IdleBrowser):
+            report = ConcurrentCrawler(engine, workers=1).run(self.frontier)
+
+        self.assertEqual(engine.processed, URLS)  # worker liep door na de exception
+        self.assertEqual(self.frontier.status_counts(), {"failed": 1, "done": 1})
+        error = self.frontier.conn.execute("SELECT last_error FROM urls WHERE url = ?", (URLS[0],)).fetchone()[0]
+        self.assertEqual(error, "RuntimeError: Target page, context or browser has been closed")
+        self.assertEqual(report.domains["se.com"]["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+ScrapeEngine: een exception in de pagina setup of buiten de strategie breekt de seriële
+run niet af; de URL gaat met de fout naar de frontier.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from core.engine import ScrapeEngine
+from core.frontier import Frontier, UrlResult
+
+URLS = ["https://www.se.com/nl/nl/product/A1/", "https://www.se.com/nl/nl/product/B2/"]
+
+
+class IdleBrowser:
+    def __init__(self, *args, **kwargs):
+        self.profile_dir = None
+        self.done = 0
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def page_done(self):
+        self.done += 1
+
+
+class CrashedContext:
+    """Context van een gecrashte browser: new_page faalt."""
+
+    pages = []
+
+    def new_page(self):
+        raise RuntimeError("Browser has been closed")
+
+
+class EngineTest(unittest.TestCase):
+    SETTINGS = {"FRONTIER_PATH": None, "RETRIES": 0, "HTTP_FIRST": False, "CHANGE_DETECTION": False,
+                "PLAN_CRAWL": False, "METRICS": False, "CONCURRENCY": 1, "SHARDS": 1, "FANOUT": False}
+
+    def setUp(self):
+        self.workdir = Path(tempfile.mkdtemp())
+        self.saved = {name: getattr(Config, name) for name in self.SETTINGS}
+        for name, value in self.SETTINGS.items():
+            setattr(Config, name, value)
+        Config.FRONTIER_PATH = self.workdir / "frontier.db"
+        self.input_file = self.workdir / "urls.txt"
+        self.input_file.write_text("\n".join(URLS) + "\n", encoding="utf-8")
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(Config, name, value)
+
+    def engine(self):
+        with mock.patch("core.engine.BrowserManager", IdleBrowser):
+            return ScrapeEngine(str(self.input_file), str(self.workdir / "out"), headless=True)
+
+    def test_page_setup_failure_is_a_failed_result(self):
+        engine = self.engine()
+        browser = IdleBrowser()
+        browser.create_context = CrashedContext
+        result = engine._capture_url(URLS[0], browser)
+        self.assertFalse(result)
+        self.assertEqual(result.error, "RuntimeError: Browser has been closed")
+        self.assertEqual(browser.done, 1)
+
+    def test_serial_run_survives_exception(self):
+        engine = self.engine()
+        processed = []
+
+        def process(url, browser_manager):
+            processed.append(url)
+            if url == URLS[0]:
+                raise RuntimeError("boom")
+            return UrlResult(True, "out.html")
+
+        engine._process_url = process
+        engine.run()
+
+        self.assertEqual(processed, URLS)
+        frontier = Frontier()
+        self.assertEqual(frontier.status_counts(), {"failed": 1, "done": 1})
+        error = frontier.conn.execute("SELECT last_error FROM urls WHERE url = ?", (URLS[0],)).fetchone()[0]
+        self.assertEqual(error, "RuntimeError: boom")
+        frontier.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
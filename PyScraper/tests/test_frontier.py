@@ -0,0 +1,159 @@
+"""
+Frontier + CrawlPlanner op een tijdelijke database: plan volgorde, het fan-out budget,
+retry -> failed na Config.RETRIES en requeue_interrupted na een crash.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from core.frontier import Frontier, UrlResult
+from core.planner import CrawlPlanner
+
+SE = "https://www.se.com/nl/nl"
+SIEMENS = "https://mall.industry.siemens.com/mall/nl/nl/Catalog"
+
+
+class FrontierTestCase(unittest.TestCase):
+    SETTINGS = ("RETRIES", "RETRY_BACKOFF", "DOMAIN_LIMITS", "DEFAULT_DOMAIN_LIMIT")
+
+    def setUp(self):
+        self.saved = {name: getattr(Config, name) for name in self.SETTINGS}
+        self.db_path = Path(tempfile.mkdtemp()) / "frontier.db"
+        self.frontier = Frontier(self.db_path)
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(Config, name, value)
+        self.frontier.close()
+
+    def drain(self, frontier=None):
+        """Claim alles wat nu beschikbaar is, in de volgorde van de frontier."""
+        frontier = frontier or self.frontier
+        order = []
+        while True:
+            url, _ = frontier.claim()
+            if url is None:
+                return order
+            order.append(url)
+
+    def status(self, url):
+        return self.frontier.conn.execute(
+            "SELECT status, attempts, next_attempt_at, last_error FROM urls WHERE url = ?", (url,)
+        ).fetchone()
+
+
+class PlanOrderTest(FrontierTestCase):
+    def test_plan_order(self):
+        Config.DOMAIN_LIMITS, Config.DEFAULT_DOMAIN_LIMIT = {"se.com": 2, "siemens.com": 1}, 2
+        se_detail = [f"{SE}/product/D{n}/" for n in range(2)]
+        se_list = [f"{SE}/product-range/L{n}/" for n in range(2)]
+        siemens_detail = [f"{SIEMENS}/Product/X{n}" for n in range(2)]
+        siemens_list = [f"{SIEMENS}/Products/Y0"]
+        # Invoer in 'slechte' volgorde: details eerst, domeinen na elkaar
+        self.frontier.import_urls(se_detail + se_list + siemens_detail + siemens_list)
+        self.frontier.add_discovered([f"{SE}/product/V0/"], depth=1, parent=se_list[0])
+
+        plan = CrawlPlanner(self.frontier, workers=2).plan()
+
+        self.assertEqual(plan.groups, {("se.com", "schneider", "detail"): 3, ("se.com", "schneider", "list"): 2,
+                                       ("siemens.com", "siemens", "detail"): 2, ("siemens.com", "siemens", "list"): 1})
+        # Werk per slot: siemens (90 + 2 x 25) / 1 > se.com (2 x 90 + 3 x 25) / 2 -> siemens eerst.
+        # Per beurt 'limiet' URLs per domein, lijsten vóór details, fan-out (lagere prioriteit) achteraan
+        self.assertEqual(self.drain(), [
+            siemens_list[0], se_list[0], se_list[1],
+            siemens_detail[0], se_detail[0], se_detail[1],
+            siemens_detail[1],
+            f"{SE}/product/V0/",
+        ])
+        self.assertGreater(plan.expected_seconds, 0)
+
+
+class AddDiscoveredTest(FrontierTestCase):
+    def test_budget_cap(self):
+        self.frontier.import_urls([f"{SE}/product-range/L0/"])
+        variants = [f"{SE}/product/V{n}/" for n in range(5)]
+
+        self.assertEqual(self.frontier.add_discovered(variants, depth=1, parent=f"{SE}/product-range/L0/", budget=3),
+                         (3, 2))
+        # Budget op: bekende URLs (ook canoniek gelijk: zonder slash) tellen niet als geweigerd
+        again = [variants[0], f"{SE}/product/V1", f"{SE}/product/V9/"]
+        self.assertEqual(self.frontier.add_discovered(again, depth=1, parent=None, budget=3), (0, 1))
+        # Input URLs (depth 0) tellen niet mee voor het budget
+        self.assertEqual(self.frontier.conn.execute("SELECT COUNT(*) FROM urls WHERE depth > 0").fetchone()[0], 3)
+        self.assertEqual(self.frontier.add_discovered([f"{SE}/product/V9/"], depth=1, parent=None, budget=4), (1, 0))
+        self.assertEqual(self.frontier.add_discovered(variants, depth=1, parent=None), (2, 0))  # zonder budget
+        self.assertEqual(self.frontier.depth(variants[4]), 1)
+
+
+class CompleteTest(FrontierTestCase):
+    URL = f"{SE}/product/A1/"
+
+    def setUp(self):
+        super().setUp()
+        Config.RETRIES, Config.RETRY_BACKOFF = 2, 30
+        self.frontier.import_urls([self.URL])
+
+    def fail(self, error):
+        self.assertEqual(self.drain(), [self.URL])
+        return self.frontier.complete(self.URL, UrlResult(False, error=error), 1.0)
+
+    def test_retry_then_failed(self):
+        for attempt, backoff in ((1, 30), (2, 60)):
+            started = time.time()
+            self.assertEqual(self.fail(f"Timeout {attempt}"), "pending")
+            status, attempts, next_at, error = self.status(self.URL)
+            self.assertEqual((status, attempts, error), ("pending", attempt, f"Timeout {attempt}"))
+            self.assertAlmostEqual(next_at - started, backoff, delta=1)
+            # Backoff loopt: niets te claimen, wel een wachttijd
+            url, wait = self.frontier.claim()
+            self.assertIsNone(url)
+            self.assertGreater(wait, 0)
+            self.frontier.conn.execute("UPDATE urls SET next_attempt_at = 0")
+
+        # Poging 3 > RETRIES (2): definitief failed, daarna is de frontier leeg
+        self.assertEqual(self.fail("Timeout 3"), "failed")
+        self.assertEqual(self.status(self.URL)[:2], ("failed", 3))
+        self.assertEqual(self.frontier.claim(), (None, None))
+        self.assertEqual(self.frontier.run_attempts(), [(self.URL, 0, 1.0)] * 3)
+
+    def test_success_after_retry(self):
+        self.assertEqual(self.fail("Timeout"), "pending")
+        self.frontier.conn.execute("UPDATE urls SET next_attempt_at = 0")
+        self.assertEqual(self.drain(), [self.URL])
+        self.assertEqual(self.frontier.complete(self.URL, UrlResult(True, "out.html"), 2.0), "done")
+        self.assertEqual(self.status(self.URL)[:2], ("done", 2))
+        self.assertEqual(self.frontier.status_counts(), {"done": 1})
+
+
+class RequeueTest(FrontierTestCase):
+    def test_requeue_interrupted(self):
+        urls = [f"{SE}/product/A1/", f"{SE}/product/B2/", f"{SIEMENS}/Product/X1"]
+        self.frontier.import_urls(urls)
+        claimed = self.drain()
+        self.frontier.complete(claimed[0], UrlResult(True, "out.html"), 1.0)
+        self.frontier.close()
+
+        # 'Crash' met twee URLs in_progress; shard 1/2 ziet enkel siemens.com, shard 0/2 se.com
+        siemens_shard = Frontier(self.db_path, shard=(1, 2))
+        self.assertEqual(siemens_shard.requeue_interrupted(), 1)
+        self.assertEqual(self.drain(siemens_shard), [urls[2]])
+        siemens_shard.close()
+
+        self.frontier = Frontier(self.db_path)
+        self.assertEqual(self.frontier.requeue_interrupted(), 2)
+        self.assertEqual(self.frontier.status_counts(), {"done": 1, "pending": 2})
+        self.assertEqual(self.drain(), [urls[1], urls[2]])
+        self.assertEqual(self.frontier.requeue_interrupted(), 2)
+        self.assertEqual(self.frontier.requeue_interrupted(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+HTTP-first laag tegen een lokale http.server: een pagina met alle vereiste
+content wordt aanvaard, een app-shell zonder die content gaat naar de browser.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from core.http_fetch import HttpFetcher
+
+PAGES = {
+    "/schneider/detail": (
+        '<html><body><div plain-all-data="{&quot;productId&quot;: &quot;A9F74216&quot;}"></div>'
+        '<h1>iC60N</h1></body></html>'
+    ),
+    "/abb/detail": (
+        '<html><body><script>var model = {"productId": "2CDS253001R0164"};</script></body></html>'
+    ),
+    # Client-side app-shell: de data komt pas na JS, dus ontbreekt in de server HTML
+    "/shell": '<html><body><div id="app"></div><script src="/bundle.js"></script></body></html>',
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        payload = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TryFetchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pacing = Config.PACING
+        Config.PACING = False
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        Config.PACING = cls.pacing
+
+    def setUp(self):
+        self.fetcher = HttpFetcher()
+
+    def tearDown(self):
+        self.fetcher.close()
+
+    def test_schneider_detail_served_over_http(self):
+        html, headers = self.fetcher.try_fetch(f"{self.base}/schneider/detail", vendor="schneider")
+        self.assertIn("plain-all-data", html)
+        self.assertEqual(headers["content-type"], "text/html; charset=utf-8")
+        self.assertEqual(self.fetcher.stats.counts["http_ok"], 1)
+
+    def test_abb_detail_served_over_http(self):
+        html, _ = self.fetcher.try_fetch(f"{self.base}/abb/detail", vendor="abb")
+        self.assertIn("var model", html)
+        self.assertEqual(self.fetcher.stats.counts["http_ok"], 1)
+
+    def test_missing_content_escalates(self):
+        for vendor in ("schneider", "abb"):
+            self.assertEqual(self.fetcher.try_fetch(f"{self.base}/shell", vendor=vendor), (None, None))
+        self.assertEqual(self.fetcher.stats.counts["escalated"], 2)
+        self.assertEqual(self.fetcher.stats.counts["http_ok"], 0)
+
+    def test_http_error_escalates(self):
+        self.assertEqual(self.fetcher.try_fetch(f"{self.base}/missing", vendor="schneider"), (None, None))
+        self.assertEqual(self.fetcher.stats.counts["http_error"], 1)
+
+    def test_non_http_exception_escalates(self):
+        # httpx.InvalidURL en de RuntimeError van een gesloten client zijn geen httpx.HTTPError
+        self.assertEqual(self.fetcher.try_fetch("http://[::1/schneider/detail", vendor="schneider"), (None, None))
+        self.fetcher.client.close()
+        self.assertEqual(self.fetcher.try_fetch(f"{self.base}/schneider/detail", vendor="schneider"), (None, None))
+        self.assertEqual(self.fetcher.conditional(f"{self.base}/schneider/detail", etag='"v1"'), (None, None, None))
+        self.assertEqual(self.fetcher.stats.counts["http_error"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
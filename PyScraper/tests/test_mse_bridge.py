@@ -0,0 +1,40 @@
+"""
+compare_mse_output: resultaten zonder 'kv' (bv. een MSE pad dat enkel vendor/metadata
+teruggeeft) worden vergeleken alsof kv leeg is, zonder KeyError.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from utils.mse_bridge import compare_mse_output
+
+
+def mse_results(*results):
+    return mock.patch("utils.mse_bridge.run_mse_html", return_value=list(results))
+
+
+class CompareMseOutputTest(unittest.TestCase):
+    def test_result_without_kv(self):
+        with_kv = {"vendor": "Schneider", "kv": {"price": {"A1": "€ 1,00"}}}
+        without_kv = {"vendor": "Schneider"}
+        with mse_results(without_kv, with_kv):
+            self.assertEqual(compare_mse_output("<a/>", "<b/>"), (False, ["price"]))
+        with mse_results(with_kv, without_kv):
+            self.assertEqual(compare_mse_output("<a/>", "<b/>"), (False, ["price"]))
+        with mse_results(without_kv, {"vendor": "Schneider", "kv": {}}):
+            self.assertEqual(compare_mse_output("<a/>", "<b/>"), (True, []))
+
+    def test_vendor_and_error(self):
+        with mse_results({"vendor": "Generic"}, {"vendor": "Schneider"}):
+            self.assertEqual(compare_mse_output("<a/>", "<b/>"), (False, ["vendor"]))
+        with mse_results({"error": "boom"}, {"vendor": "Schneider"}):
+            self.assertEqual(compare_mse_output("<a/>", "<b/>"), (False, ["boom"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Adaptieve navigatie timeout: metingen zonder echte navigatie (about:blank, 0 s)
+mogen de schatting van een domein niet naar beneden trekken.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from core.pacing import DomainPacer
+
+URL = "https://www.phoenixcontact.com/nl-be/producten/1234567"
+
+
+class RecordTest(unittest.TestCase):
+    def setUp(self):
+        self.pacing = Config.PACING
+        Config.PACING = True
+        self.pacer = DomainPacer()
+        for _ in range(Config.PACING_MIN_SAMPLES):
+            self.pacer.record(URL, 5.0, 200)
+        self.timeout = self.pacer.timeout_ms(URL)
+
+    def tearDown(self):
+        Config.PACING = self.pacing
+
+    def samples(self):
+        return sum(len(estimate.samples) for state in self.pacer.domains.values()
+                   for estimate in state.latency.values())
+
+    def test_estimate_from_real_samples(self):
+        self.assertGreater(self.timeout, Config.PACING_MIN_TIMEOUT)
+        self.assertLess(self.timeout, Config.TIMEOUT_PAGE_LOAD)
+
+    def test_zero_seconds_ignored(self):
+        for _ in range(50):
+            self.pacer.record(URL, 0.0, None)
+        self.assertEqual(self.pacer.timeout_ms(URL), self.timeout)
+        self.assertEqual(self.samples(), Config.PACING_MIN_SAMPLES)
+
+    def test_about_blank_ignored(self):
+        for _ in range(50):
+            self.pacer.record("about:blank", 0.01, 0)
+        self.assertEqual(self.pacer.timeout_ms(URL), self.timeout)
+        self.assertEqual(self.samples(), Config.PACING_MIN_SAMPLES)
+
+    def test_timeout_still_counts(self):
+        self.pacer.record(URL, timeout_ms=self.timeout)
+        self.assertEqual(self.samples(), Config.PACING_MIN_SAMPLES + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
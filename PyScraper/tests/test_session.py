@@ -0,0 +1,117 @@
+"""
+SessionManager: enkel een login die cookies zet wordt bewaard, state writes zijn veilig
+met meerdere threads, en cookie domeinen matchen met een punt als grens.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from core.session import SessionManager, _matches, load_credentials
+
+
+class CookieContext:
+    """BrowserContext met enkel wat SessionManager gebruikt."""
+
+    def __init__(self, cookies=()):
+        self.jar = list(cookies)
+
+    def cookies(self):
+        return [dict(c) for c in self.jar]
+
+    def add_cookies(self, cookies):
+        self.jar.extend(cookies)
+
+    def storage_state(self):
+        return {"cookies": self.cookies(), "origins": []}
+
+
+class CookiePage:
+    def __init__(self, context):
+        self.context = context
+
+
+class LoginStrategy:
+    SESSION_VENDOR = "abb"
+    SESSION_DOMAIN = "abb.com"
+
+    def __init__(self, sets_cookie):
+        self.sets_cookie = sets_cookie
+
+    def login(self, page, credentials):
+        if self.sets_cookie:
+            page.context.add_cookies([{"name": "auth", "value": "t0k3n", "domain": ".new.abb.com", "expires": -1}])
+
+    def is_logged_in(self, page):
+        return None
+
+
+class SessionTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = Path(tempfile.mkdtemp())
+        self.secrets = Config.SECRETS_PATH
+        Config.SECRETS_PATH = str(self.workdir / "credentials.ini")
+        (self.workdir / "credentials.ini").write_text("[abb]\nemail = a@b.c\npassword = x\n", encoding="utf-8")
+        load_credentials.cache_clear()
+        self.sessions = SessionManager(self.workdir / "sessions")
+        self.tracker = {"name": "_ga", "value": "1", "domain": ".abb.com", "expires": -1}
+
+    def tearDown(self):
+        Config.SECRETS_PATH = self.secrets
+        load_credentials.cache_clear()
+
+    def test_login_without_cookie_change_not_saved(self):
+        context = CookieContext([self.tracker])
+        self.assertTrue(self.sessions.ensure(CookiePage(context), LoginStrategy(sets_cookie=False)))
+        self.assertNotIn("abb", self.sessions.states)
+        self.assertFalse((self.workdir / "sessions" / "abb.json").exists())
+        self.assertEqual(self.sessions.logins, 0)
+
+    def test_login_saves_changed_cookies_only(self):
+        context = CookieContext([self.tracker])
+        self.sessions.ensure(CookiePage(context), LoginStrategy(sets_cookie=True))
+        with open(self.workdir / "sessions" / "abb.json", "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["auth_cookies"], ["auth"])
+        # Volgende URL in dezelfde context: geen nieuwe login
+        self.assertFalse(self.sessions.ensure(CookiePage(context), LoginStrategy(sets_cookie=True)))
+        self.assertEqual(self.sessions.reused, 1)
+
+    def test_concurrent_saves(self):
+        context = CookieContext([self.tracker])
+        errors = []
+
+        def save(n):
+            try:
+                for _ in range(20):
+                    self.sessions.save_state("abb", context, [f"auth{n}"])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        with open(self.workdir / "sessions" / "abb.json", "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["auth_cookies"]), 1)
+        self.assertEqual(os.listdir(self.workdir / "sessions"), ["abb.json"])
+
+    def test_domain_boundary(self):
+        self.assertTrue(_matches({"domain": ".abb.com"}, "abb.com"))
+        self.assertTrue(_matches({"domain": "new.abb.com"}, "abb.com"))
+        self.assertFalse(_matches({"domain": "evilabb.com"}, "abb.com"))
+        self.assertFalse(_matches({"domain": ""}, "abb.com"))
+        self.assertTrue(_matches({"domain": "evilabb.com"}, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
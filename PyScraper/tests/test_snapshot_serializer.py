@@ -0,0 +1,137 @@
+"""
+Schneider snapshot: de nieuwe serializer (_SNAPSHOT_JS) moet tekst en attributen exact
+zoals _LEGACY_SNAPSHOT_JS escapen, zodat MSE dezelfde output geeft.
+
+Beide serializers draaien in Node tegen een minimale DOM (fixtures/snapshot_dom.js),
+op de mock Schneider pagina's van de benchmark en op fixtures/schneider_escaping.html
+(entiteiten in tekst en attributen, plain-all-data JSON, script/style, void elementen,
+geneste shadow roots, content dieper dan de oude 15-niveau grens).
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from html.parser import HTMLParser
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "src"))
+
+from benchmark.mock_sites import MockServer
+from strategies import schneider
+from utils.mse_bridge import compare_mse_output
+
+FIXTURES = os.path.join(TESTS_DIR, "fixtures")
+VOID = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+class DomTree(HTMLParser):
+    """HTML -> JSON boom voor snapshot_dom.js; <template shadowrootmode> wordt de shadow root van de parent."""
+
+    def __init__(self, html):
+        super().__init__(convert_charrefs=True)
+        self.root = {"t": "el", "tag": "#document", "attrs": [], "children": []}
+        self.stack = [self.root]
+        self.feed(html)
+        self.close()
+
+    def document(self):
+        return next(c for c in self.root["children"] if c.get("tag") == "html")
+
+    def handle_starttag(self, tag, attrs):
+        el = {"t": "el", "tag": tag, "attrs": attrs, "children": []}
+        if tag == "template" and dict(attrs).get("shadowrootmode"):
+            self.stack[-1]["shadow"] = el["children"]
+            self.stack.append(el)
+            return
+        self.stack[-1]["children"].append(el)
+        if tag not in VOID:
+            self.stack.append(el)
+
+    def handle_startendtag(self, tag, attrs):
+        self.stack[-1]["children"].append({"t": "el", "tag": tag, "attrs": attrs, "children": []})
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i]["tag"] == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1]["children"].append({"t": "text", "v": data})
+
+    def handle_comment(self, data):
+        self.stack[-1]["children"].append({"t": "comment", "v": data})
+
+
+def with_rendered_prices(html):
+    """pes-product-price zoals de web component hem rendert (open shadow root)."""
+    return re.sub(
+        r'<pes-product-price data-sku="([^"]+)"></pes-product-price>',
+        r'<pes-product-price data-sku="\1"><template shadowrootmode="open">'
+        r'<span class="mock-price" data-price-sku="\1">€ 12,34</span></template></pes-product-price>',
+        html,
+    )
+
+
+def schneider_pages():
+    server = MockServer(products=30)
+    pages = {}
+    for path in ("/nl/nl/product-range/2-mock/", "/nl/nl/product/MOCK-S-002007/"):
+        _, _, html = server._schneider(f"https://www.se.com{path}", path, {})
+        pages[path] = with_rendered_prices(html)
+    with open(os.path.join(FIXTURES, "schneider_escaping.html"), "r", encoding="utf-8") as f:
+        pages["schneider_escaping.html"] = f.read()
+    return pages
+
+
+@unittest.skipUnless(shutil.which("node"), "node niet gevonden")
+class SnapshotSerializerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        workdir = tempfile.mkdtemp()
+        trees, scripts, output = (os.path.join(workdir, name) for name in ("trees.json", "js.json", "out.json"))
+        with open(trees, "w", encoding="utf-8") as f:
+            json.dump({name: DomTree(html).document() for name, html in schneider_pages().items()}, f)
+        with open(scripts, "w", encoding="utf-8") as f:
+            json.dump({"legacy": schneider._LEGACY_SNAPSHOT_JS, "current": schneider._SNAPSHOT_JS}, f)
+        subprocess.run(["node", os.path.join(FIXTURES, "snapshot_dom.js"), trees, scripts, output], check=True)
+        with open(output, "r", encoding="utf-8") as f:
+            cls.outputs = json.load(f)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    def each(self):
+        for name, modes in self.outputs.items():
+            for which, result in modes.items():
+                with self.subTest(page=name, snapshot=which):
+                    yield name, result
+
+    def test_debug_output_matches_legacy(self):
+        """Met debug markup (data-depth, shadow markers) is de output byte-gelijk aan de oude."""
+        for name, result in self.each():
+            legacy = re.sub(r"<!-- Found \d+ shadow children -->", "", result["legacy"])
+            if name == "schneider_escaping.html" and result["debug"] != legacy:
+                # Enige verschil: tekst dieper dan 15 niveaus, die de oude serializer wegliet
+                self.assertEqual(result["debug"].replace("diep", "", 1), legacy)
+            else:
+                self.assertEqual(result["debug"], legacy)
+
+    def test_escaping_kept(self):
+        fixture = self.outputs["schneider_escaping.html"]["next"]["plain"]
+        self.assertIn("Kabel 3<5 & 10>2\xa0mm", fixture)
+        self.assertIn('title="5 &quot;inch&quot; & <more>"', fixture)
+        self.assertIn('plain-all-data="{&quot;sku&quot;: &quot;MOCK-S-000002&quot;', fixture)
+
+    def test_mse_output_identical(self):
+        for _, result in self.each():
+            equal, diffs = compare_mse_output(result["plain"], result["legacy"])
+            self.assertTrue(equal, diffs)
+
+
+if __name__ == "__main__":
+    unittest.main()
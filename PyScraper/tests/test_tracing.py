@@ -0,0 +1,78 @@
+"""
+Sampled tracing: snelle pagina's worden weggegooid, falende bewaard, en de kost van
+start/stop_chunk per pagina wordt bijgehouden.
+
+    cd PyScraper && python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from core.config import Config
+from core.tracing import TraceKeeper
+
+
+class RecordingTracing:
+    """context.tracing zoals Playwright het aanbiedt, met een vaste kost per oproep."""
+
+    def __init__(self, cost=0.002):
+        self.cost = cost
+        self.chunks = []
+
+    def start_chunk(self, title=None):
+        time.sleep(self.cost)
+        self.chunks.append(title)
+
+    def stop_chunk(self, path=None):
+        time.sleep(self.cost)
+        if path:
+            with open(path, "wb") as f:
+                f.write(b"PK")
+
+
+class RecordingContext:
+    def __init__(self):
+        self.tracing = RecordingTracing()
+
+
+class TraceKeeperTest(unittest.TestCase):
+    def setUp(self):
+        self.tracing = Config.TRACING
+        Config.TRACING = True
+        self.trace_dir = tempfile.mkdtemp()
+        self.keeper = TraceKeeper(self.trace_dir)
+        self.context = RecordingContext()
+
+    def tearDown(self):
+        Config.TRACING = self.tracing
+
+    def test_fast_pages_discarded(self):
+        for n in range(3):
+            self.assertIsNone(self.keeper.end(self.keeper.begin(self.context, None, f"https://www.se.com/p/{n}"), True))
+        self.assertEqual(self.keeper.discarded, 3)
+        self.assertEqual(os.listdir(self.trace_dir), [])
+
+    def test_failed_page_kept(self):
+        path = self.keeper.end(self.keeper.begin(self.context, None, "https://www.se.com/p/1"), False)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(self.keeper.kept["failed"], 1)
+
+    def test_overhead_per_page(self):
+        for n in range(4):
+            self.keeper.end(self.keeper.begin(self.context, None, f"https://www.se.com/p/{n}"), True)
+        # start_chunk + stop_chunk = 2 x 2 ms per pagina
+        self.assertGreaterEqual(self.keeper.overhead_ms(), 4.0)
+        self.assertLess(self.keeper.overhead_ms(), 50.0)
+
+    def test_tracing_off(self):
+        Config.TRACING = False
+        self.assertIsNone(self.keeper.begin(self.context, None, "https://www.se.com/p/1"))
+        self.assertEqual(self.keeper.overhead_ms(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()